@@ -40,9 +40,11 @@ empirical formula to estimate the force from the FSR resistance.
 
 Software API:
 
-    read_voltage(pin)
+    read_voltage(pin, adc=ADC)
     - Reads the ADC value from the specified pin and converts it into an actual voltage.
     - `pin` : The pin number where the FSR is connected.
+    - `adc` : ADC to read; pass a started iio_adc.IIOCapture to use the mean of
+              the samples captured since the last read instead of one sample.
     - Returns : The voltage at the FSR.
 
     compute_resistance(v_out)
@@ -55,7 +57,28 @@ Software API:
     - `resistance` : The resistance of the FSR.
     - Returns : The estimated force in Newtons.
 
-    Main Loop
+    ForceTable(r_fixed=R_FIXED, vcc=VCC, coefficient=FORCE_COEFFICIENT, exponent=FORCE_EXPONENT)
+    - Lookup table of the force (N) for every raw 12-bit ADC value (0 to 4095), i.e.
+      estimate_force(compute_resistance(raw / 4095 * vcc)) precomputed for a calibration.
+    - Changing any of the calibration attributes rebuilds the table on the next lookup.
+    - force(raw) : Force for a raw value or a NumPy array of raw values (one indexed lookup).
+
+    CalibratedForceTable(model, params, vcc=VCC)
+    - Lookup table for a fitted model (see fsr_models.py / fsr_calibrate.py).
+    - Assigning a new model, params or vcc rebuilds the table on the next lookup.
+
+    load_force_table(path)
+    - Returns a CalibratedForceTable for a calibration file written by fsr_calibrate.py.
+
+    read_force(pin, table=FORCE_TABLE, adc=ADC)
+    - Reads the raw ADC value from the specified pin and returns the force (N) from the table.
+
+    read_voltage_oversampled(pin, n, adc=ADC)
+    - Averages a burst of n samples (from the IIO buffer if adc is an iio_adc.IIOCapture).
+    - Returns : (voltage, reading) where reading is an oversample.Reading with the
+                resolution (bits) and latency of the burst.
+
+    Main Loop (when run as a script)
     - Reads the voltage from the FSR, calculates the resistance, and estimates the force every 200 ms. The result is printed to the console.
 
     ADC.setup()
@@ -68,6 +91,7 @@ Software API:
     - FSR_PIN : The ADC pin the FSR is connected to (configured for use on the PocketBeagle).
     - R_FIXED : The fixed resistor value used in the voltage divider (10 kΩ).
     - VCC : The reference voltage for the ADC (3.3V for the PocketBeagle).
+    - FORCE_COEFFICIENT / FORCE_EXPONENT : FSR 402 curve, force (g) = FORCE_COEFFICIENT * (1/R)^FORCE_EXPONENT
 
   
 
@@ -76,18 +100,31 @@ Software API:
 import Adafruit_BBIO.ADC as ADC
 import time
 import math
+import numpy as np
+
+from oversample import read_oversampled
+from fsr_models import model_force, load_calibration
 
 # Setup
 ADC.setup()
 FSR_PIN = "P1_27"  
 R_FIXED = 10000.0  # 10kΩ resistor in voltage divider
 VCC = 3.3          # PocketBeagle analog reference voltage
+ADC_MAX_VALUE = 4095            # 12-bit ADC
+FORCE_COEFFICIENT = 100000.0    # FSR 402: force (g) = FORCE_COEFFICIENT * (1/R)^FORCE_EXPONENT
+FORCE_EXPONENT = 1.5
+GRAMS_PER_NEWTON = 100.0
 
-def read_voltage(pin):
+def read_voltage(pin, adc=ADC):
     """Read ADC value and convert to actual voltage."""
-    analog_value = ADC.read(pin)
+    analog_value = adc.read(pin)
     return analog_value * VCC
 
+def read_voltage_oversampled(pin, n, adc=ADC):
+    """Average a burst of n ADC samples; return (voltage, reading)."""
+    reading = read_oversampled(adc, pin, n)
+    return reading.value / ADC_MAX_VALUE * VCC, reading
+
 def compute_resistance(v_out):
     """Calculate FSR resistance from output voltage."""
     if v_out <= 0 or v_out >= VCC:
@@ -102,25 +139,83 @@ def estimate_force(resistance):
     # Empirical curve approximation: log-log linear fit
     # For FSR 402: force (g) ≈ 100000 * (1/R)^1.5  [where R in ohms]
     # We'll return force in Newtons: 1 N ≈ 100 g
-    force_g = 100000 * math.pow(1.0 / resistance, 1.5)
-    force_n = force_g / 100.0
+    force_g = FORCE_COEFFICIENT * math.pow(1.0 / resistance, FORCE_EXPONENT)
+    force_n = force_g / GRAMS_PER_NEWTON
     return force_n
 
+class ForceTable:
+    """Raw ADC value (0-4095) to force (N) lookup table for one calibration."""
+    CALIBRATION = ("r_fixed", "vcc", "coefficient", "exponent")
+
+    def __init__(self, r_fixed=R_FIXED, vcc=VCC, coefficient=FORCE_COEFFICIENT, exponent=FORCE_EXPONENT):
+        self.r_fixed = r_fixed
+        self.vcc = vcc
+        self.coefficient = coefficient
+        self.exponent = exponent
+
+    def __setattr__(self, name, value):
+        # Any change to the calibration invalidates the table
+        if name in self.CALIBRATION:
+            object.__setattr__(self, "_table", None)
+        object.__setattr__(self, name, value)
+
+    def _build(self):
+        """Compute the force for every raw value (same chain as estimate_force(compute_resistance()))."""
+        params = {"r_fixed": self.r_fixed, "coefficient": self.coefficient, "exponent": self.exponent}
+        return model_force("power", np.arange(ADC_MAX_VALUE + 1), self.vcc, params)
+
+    @property
+    def table(self):
+        """The lookup table (built on first use after a calibration change)."""
+        if self._table is None:
+            object.__setattr__(self, "_table", self._build())
+        return self._table
+
+    def force(self, raw):
+        """Force (N) for a raw ADC value or an array of raw values."""
+        if isinstance(raw, np.ndarray):
+            return self.table[raw.astype(np.intp)]
+        return float(self.table[int(raw)])
+
+class CalibratedForceTable(ForceTable):
+    """Lookup table for a fitted calibration model (see fsr_models.py)."""
+    CALIBRATION = ("model", "params", "vcc")
+
+    def __init__(self, model, params, vcc=VCC):
+        self.model = model
+        self.params = params
+        self.vcc = vcc
+
+    def _build(self):
+        return model_force(self.model, np.arange(ADC_MAX_VALUE + 1), self.vcc, self.params)
+
+def load_force_table(path):
+    """Load a calibration file and return its lookup table."""
+    calibration = load_calibration(path)
+    return CalibratedForceTable(calibration["model"], calibration["params"], calibration["vcc"])
+
+FORCE_TABLE = ForceTable()
+
+def read_force(pin, table=FORCE_TABLE, adc=ADC):
+    """Read the raw ADC value and look up the force (N)."""
+    return table.force(adc.read_raw(pin))
+
 # Main loop
-try:
-    while True:
-        voltage = read_voltage(FSR_PIN)
-        resistance = compute_resistance(voltage)
-        force = estimate_force(resistance)
-
-        if resistance is None:
-            print(f"Voltage: {voltage:.2f} V | Resistance: -- | Estimated Force: --")
-        else:
-            print(f"Voltage: {voltage:.2f} V | Resistance: {resistance:.0f} Ω | Estimated Force: {force:.2f} N")
-        
-        time.sleep(0.2)
-
-except KeyboardInterrupt:
-    print("Stopped.")
+if __name__ == "__main__":
+    try:
+        while True:
+            voltage = read_voltage(FSR_PIN)
+            resistance = compute_resistance(voltage)
+            force = estimate_force(resistance)
+
+            if resistance is None:
+                print(f"Voltage: {voltage:.2f} V | Resistance: -- | Estimated Force: --")
+            else:
+                print(f"Voltage: {voltage:.2f} V | Resistance: {resistance:.0f} Ω | Estimated Force: {force:.2f} N")
+            
+            time.sleep(0.2)
+
+    except KeyboardInterrupt:
+        print("Stopped.")
 
 
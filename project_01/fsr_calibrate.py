@@ -0,0 +1,216 @@
+"""
+--------------------------------------------------------------------------
+FSR Calibration Tool
+--------------------------------------------------------------------------
+License:
+Copyright 2021-2025 - Tarik Price
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+this list of conditions and the following disclaimer in the documentation
+and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its contributors
+may be used to endorse or promote products derived from this software without
+specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+--------------------------------------------------------------------------
+
+
+Fit FSR force models to recorded (raw ADC, reference force) data and write
+a calibration file that the runtime loads (force_sensitive_resistor.
+load_force_table(), pros_finger(calibration=...)) and compiles into its
+raw ADC -> force lookup table.
+
+Since the ADC has only 4096 raw values, the samples are first reduced to
+the count and mean force of every raw value (np.bincount), and the models
+are fitted by weighted least squares on those 4096 points.  This gives
+the same result as a least squares fit on every sample, so recordings of
+millions of samples fit in well under a second.  Residuals are computed
+on every sample.
+
+Models (see fsr_models.py):
+    linear    : Least squares in voltage (the pros_finger model)
+    power     : Least squares of log(force) vs log(resistance) (the FSR 402
+                law); samples with force <= 0 or at the ADC rails are skipped
+    piecewise : Continuous piecewise linear in raw with --knots segments
+                (knots at quantiles of the recorded raw values)
+
+Input files:
+    .csv : Columns raw, force (N); an optional header line and # comments
+    .npy : N x 2 array of raw, force
+    .npz : Arrays "raw" and "force"
+
+Usage:
+    python3 fsr_calibrate.py data.csv [more.csv ...] [--model all|linear|power|piecewise]
+                             [--knots 8] [--vcc 3.3] [--r-fixed 10000]
+                             [--output fsr_calibration.json]
+
+    Every model is fitted and its residuals are printed; the model given
+    by --model (default: the one with the lowest RMS residual) is written.
+
+"""
+
+import sys
+import time
+import argparse
+import numpy as np
+
+from fsr_models import ADC_MAX_VALUE, GRAMS_PER_NEWTON, MODELS
+from fsr_models import raw_to_voltage, raw_to_resistance, model_force, save_calibration
+
+DEFAULT_VCC = 3.3
+DEFAULT_R_FIXED = 10000.0
+DEFAULT_KNOTS = 8
+DEFAULT_OUTPUT = "fsr_calibration.json"
+
+RAW_VALUES = np.arange(ADC_MAX_VALUE + 1)
+
+def load_dataset(path):
+    """Return (raw, force) arrays of a recording."""
+    if path.endswith(".npz"):
+        data = np.load(path)
+        raw, force = data["raw"], data["force"]
+    elif path.endswith(".npy"):
+        data = np.load(path)
+        raw, force = data[:, 0], data[:, 1]
+    else:
+        # Skip a header line if the first line is not numeric
+        with open(path) as f:
+            first = f.readline()
+        try:
+            [float(value) for value in first.split(",")[:2]]
+            skip = 0
+        except ValueError:
+            skip = 1
+        data = np.loadtxt(path, delimiter=",", comments="#", skiprows=skip, usecols=(0, 1), ndmin=2)
+        raw, force = data[:, 0], data[:, 1]
+
+    raw = np.rint(raw).astype(np.intp)
+    if raw.size and ((raw.min() < 0) or (raw.max() > ADC_MAX_VALUE)):
+        raise ValueError(f"{path}: raw values must be in [0, {ADC_MAX_VALUE}]")
+    return raw, np.asarray(force, dtype=float)
+
+def group(raw, values):
+    """Return (raw values present, sample counts, mean of values) per raw value."""
+    counts = np.bincount(raw, minlength=ADC_MAX_VALUE + 1)
+    sums = np.bincount(raw, weights=values, minlength=ADC_MAX_VALUE + 1)
+    present = counts > 0
+    return RAW_VALUES[present], counts[present], sums[present] / counts[present]
+
+def weighted_lstsq(x_matrix, y, weights):
+    """Least squares solution of x_matrix @ p = y with per-row weights."""
+    w = np.sqrt(weights)
+    solution, *_ = np.linalg.lstsq(x_matrix * w[:, None], y * w, rcond=None)
+    return solution
+
+def fit_linear(raw, force, vcc, r_fixed, knots):
+    """force = slope * V + intercept"""
+    values, counts, means = group(raw, force)
+    voltage = raw_to_voltage(values, vcc)
+    slope, intercept = weighted_lstsq(np.column_stack((voltage, np.ones_like(voltage))), means, counts)
+    return {"slope": float(slope), "intercept": float(intercept)}
+
+def fit_power(raw, force, vcc, r_fixed, knots):
+    """log(force_g) = log(coefficient) - exponent * log(R)"""
+    resistance = raw_to_resistance(raw, vcc, r_fixed)
+    valid = (force > 0) & np.isfinite(resistance)
+    if not np.any(valid):
+        raise ValueError("No samples with force > 0 inside the ADC range")
+
+    values, counts, means = group(raw[valid], np.log(force[valid] * GRAMS_PER_NEWTON))
+    log_r = np.log(raw_to_resistance(values, vcc, r_fixed))
+    slope, intercept = weighted_lstsq(np.column_stack((log_r, np.ones_like(log_r))), means, counts)
+    return {"r_fixed": r_fixed, "coefficient": float(np.exp(intercept)), "exponent": float(-slope)}
+
+def fit_piecewise(raw, force, vcc, r_fixed, knots):
+    """Continuous piecewise linear fit with hinge functions at quantile knots."""
+    values, counts, means = group(raw, force)
+
+    interior = np.unique(np.quantile(raw, np.linspace(0, 1, knots + 1)[1:-1]))
+    interior = interior[(interior > values.min()) & (interior < values.max())]
+
+    x = values.astype(float)
+    basis = [np.ones_like(x), x] + [np.maximum(x - knot, 0.0) for knot in interior]
+    solution = weighted_lstsq(np.column_stack(basis), means, counts)
+
+    # Evaluate the fit at the knots and the ends of the ADC range
+    knot_points = np.concatenate(([0], interior, [ADC_MAX_VALUE])).astype(float)
+    knot_basis = [np.ones_like(knot_points), knot_points] + [np.maximum(knot_points - knot, 0.0) for knot in interior]
+    forces = np.column_stack(knot_basis) @ solution
+    return {"knots": knot_points.tolist(), "forces": forces.tolist()}
+
+FITTERS = {"linear": fit_linear, "power": fit_power, "piecewise": fit_piecewise}
+
+def residuals(model, params, raw, force, vcc):
+    """Residual statistics (N) of a model on every sample."""
+    table = model_force(model, RAW_VALUES, vcc, params)
+    error = force - table[raw]
+    total = np.sum((force - force.mean()) ** 2)
+
+    return {"samples": int(force.size),
+            "rms": float(np.sqrt(np.mean(error ** 2))),
+            "max_abs": float(np.max(np.abs(error))),
+            "mean": float(np.mean(error)),
+            "r2": float(1.0 - np.sum(error ** 2) / total) if total > 0 else 0.0}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit FSR force models to recorded data")
+    parser.add_argument("files", nargs="+", help="Recordings of raw ADC, force (N)")
+    parser.add_argument("--model", default="all", choices=("all",) + MODELS)
+    parser.add_argument("--knots", type=int, default=DEFAULT_KNOTS, help="Piecewise segments")
+    parser.add_argument("--vcc", type=float, default=DEFAULT_VCC, help="ADC voltage scale (V)")
+    parser.add_argument("--r-fixed", type=float, default=DEFAULT_R_FIXED, help="Divider resistor (ohms)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Calibration file to write")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    datasets = [load_dataset(path) for path in args.files]
+    raw = np.concatenate([data[0] for data in datasets])
+    force = np.concatenate([data[1] for data in datasets])
+    print(f"Loaded {raw.size} samples in {time.perf_counter() - start:.2f} s")
+
+    results = {}
+    for model in MODELS:
+        start = time.perf_counter()
+        try:
+            params = FITTERS[model](raw, force, args.vcc, args.r_fixed, args.knots)
+        except (ValueError, np.linalg.LinAlgError) as error:
+            print(f"{model:<10} fit failed: {error}")
+            continue
+        results[model] = (params, residuals(model, params, raw, force, args.vcc))
+        stats = results[model][1]
+        print(f"{model:<10} rms {stats['rms']:8.4f} N  max {stats['max_abs']:8.4f} N  "
+              f"mean {stats['mean']:+8.4f} N  r2 {stats['r2']:.4f}  ({time.perf_counter() - start:.3f} s)")
+
+    if args.model == "all":
+        if not results:
+            return 1
+        model = min(results, key=lambda name: results[name][1]["rms"])
+    elif args.model in results:
+        model = args.model
+    else:
+        return 1
+
+    params, stats = results[model]
+    save_calibration(args.output, model, args.vcc, params, stats)
+    print(f"Wrote {model} calibration to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+--------------------------------------------------------------------------
+FSR Force Models
+--------------------------------------------------------------------------
+License:   
+Copyright 2021-2025 - Tarik Price
+
+Redistribution and use in source and binary forms, with or without 
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this 
+list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice, 
+this list of conditions and the following disclaimer in the documentation 
+and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its contributors 
+may be used to endorse or promote products derived from this software without 
+specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE 
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE 
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE 
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL 
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR 
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER 
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, 
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE 
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+--------------------------------------------------------------------------
+
+
+FSR force models shared by the runtime (force_sensitive_resistor.py, 
+prosthetic_force_sensor.py) and the calibration tool (fsr_calibrate.py).
+Only needs NumPy, so calibrations can be fitted on any machine.
+
+Every model maps raw 12-bit ADC values (0 to 4095) to force (N) and is 
+evaluated on whole arrays; the runtime compiles a model into a 4096 entry
+lookup table.
+
+Models:
+    linear    : force = slope * V + intercept  (V = raw / 4095 * vcc)
+                params: slope, intercept
+    power     : force = coefficient * (1/R)^exponent / 100 (FSR 402 law,
+                coefficient in grams) with R the FSR resistance of the 
+                voltage divider; params: r_fixed, coefficient, exponent
+    piecewise : force interpolated linearly between (knot, force) points
+                params: knots (raw values), forces (N)
+    Forces below 0 are clamped to 0.
+
+Calibration file (JSON):
+    {"model" : "power", "vcc" : 3.3, "params" : {...}, "residuals" : {...}}
+
+Software API:
+
+    model_force(model, raw, vcc, params)
+    - Returns the force (N) array of a model for an array of raw values.
+
+    save_calibration(path, model, vcc, params, residuals=None)
+    load_calibration(path)
+    - Write / read a calibration file; load returns the dictionary.
+
+"""
+
+import json
+import numpy as np
+
+ADC_MAX_VALUE = 4095
+GRAMS_PER_NEWTON = 100.0
+MODELS = ("linear", "power", "piecewise")
+
+def raw_to_voltage(raw, vcc):
+    """Voltage of raw ADC values."""
+    return np.asarray(raw, dtype=float) * (vcc / ADC_MAX_VALUE)
+
+def raw_to_resistance(raw, vcc, r_fixed):
+    """FSR resistance (ohms) of raw ADC values; NaN where the divider is at a rail."""
+    v_out = raw_to_voltage(raw, vcc)
+    valid = (v_out > 0) & (v_out < vcc)
+
+    resistance = np.full(v_out.shape, np.nan)
+    resistance[valid] = r_fixed * (vcc - v_out[valid]) / v_out[valid]
+    return resistance
+
+def model_force(model, raw, vcc, params):
+    """Force (N) of a model for an array of raw ADC values."""
+    if model == "linear":
+        force = params["slope"] * raw_to_voltage(raw, vcc) + params["intercept"]
+    elif model == "power":
+        resistance = raw_to_resistance(raw, vcc, params["r_fixed"])
+        with np.errstate(invalid="ignore"):
+            force = params["coefficient"] * np.power(1.0 / resistance, params["exponent"]) / GRAMS_PER_NEWTON
+        force = np.nan_to_num(force, nan=0.0)
+    elif model == "piecewise":
+        force = np.interp(np.asarray(raw, dtype=float), params["knots"], params["forces"])
+    else:
+        raise ValueError(f"Unknown FSR model {model}")
+
+    return np.maximum(force, 0.0)
+
+def save_calibration(path, model, vcc, params, residuals=None):
+    """Write a calibration file."""
+    calibration = {"model": model, "vcc": vcc, "params": params}
+    if residuals is not None:
+        calibration["residuals"] = residuals
+
+    with open(path, "w") as f:
+        json.dump(calibration, f, indent=4)
+
+def load_calibration(path):
+    """Read a calibration file."""
+    with open(path) as f:
+        calibration = json.load(f)
+
+    if calibration.get("model") not in MODELS:
+        raise ValueError(f"Unknown FSR model in {path}")
+    return calibration
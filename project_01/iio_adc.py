@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+IIO Buffered ADC Capture
+--------------------------------------------------------------------------
+License:
+Copyright 2025 Tarik Price
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+this list of conditions and the following disclaimer in the documentation
+and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its contributors
+may be used to endorse or promote products derived from this software without
+specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+--------------------------------------------------------------------------
+
+Continuous ADC capture through the Linux IIO buffer of the AM335x ADC
+(iio:device0).  The ADC samples the enabled channels continuously into the
+kernel buffer; each update() drains it with one read() per contiguous 
+region straight into a preallocated ring of scans (one row per scan, one
+column per channel), so the cost per sample is a tiny fraction of one 
+sysfs ADC.read().
+
+The capture is a drop-in replacement for Adafruit_BBIO.ADC in a control 
+loop: read(pin) / read_raw(pin) return the mean of the samples of the pin
+captured since the previous read of that pin (the latest sample if there 
+are none), which also low-pass filters the signal between control ticks
+instead of aliasing it.
+
+Sample rate:
+  The rate is written to the IIO "sampling_frequency" attribute if the 
+kernel driver exposes it.  The TI am335x driver in most PocketBeagle 
+images does not; the rate is then set by the ADC step timing in the device
+tree (ti,chan-step-opendelay / sampledelay / avg) and "rate" is the 
+requested rate only.  measured_rate() reports the actual scan rate.
+
+Requires NumPy.
+
+Software API:
+
+  IIOCapture(pins, rate=DEFAULT_RATE, ring_size=DEFAULT_RING_SIZE, 
+             buffer_length=DEFAULT_BUFFER_LENGTH, device=0)
+    - pins          : ADC pins to capture (e.g. ["P1_27"])
+    - rate          : Requested scans per second
+    - ring_size     : Number of scans kept in the ring
+    - buffer_length : Size of the kernel buffer in scans
+
+    start() / stop()
+      - Enable / disable the IIO buffer
+
+    update()
+      - Read every waiting scan into the ring; return the number of scans
+        (0 before start() / after stop(); update(), new_samples() and
+        read() / read_raw() then only return the samples already in the
+        ring)
+    
+    window(n, pin=None)
+      - Return the latest n scans (n x channels array) or the latest n 
+        samples of a pin, oldest first (raw values in [0, 4095])
+
+    new_samples(pin)
+      - Return the samples of the pin captured since the last read of the
+        pin, oldest first (at most ring_size samples)
+
+    read(pin) / read_raw(pin)
+      - Like ADC.read() / ADC.read_raw(): mean of the new samples of the pin
+
+    measured_rate()
+      - Scans per second since start()
+
+    fileno()
+      - File descriptor that is readable when scans are waiting
+
+    Attributes:
+      - count : Total scans captured since start()
+
+"""
+import os
+import time
+
+import numpy as np
+
+# ------------------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------------------
+
+IIO_SYSFS_PATH          = "/sys/bus/iio/devices/iio:device{0}"
+IIO_DEV_PATH            = "/dev/iio:device{0}"
+
+ADC_MAX_VALUE           = 4095
+ADC_SAMPLE_DTYPE        = np.dtype("<u2")      # le:u12/16>>0
+
+DEFAULT_RATE            = 1000                 # Scans per second
+DEFAULT_RING_SIZE       = 4096                 # Scans
+DEFAULT_BUFFER_LENGTH   = 1024                 # Scans
+
+# ADC channel (AINx) of each PocketBeagle analog input
+AIN_CHANNELS            = {"P1_19" : 0, "P1_21" : 1, "P1_23" : 2, "P1_25" : 3,
+                           "P1_27" : 4, "P2_35" : 5, "P1_2"  : 6, "P2_36" : 7}
+
+# ------------------------------------------------------------------------
+# Functions / Classes
+# ------------------------------------------------------------------------
+
+class IIOCapture():
+    """ Continuous ADC capture through the IIO buffer """
+    pins          = None
+    channels      = None
+    columns       = None
+    rate          = None
+    ring_size     = None
+    buffer_length = None
+    sysfs_path    = None
+    dev_path      = None
+    ring          = None
+    ring_bytes    = None
+    scan_bytes    = None
+    head          = None
+    count         = None
+    read_counts   = None
+    fd            = None
+    start_time    = None
+
+    def __init__(self, pins, rate=DEFAULT_RATE, ring_size=DEFAULT_RING_SIZE, 
+                 buffer_length=DEFAULT_BUFFER_LENGTH, device=0):
+        """ Initialize variables and allocate the ring """
+        for pin in pins:
+            if pin not in AIN_CHANNELS:
+                raise ValueError("Unknown ADC pin {0}".format(pin))
+        
+        self.pins          = list(pins)
+        self.rate          = rate
+        self.ring_size     = ring_size
+        self.buffer_length = buffer_length
+        self.sysfs_path    = IIO_SYSFS_PATH.format(device)
+        self.dev_path      = IIO_DEV_PATH.format(device)
+        
+        # Scans hold the enabled channels in channel order
+        self.channels      = sorted(set(AIN_CHANNELS[pin] for pin in pins))
+        self.columns       = {pin : self.channels.index(AIN_CHANNELS[pin]) for pin in pins}
+        
+        self.ring          = np.zeros((ring_size, len(self.channels)), dtype=ADC_SAMPLE_DTYPE)
+        self.ring_bytes    = memoryview(self.ring).cast("B")
+        self.scan_bytes    = self.ring.strides[0]
+        self.head          = 0
+        self.count         = 0
+        self.read_counts   = {pin : 0 for pin in pins}
+    
+    # End def
+    
+    
+    def _write(self, attribute, value):
+        """Write a sysfs attribute of the IIO device"""
+        with open(os.path.join(self.sysfs_path, attribute), "w") as f:
+            f.write(str(value))
+    
+    # End def
+    
+    
+    def start(self):
+        """Enable the scan elements and the IIO buffer"""
+        self._write("buffer/enable", 0)
+        
+        scan_path = os.path.join(self.sysfs_path, "scan_elements")
+        for name in os.listdir(scan_path):
+            if name.endswith("_en"):
+                self._write(os.path.join("scan_elements", name), 0)
+        
+        for channel in self.channels:
+            self._write("scan_elements/in_voltage{0}_en".format(channel), 1)
+        
+        self._write("buffer/length", self.buffer_length)
+        
+        if os.path.exists(os.path.join(self.sysfs_path, "sampling_frequency")):
+            self._write("sampling_frequency", self.rate)
+        
+        self.fd = os.open(self.dev_path, os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            self._write("buffer/enable", 1)
+        except OSError:
+            os.close(self.fd)
+            self.fd = None
+            raise
+        
+        self.head        = 0
+        self.count       = 0
+        self.read_counts = {pin : 0 for pin in self.pins}
+        self.start_time  = time.monotonic()
+    
+    # End def
+    
+    
+    def stop(self):
+        """Disable the IIO buffer"""
+        if self.fd is None:
+            return
+        
+        self._write("buffer/enable", 0)
+        os.close(self.fd)
+        self.fd = None
+    
+    # End def
+    
+    
+    def fileno(self):
+        """File descriptor that is readable when scans are waiting"""
+        return self.fd
+    
+    # End def
+    
+    
+    def update(self):
+        """Read every waiting scan into the ring; return the number of scans"""
+        if self.fd is None:
+            return 0
+        
+        total = 0
+        
+        while True:
+            # Read straight into the ring up to its end (whole scans only)
+            start = self.head * self.scan_bytes
+            
+            try:
+                size = os.readv(self.fd, [self.ring_bytes[start:]])
+            except BlockingIOError:
+                break
+            
+            scans      = size // self.scan_bytes
+            self.head  = (self.head + scans) % self.ring_size
+            total     += scans
+            
+            # Short read: the kernel buffer is empty
+            if size < len(self.ring_bytes) - start:
+                break
+        
+        self.count += total
+        return total
+    
+    # End def
+    
+    
+    def window(self, n, pin=None):
+        """Return the latest n scans (or samples of pin), oldest first"""
+        n = min(n, self.count, self.ring_size)
+        
+        start = self.head - n
+        if start >= 0:
+            scans = self.ring[start:self.head]
+        else:
+            scans = np.concatenate((self.ring[start:], self.ring[:self.head]))
+        
+        if pin is not None:
+            scans = scans[:, self.columns[pin]]
+        
+        return scans & ADC_MAX_VALUE
+    
+    # End def
+    
+    
+    def new_samples(self, pin):
+        """Return the samples of pin captured since the last read of pin"""
+        self.update()
+        
+        n = self.count - self.read_counts[pin]
+        self.read_counts[pin] = self.count
+        
+        return self.window(n, pin)
+    
+    # End def
+    
+    
+    def read_raw(self, pin):
+        """Return the mean raw value of the samples of pin since the last read"""
+        samples = self.new_samples(pin)
+        
+        # No new samples: use the latest sample
+        if len(samples) == 0:
+            samples = self.window(1, pin)
+        
+        if len(samples) == 0:
+            return 0.0
+        
+        return float(samples.mean())
+    
+    # End def
+    
+    
+    def read(self, pin):
+        """Return the mean value of the samples of pin since the last read in [0, 1]"""
+        return self.read_raw(pin) / ADC_MAX_VALUE
+    
+    # End def
+    
+    
+    def measured_rate(self):
+        """Return the scans per second since start()"""
+        if self.start_time is None:
+            return 0.0
+        
+        elapsed = time.monotonic() - self.start_time
+        
+        if elapsed <= 0:
+            return 0.0
+        
+        return self.count / elapsed
+    
+    # End def
+    
+    
+    def cleanup(self):
+        """Stop the capture"""
+        self.stop()
+    
+    # End def
+
+# End class
+
+
+# ------------------------------------------------------------------------
+# Main script
+# ------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    print("IIO ADC Capture Test")
+
+    capture = IIOCapture(["P1_19", "P1_27"])
+    capture.start()
+    
+    # Use a Keyboard Interrupt (i.e. "Ctrl-C") to exit the test
+    print("Use Ctrl-C to Exit")
+    
+    try:
+        while True:
+            time.sleep(1)
+            scans = capture.update()
+            print("{0:6d} scans ({1:7.1f} scans/s)  P1_19 = {2:7.1f}  P1_27 = {3:7.1f}".format(
+                  scans, capture.measured_rate(), 
+                  capture.window(scans, "P1_19").mean(), capture.window(scans, "P1_27").mean()))
+        
+    except KeyboardInterrupt:
+        pass
+
+    capture.cleanup()
+
+    print("Test Complete")
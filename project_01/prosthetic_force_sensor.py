@@ -59,14 +59,80 @@ Requirements:
 # Used Libraries
 # ------------------------------------------------------------------------
 import time
+import bisect
+import numpy as np
 import Adafruit_BBIO.ADC as ADC
 import Adafruit_BBIO.GPIO as GPIO
 import Adafruit_BBIO.PWM as PWM
-from ht16k33 import HT16K33
+from ht16k33 import HT16K33, DisplayWriter
 from servo import Servo
+from sample_filter import SampleRing, make_filters, ema_alpha
+from force_sensitive_resistor import load_force_table
+from pwm_sysfs import open_pwm_channel
+
+TICK_RATE = 10              # Control loop ticks per second (run() sleeps 0.1 s)
+
+# FSR force filter stages (see sample_filter.py); the default is the 
+# original 0.8 * old + 0.2 * new smoothing of one sample per tick
+FSR_EMA_ALPHA = 0.2
+
+def default_fsr_filter(rate=TICK_RATE):
+    """FSR filter with the original smoothing time constant for samples at rate (Hz)."""
+    return [("ema", {"alpha" : ema_alpha(FSR_EMA_ALPHA, TICK_RATE, rate)})]
+
+FORCE_RING_SIZE = 4096      # Filtered force samples kept
+
+# Grip level thresholds (N); the level is the number of thresholds reached
+GRIP_THRESHOLDS = [0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0]
+GRIP_HYSTERESIS = 0.1       # N past a threshold before the level changes
+
+class GripQuantizer:
+    """Map a force to a grip level with hysteresis.
+
+    The level is the number of thresholds that the force has reached 
+    (found with bisect).  To change level the force has to pass the 
+    threshold by the hysteresis band, so a force near a threshold does not
+    make the level chatter.
+    """
+    def __init__(self, thresholds=GRIP_THRESHOLDS, hysteresis=GRIP_HYSTERESIS):
+        if list(thresholds) != sorted(thresholds):
+            raise ValueError("Grip thresholds must be in increasing order")
+        self.thresholds = list(thresholds)
+        self.hysteresis = hysteresis
+        self.level = 0
+
+    def quantize(self, force):
+        """Return the grip level for the force (and remember it)."""
+        level = bisect.bisect_right(self.thresholds, force)
+
+        if level > self.level:
+            # Rising: every threshold up to the new level must be passed by the band
+            level = max(bisect.bisect_right(self.thresholds, force - self.hysteresis), self.level)
+        elif level < self.level:
+            # Falling: the force must drop below the threshold by the band
+            level = min(bisect.bisect_right(self.thresholds, force + self.hysteresis), self.level)
+
+        self.level = level
+        return level
+
+    def reset(self, level=0):
+        self.level = level
 
 class pros_finger:
-    def __init__(self):
+    def __init__(self, async_display=False, i2c_bus=1, i2c_address=0x70, capture_rate=None,
+                 fsr_filter=None, grip_hysteresis=GRIP_HYSTERESIS, calibration=None):
+        """ Set up hardware.  With async_display=True the display is written
+            from a background thread so display I/O never delays the servo.
+            With capture_rate (samples / s) the FSR is captured continuously
+            through the IIO buffer (iio_adc.py) and each tick filters every
+            sample captured since the last tick.  fsr_filter selects the
+            filter stages applied to the force samples; the default keeps
+            the original smoothing time constant (about 0.45 s) at the
+            capture rate.  grip_hysteresis is the band (N) around each 
+            grip threshold.  calibration is a
+            calibration file written by fsr_calibrate.py; without one the
+            built in linear voltage fit is used.
+        """
         print("Program Start")
 
         # Hardware pins
@@ -84,47 +150,84 @@ class pros_finger:
         GPIO.setup(self.red_led, GPIO.OUT)
         GPIO.setup(self.green_led, GPIO.OUT)
         ADC.setup()
+        self.adc = ADC
+        if capture_rate is not None:
+            from iio_adc import IIOCapture
+            self.adc = IIOCapture([self.adc_pin], rate=capture_rate)
+            self.adc.start()
         PWM.start(self.servo_pin, 7.5, 50)  # Neutral position
 
-        self.display = HT16K33(bus=1, address=0x70)
+        # Servo duty cycle values for each grip level, encoded once
+        self.servo_pwm = open_pwm_channel(self.servo_pin)
+        self.servo_neutral = self.servo_pwm.encode(7.5)
+        self.servo_grip = [self.servo_pwm.encode(self.duty_cycle_calc(level))
+                           for level in range(len(GRIP_THRESHOLDS) + 1)]
+
+        self.display = HT16K33(bus=i2c_bus, address=i2c_address)
+        if async_display:
+            self.display = DisplayWriter(self.display)
         self.display.set_colon(True)
 
         GPIO.output(self.green_led, GPIO.HIGH)
         GPIO.output(self.red_led, GPIO.LOW)
 
+        # Fitted force model compiled into a raw ADC -> force lookup table
+        self.force_table = None
+        if calibration is not None:
+            self.force_table = load_force_table(calibration)
+
         self.filtered_force = 0.0  # For smoothing FSR readings
+        if fsr_filter is None:
+            fsr_filter = default_fsr_filter(capture_rate if capture_rate is not None else TICK_RATE)
+        self.force_ring = SampleRing(FORCE_RING_SIZE, make_filters(fsr_filter))
+        self.quantizer = GripQuantizer(GRIP_THRESHOLDS, grip_hysteresis)
+        self.shown_level = None     # Grip level on the display (None = other text)
+        self.servo_level = None     # Grip level of the servo (None = not a grip level)
 
     def read_voltage(self):
         """Read ADC voltage from the FSR."""
-        analog_value = ADC.read(self.adc_pin)
+        analog_value = self.adc.read(self.adc_pin)
         return analog_value * self.VCC
 
+    def read_voltage_block(self):
+        """Read the FSR voltage samples since the last tick (one sample without capture)."""
+        if self.adc is ADC:
+            return np.array([self.read_voltage()])
+        
+        samples = self.adc.new_samples(self.adc_pin)
+        if len(samples) == 0:
+            return np.array([self.read_voltage()])
+        
+        return samples * (self.VCC / 4095)
+
     def estimate_force(self, voltage):
-        """Estimate force (N) from voltage using new calibration."""  # Plot voltage vs force to determine linear fit
+        """Estimate force (N) from voltage (scalar or array) using new calibration."""  # Plot voltage vs force to determine linear fit
+        if self.force_table is not None:
+            raw = np.clip(np.rint(np.asarray(voltage) * (4095 / self.VCC)), 0, 4095)
+            return self.force_table.force(raw)
+
         force = 16.46 * voltage - 1.475
-        return max(force, 0.0)
+        return np.maximum(force, 0.0)
 
     def show_fsr_value(self):
         """Read force from FSR, assign grip level by force thresholds, update display."""
-        voltage = self.read_voltage()
-        force = self.estimate_force(voltage)
-
-        # Apply low-pass filter for smoothing
-        self.filtered_force = 0.8 * self.filtered_force + 0.2 * force
+        voltages = self.read_voltage_block()
+        voltage = voltages[-1]
+        forces = self.estimate_force(voltages)
 
-        # Define grip level thresholds (N)
-        thresholds = [0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0]
+        # Filter the block of new samples
+        self.force_ring.extend(forces)
+        self.filtered_force = self.force_ring.last()
 
         # Assign grip level based on filtered force
-        grip_level = 0
-        for i, threshold in enumerate(thresholds):
-            if self.filtered_force >= threshold:
-                grip_level = i + 1
-
-        grip_level = min(grip_level, 8)
+        grip_level = self.quantizer.quantize(self.filtered_force)
 
         print(f"Voltage: {voltage:.2f} V | Force: {self.filtered_force:.2f} N | Grip Level: {grip_level}")
-        self.display.text("ON" + str(grip_level))
+
+        # Only redraw the display when the level changes
+        if grip_level != self.shown_level:
+            self.display.text("ON" + str(grip_level))
+            self.shown_level = grip_level
 
         return grip_level
 
@@ -133,6 +236,16 @@ class pros_finger:
         """Map grip level (0–8) to servo PWM duty cycle (5% to 10%)."""
         return 5 + (val / 8.0) * 5
 
+    def update_grip(self):
+        """One control tick: read the FSR and set the servo to the grip level."""
+        grip_level = self.show_fsr_value()
+
+        # Only move the servo when the level changes
+        if grip_level != self.servo_level:
+            self.servo_pwm.write(self.servo_grip[grip_level])
+            self.servo_level = grip_level
+        return grip_level
+
     def run(self):
         is_on = True
         prev_button_state = GPIO.input(self.button)
@@ -149,8 +262,10 @@ class pros_finger:
 
                         if not is_on:
                             print("Button pressed, turning OFF.")
-                            PWM.set_duty_cycle(self.servo_pin, 7.5)  # Neutral
+                            self.servo_pwm.write(self.servo_neutral)  # Neutral
                             self.display.text("OFF")
+                            self.shown_level = None
+                            self.servo_level = None
                             GPIO.output(self.green_led, GPIO.LOW)
                             GPIO.output(self.red_led, GPIO.HIGH)
                         else:
@@ -159,9 +274,7 @@ class pros_finger:
                             GPIO.output(self.green_led, GPIO.HIGH)
 
                 if is_on:
-                    grip_level = self.show_fsr_value()
-                    duty = self.duty_cycle_calc(grip_level)
-                    PWM.set_duty_cycle(self.servo_pin, duty)
+                    self.update_grip()
 
                 prev_button_state = button_state
                 time.sleep(0.1)
@@ -171,12 +284,16 @@ class pros_finger:
 
     def cleanup(self):
         print("Exiting and cleaning up...")
+        self.servo_pwm.close()
         PWM.stop(self.servo_pin)
         PWM.cleanup()
         GPIO.output(self.red_led, GPIO.LOW)
         GPIO.output(self.green_led, GPIO.LOW)
         self.display.text("----")
         self.display.set_colon(False)
+        self.display.cleanup()
+        if self.adc is not ADC:
+            self.adc.cleanup()
         print("Program Complete")
 
 # Run
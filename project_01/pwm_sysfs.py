@@ -0,0 +1,232 @@
+"""
+--------------------------------------------------------------------------
+Sysfs PWM Channels
+--------------------------------------------------------------------------
+License:
+Copyright 2025 - Tarik Price
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+this list of conditions and the following disclaimer in the documentation
+and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its contributors
+may be used to endorse or promote products derived from this software without
+specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+--------------------------------------------------------------------------
+
+Sysfs PWM Channels
+
+  PWM outputs whose duty cycle is updated often (e.g. a servo every 
+control tick).  PWM.set_duty_cycle() looks up the pin and goes through the
+Adafruit_BBIO sysfs code on every call.  SysfsPWMChannel resolves the
+pwmchip channel of the pin once, keeps its duty_cycle file open and
+writes each update with a single os.pwrite().  Duty cycles can be encoded
+to the nanosecond value once (encode()) and written many times (write()).
+Both channel types skip the write when the value has not changed.
+
+  The pin must already be started with PWM.start(), which configures the
+pin, exports the channel and sets the period.  Do not call
+PWM.set_duty_cycle() / set_frequency() for the pin while a channel is
+open, and close() the channel before PWM.stop().
+
+  BBIOPWMChannel calls PWM.set_duty_cycle().  It is used when the sysfs
+channel cannot be found, and when Adafruit_BBIO.PWM has been replaced by a
+simulated or recording PWM (python/sim), so those still see every update.
+
+Software API:
+
+  open_pwm_channel(pin)
+    - Return a SysfsPWMChannel if possible, otherwise a BBIOPWMChannel
+
+  PWM channels:
+    encode(duty_cycle)
+      - Return the value written for a duty cycle (percent); precompute
+        the values of fixed positions with this
+
+    write(value)
+      - Write an encoded value unless it was the last value written.
+        Returns True if the value was written.
+
+    set_duty_cycle(duty_cycle)
+      - write(encode(duty_cycle))
+
+    writes / skipped
+      - Number of values written / skipped as unchanged
+
+    close()
+      - Close the duty cycle file (the PWM keeps running)
+
+"""
+import os
+import glob
+import types
+
+import Adafruit_BBIO.PWM as PWM
+
+# ------------------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------------------
+
+PWM_CLASS_PATH = "/sys/class/pwm"
+
+# eHRPWM module (device name) and channel of the PocketBeagle PWM pins
+POCKETBEAGLE_PWM = {
+    "P1_33" : ("48300200.pwm", 1),    # EHRPWM0B
+    "P1_36" : ("48300200.pwm", 0),    # EHRPWM0A
+    "P2_01" : ("48302200.pwm", 0),    # EHRPWM1A
+    "P2_03" : ("48304200.pwm", 1),    # EHRPWM2B
+}
+
+# Channel directory names (older kernels / kernels 4.11+)
+PWM_CHANNEL_NAMES = ["pwm{1}", "pwm-{0}:{1}"]
+
+# ------------------------------------------------------------------------
+# Functions / Classes
+# ------------------------------------------------------------------------
+
+def pin_to_pwm(pin):
+    """ Return the (device, channel) of a PocketBeagle pin ("P1_36" or "P2_1") """
+    try:
+        header, number = pin.upper().split("_")
+        return POCKETBEAGLE_PWM["{0}_{1:02d}".format(header, int(number))]
+    except (ValueError, KeyError):
+        raise ValueError("Unknown PWM pin {0}".format(pin))
+
+
+def find_pwm_channel(pin, root=PWM_CLASS_PATH):
+    """ Return the sysfs directory of the exported PWM channel of the pin """
+    device, channel = pin_to_pwm(pin)
+
+    for chip in sorted(glob.glob(os.path.join(root, "pwmchip*"))):
+        # pwmchipN links to .../<device>/pwm/pwmchipN
+        if device not in os.path.realpath(chip).split(os.sep):
+            continue
+
+        number = os.path.basename(chip)[len("pwmchip"):]
+        for name in PWM_CHANNEL_NAMES:
+            path = os.path.join(chip, name.format(number, channel))
+            if os.path.isdir(path):
+                return path
+
+        raise OSError("PWM channel {0} of {1} is not exported (call PWM.start() first)".format(channel, chip))
+
+    raise OSError("No pwmchip for {0} ({1})".format(pin, device))
+
+
+class SysfsPWMChannel():
+    """ PWM channel written through a persistent sysfs duty_cycle file """
+    pin = None
+    path = None
+    period = None
+    fd = None
+    last = None
+    writes = None
+    skipped = None
+
+    def __init__(self, pin, root=PWM_CLASS_PATH):
+        """ Open the duty cycle file of the pin (raises OSError / ValueError) """
+        self.pin = pin
+        self.path = find_pwm_channel(pin, root)
+
+        with open(os.path.join(self.path, "period")) as f:
+            self.period = int(f.read())
+        if self.period <= 0:
+            raise OSError("PWM period of {0} is not set (call PWM.start() first)".format(pin))
+
+        self.fd = os.open(os.path.join(self.path, "duty_cycle"), os.O_WRONLY)
+        self.writes = 0
+        self.skipped = 0
+
+    def encode(self, duty_cycle):
+        """ Return the duty_cycle file contents (ns) for a duty cycle (percent) """
+        return str(int(round(self.period * duty_cycle / 100.0))).encode()
+
+    def write(self, value):
+        """ Write an encoded value unless it is the last value written """
+        if value == self.last:
+            self.skipped += 1
+            return False
+
+        os.pwrite(self.fd, value, 0)
+        self.last = value
+        self.writes += 1
+        return True
+
+    def set_duty_cycle(self, duty_cycle):
+        """ Set the duty cycle (percent) """
+        return self.write(self.encode(duty_cycle))
+
+    def close(self):
+        """ Close the duty cycle file """
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class BBIOPWMChannel():
+    """ PWM channel written with PWM.set_duty_cycle() """
+    pin = None
+    last = None
+    writes = None
+    skipped = None
+
+    def __init__(self, pin):
+        """ Use the started PWM pin """
+        self.pin = pin
+        self.writes = 0
+        self.skipped = 0
+
+    def encode(self, duty_cycle):
+        """ Values are the duty cycle (percent) """
+        return duty_cycle
+
+    def write(self, value):
+        """ Set the duty cycle unless it is the last value written """
+        if value == self.last:
+            self.skipped += 1
+            return False
+
+        PWM.set_duty_cycle(self.pin, value)
+        self.last = value
+        self.writes += 1
+        return True
+
+    def set_duty_cycle(self, duty_cycle):
+        """ Set the duty cycle (percent) """
+        return self.write(duty_cycle)
+
+    def close(self):
+        """ Nothing to release """
+        pass
+
+
+def open_pwm_channel(pin):
+    """ Return a SysfsPWMChannel if possible, otherwise a BBIOPWMChannel.
+
+        The pin must already be started with PWM.start().
+    """
+    # Simulated / recording PWM modules (python/sim) are not modules
+    if isinstance(PWM, types.ModuleType):
+        try:
+            return SysfsPWMChannel(pin)
+        except (OSError, ValueError):
+            pass
+
+    return BBIOPWMChannel(pin)
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Multi-channel ADC Scan
+--------------------------------------------------------------------------
+License:
+Copyright 2025 Tarik Price
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+this list of conditions and the following disclaimer in the documentation
+and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its contributors
+may be used to endorse or promote products derived from this software without
+specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+--------------------------------------------------------------------------
+
+Sample a set of ADC channels together and return one NumPy row per control
+tick with a value for every channel, e.g. one FSR per finger.
+
+  With the IIO buffer (default) the ADC sequencer samples every channel in
+each scan, and scan() does a single I/O pass per tick: one update() of 
+the IIOCapture, then the mean of the new scans of every channel at once.
+Without it (iio=False, or when start() cannot start the IIO buffer, e.g.
+the device is missing or busy) scan() falls back to one ADC.read_raw() per
+channel.
+
+Requires NumPy.
+
+Software API:
+
+  ADCScanner(pins, rate=DEFAULT_RATE, iio=True)
+    - pins : ADC pins to scan; row columns are in this order
+    - rate : Requested scans per second for the IIO buffer
+
+    start() / stop()
+      - Start / stop the capture; if the IIO buffer cannot be started 
+        (OSError) the scanner uses ADC.read_raw() from then on
+
+    scan()
+      - Return a row (float array, one column per pin) of the mean raw 
+        value of each channel since the last scan (the latest scan if 
+        there is none)
+
+    scan_block()
+      - Return every scan since the last call (n x pins array, oldest
+        first; IIO buffer only)
+
+    column(pin)
+      - Return the column of a pin in the rows
+
+"""
+import numpy as np
+
+import Adafruit_BBIO.ADC as ADC
+
+import iio_adc as IIO_ADC
+
+# ------------------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------------------
+
+DEFAULT_RATE = IIO_ADC.DEFAULT_RATE
+
+# ------------------------------------------------------------------------
+# Functions / Classes
+# ------------------------------------------------------------------------
+
+class ADCScanner():
+    """ Multi-channel ADC scan engine """
+    pins       = None
+    capture    = None
+    order      = None
+    last_count = None
+    row        = None
+
+    def __init__(self, pins, rate=DEFAULT_RATE, iio=True):
+        """ Initialize variables """
+        if len(set(pins)) != len(pins):
+            raise ValueError("Duplicate pins in ADC scan")
+        
+        self.pins       = list(pins)
+        self.last_count = 0
+        self.row        = np.zeros(len(self.pins))
+        
+        if iio:
+            self.capture = IIO_ADC.IIOCapture(self.pins, rate=rate)
+            
+            # Scans are in channel order; reorder the columns to pin order
+            self.order   = np.array([self.capture.columns[pin] for pin in self.pins])
+    
+    # End def
+    
+    
+    def start(self):
+        """Start the capture"""
+        ADC.setup()
+        
+        if self.capture is not None:
+            try:
+                self.capture.start()
+            except OSError:
+                # IIO buffer missing or busy: read each channel instead
+                self.capture = None
+                return
+            
+            self.last_count = 0
+    
+    # End def
+    
+    
+    def stop(self):
+        """Stop the capture"""
+        if self.capture is not None:
+            self.capture.stop()
+    
+    # End def
+    
+    
+    def column(self, pin):
+        """Return the column of pin in the rows"""
+        return self.pins.index(pin)
+    
+    # End def
+    
+    
+    def scan_block(self):
+        """Return every scan since the last call (n x pins, oldest first)"""
+        if self.capture is None:
+            raise RuntimeError("scan_block() needs the IIO buffer")
+        
+        self.capture.update()
+        
+        n               = self.capture.count - self.last_count
+        self.last_count = self.capture.count
+        
+        return self.capture.window(n)[:, self.order]
+    
+    # End def
+    
+    
+    def scan(self):
+        """Return a row with the mean raw value of every pin since the last scan"""
+        if self.capture is None:
+            for i, pin in enumerate(self.pins):
+                self.row[i] = ADC.read_raw(pin)
+            return self.row.copy()
+        
+        block = self.scan_block()
+        
+        # No new scans: repeat the latest scan
+        if len(block) == 0:
+            block = self.capture.window(1)[:, self.order]
+        
+        if len(block) > 0:
+            self.row = block.mean(axis=0)
+        
+        return self.row.copy()
+    
+    # End def
+    
+    
+    def cleanup(self):
+        """Stop the capture"""
+        self.stop()
+    
+    # End def
+
+# End class
+
+
+# ------------------------------------------------------------------------
+# Main script
+# ------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    import time
+    
+    print("ADC Scan Test")
+
+    scanner = ADCScanner(["P1_19", "P1_21", "P1_23", "P1_25", "P1_27", "P2_36"])
+    scanner.start()
+    
+    # Use a Keyboard Interrupt (i.e. "Ctrl-C") to exit the test
+    print("Use Ctrl-C to Exit")
+    
+    try:
+        while True:
+            time.sleep(0.1)
+            print(" ".join("{0:7.1f}".format(value) for value in scanner.scan()))
+        
+    except KeyboardInterrupt:
+        pass
+
+    scanner.cleanup()
+
+    print("Test Complete")
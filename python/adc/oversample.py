@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+ADC Oversampling
+--------------------------------------------------------------------------
+License:
+Copyright 2025 Tarik Price
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+this list of conditions and the following disclaimer in the documentation
+and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its contributors
+may be used to endorse or promote products derived from this software without
+specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+--------------------------------------------------------------------------
+
+Oversampling and decimation of 12-bit ADC readings.
+
+  read_oversampled() takes a burst of N samples of a pin and decimates them
+into one reading.  Averaging N samples of a noisy input reduces the noise
+by sqrt(N) and adds log4(N) bits of resolution (N = 4 -> 13 bits, 
+N = 16 -> 14 bits, N = 64 -> 15 bits).
+
+  The samples come from the IIO buffer if an iio_adc.IIOCapture is given
+(the latest N captured samples; no extra I/O), otherwise from N 
+ADC.read_raw() calls.
+
+Software API:
+
+  read_oversampled(adc, pin, n)
+    - adc : Adafruit_BBIO.ADC or a started iio_adc.IIOCapture
+    - Returns a Reading
+
+  Reading (namedtuple)
+    - value   : Mean of the samples on the 12-bit scale (float in [0, 4095])
+    - raw     : Decimated integer value with "bits" bits of resolution
+    - bits    : Resolution of raw (12 + log4(samples), rounded down)
+    - samples : Number of samples used
+    - latency : Seconds spanned by the samples (burst time for ADC reads,
+                sample period x samples for the IIO buffer)
+
+"""
+import math
+import time
+import collections
+
+# ------------------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------------------
+
+ADC_BITS      = 12
+ADC_MAX_VALUE = 4095
+
+Reading = collections.namedtuple("Reading", ["value", "raw", "bits", "samples", "latency"])
+
+# ------------------------------------------------------------------------
+# Functions / Classes
+# ------------------------------------------------------------------------
+
+def decimate(total, samples):
+    """Return (raw, bits) for the sum of a number of 12-bit samples"""
+    extra = int(math.log2(samples) // 2) if samples > 0 else 0
+    raw   = int(round(total * (1 << extra) / samples)) if samples > 0 else 0
+    return raw, ADC_BITS + extra
+
+# End def
+
+
+def read_oversampled(adc, pin, n):
+    """Return a Reading from a burst of n samples of pin"""
+    if n < 1:
+        raise ValueError("Oversampling needs at least one sample")
+    
+    if hasattr(adc, "window"):
+        # IIO capture: decimate the latest n samples already in the ring
+        adc.update()
+        samples = adc.window(n, pin)
+        count   = len(samples)
+        total   = float(samples.sum())
+        rate    = adc.measured_rate()
+        latency = count / rate if rate > 0 else 0.0
+    else:
+        start   = time.perf_counter()
+        total   = 0.0
+        for i in range(n):
+            total += adc.read_raw(pin)
+        count   = n
+        latency = time.perf_counter() - start
+    
+    if count == 0:
+        return Reading(0.0, 0, ADC_BITS, 0, latency)
+    
+    raw, bits = decimate(total, count)
+    
+    return Reading(total / count, raw, bits, count, latency)
+
+# End def
+
+
+# ------------------------------------------------------------------------
+# Main script
+# ------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    import Adafruit_BBIO.ADC as ADC
+    
+    print("ADC Oversampling Test")
+    
+    ADC.setup()
+    
+    for n in [1, 4, 16, 64, 256]:
+        readings = [read_oversampled(ADC, "P1_19", n) for i in range(20)]
+        values   = [reading.value for reading in readings]
+        mean     = sum(values) / len(values)
+        noise    = math.sqrt(sum((value - mean) ** 2 for value in values) / len(values))
+        
+        print("N = {0:3d}: {1:2d} bits  value = {2:8.2f}  noise = {3:6.3f} LSB  latency = {4:8.3f} ms".format(
+              n, readings[-1].bits, mean, noise, 1000.0 * readings[-1].latency))
+
+    print("Test Complete")
@@ -0,0 +1,412 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Sample Ring and Filters
+--------------------------------------------------------------------------
+License:
+Copyright 2025 Tarik Price
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+this list of conditions and the following disclaimer in the documentation
+and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its contributors
+may be used to endorse or promote products derived from this software without
+specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+--------------------------------------------------------------------------
+
+Fixed-size NumPy sample ring with vectorized filter stages for high rate
+ADC data.  Every stage filters a whole block of new samples per call (no
+Python loop per sample) and keeps its state between blocks, so filtering
+a stream block by block gives the same result as filtering it at once.
+
+Stages:
+  - ema         : Exponential moving average  y = alpha*x + (1-alpha)*y
+  - median      : Moving median over "window" samples (removes spikes)
+  - butterworth : 2nd order Butterworth low pass at "cutoff" Hz for 
+                  samples at "rate" Hz
+
+  The recursive stages (ema / butterworth) are split into first order 
+sections y[n] = p*y[n-1] + x[n], which are evaluated for a whole block 
+with a scaled cumulative sum (in chunks so that the scaling stays within
+floating point range).
+
+Configuration:
+  make_filters() builds the stages from a list of (name, parameters), e.g.
+
+    [("median", {"window" : 5}), ("ema", {"alpha" : 0.2})]
+
+Software API:
+
+  SampleRing(capacity, stages=None)
+    - capacity : Number of (filtered) samples kept
+    - stages   : List of filter stages applied to every block
+
+    extend(block)
+      - Filter the block of new samples and append it; return the 
+        filtered block
+
+    latest(n)
+      - Return the latest n filtered samples, oldest first
+
+    last()
+      - Return the latest filtered sample
+
+    reset()
+      - Clear the ring and the filter state
+
+  make_filters(config)
+    - Return the list of stages for a configuration (see above)
+
+  ema_alpha(alpha, rate, new_rate)
+    - Return the EMA alpha for samples at new_rate (Hz) that has the same
+      time constant as alpha for samples at rate (Hz)
+
+  EMAFilter(alpha, initial=0.0), MedianFilter(window), 
+  ButterworthFilter(cutoff, rate)
+    process(block)
+      - Return the filtered block
+    reset()
+      - Clear the filter state
+
+"""
+import math
+
+import numpy as np
+
+# ------------------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------------------
+
+# Largest scaling used by the block recursion before starting a new chunk
+MAX_RECURSION_GAIN      = 1e100
+
+# ------------------------------------------------------------------------
+# Functions / Classes
+# ------------------------------------------------------------------------
+
+def first_order(x, pole, state):
+    """Return (y, last y) of y[n] = pole*y[n-1] + x[n] with y[-1] = state"""
+    n = len(x)
+    
+    # Tiny poles (e.g. 0 for an EMA with alpha 1) would divide by zero in
+    # the scaled sum.  The terms past pole*x[n-1] are scaled by pole ** 2,
+    # which is below 1 / MAX_RECURSION_GAIN ** 2, so they are dropped.
+    magnitude = abs(pole)
+    if magnitude < 1.0 / MAX_RECURSION_GAIN:
+        if n == 0:
+            return np.empty(0, dtype=np.result_type(x, pole)), state
+        
+        y = x + pole * np.concatenate(([state], x[:-1]))
+        return y, y[-1]
+    
+    y = np.empty(n, dtype=np.result_type(x, pole))
+    
+    # Chunk length such that |pole| ** -length stays below the maximum gain
+    if magnitude >= 1:
+        chunk = 1
+    else:
+        chunk = max(int(math.log(MAX_RECURSION_GAIN) / -math.log(magnitude)), 1)
+    
+    start = 0
+    while start < n:
+        stop   = min(start + chunk, n)
+        powers = pole ** np.arange(1, stop - start + 1)
+        
+        # y[k] = pole^(k+1) * (state + sum(x[j] / pole^(j+1)))
+        y[start:stop] = powers * (state + np.cumsum(x[start:stop] / powers))
+        
+        state = y[stop - 1]
+        start = stop
+    
+    return y, state
+
+# End def
+
+
+class EMAFilter():
+    """ Exponential moving average """
+    alpha   = None
+    initial = None
+    state   = None
+
+    def __init__(self, alpha, initial=0.0):
+        """ alpha is the weight of each new sample """
+        if not (0 < alpha <= 1):
+            raise ValueError("EMA alpha must be in (0, 1]")
+        
+        self.alpha   = alpha
+        self.initial = initial
+        self.reset()
+    
+    # End def
+    
+    
+    def reset(self):
+        """Clear the filter state"""
+        self.state = self.initial
+    
+    # End def
+    
+    
+    def process(self, block):
+        """Return the filtered block"""
+        block = np.asarray(block, dtype=float)
+        y, self.state = first_order(self.alpha * block, 1.0 - self.alpha, self.state)
+        return y
+    
+    # End def
+
+# End class
+
+
+class MedianFilter():
+    """ Moving median """
+    window  = None
+    history = None
+
+    def __init__(self, window):
+        """ window is the number of samples in the median """
+        if window < 1:
+            raise ValueError("Median window must be at least 1")
+        
+        self.window = window
+        self.reset()
+    
+    # End def
+    
+    
+    def reset(self):
+        """Clear the filter state"""
+        self.history = np.empty(0)
+    
+    # End def
+    
+    
+    def process(self, block):
+        """Return the filtered block"""
+        data = np.concatenate((self.history, block))
+        
+        # Until the window is full, the first outputs use the samples so far
+        short = min(self.window - 1 - len(self.history), len(block))
+        head  = [np.median(data[:len(self.history) + i + 1]) for i in range(max(short, 0))]
+        
+        if len(data) >= self.window:
+            windows = np.lib.stride_tricks.sliding_window_view(data, self.window)
+            tail    = np.median(windows[len(windows) - (len(block) - len(head)):], axis=1)
+        else:
+            tail    = np.empty(0)
+        
+        self.history = data[max(len(data) - (self.window - 1), 0):] if self.window > 1 else np.empty(0)
+        
+        return np.concatenate((head, tail))
+    
+    # End def
+
+# End class
+
+
+class ButterworthFilter():
+    """ 2nd order Butterworth low pass filter """
+    cutoff   = None
+    rate     = None
+    gain     = None
+    pole     = None
+    residue  = None
+    state    = None
+
+    def __init__(self, cutoff, rate):
+        """ cutoff and rate (sample rate) are in Hz """
+        if not (0 < cutoff < rate / 2.0):
+            raise ValueError("Butterworth cutoff must be between 0 and rate / 2")
+        
+        self.cutoff = cutoff
+        self.rate   = rate
+        
+        # Bilinear transform (RBJ cookbook low pass with Q = 1/sqrt(2))
+        w0    = 2 * math.pi * cutoff / rate
+        alpha = math.sin(w0) / math.sqrt(2)
+        a0    = 1 + alpha
+        b     = np.array([1 - math.cos(w0), 2 * (1 - math.cos(w0)), 1 - math.cos(w0)]) / (2 * a0)
+        a1    = -2 * math.cos(w0) / a0
+        a2    = (1 - alpha) / a0
+        
+        # H(z) = gain + 2 Re(residue / (1 - pole z^-1)); the poles are a
+        # complex conjugate pair so only one section has to be evaluated
+        self.pole    = complex(-a1 / 2, math.sqrt(4 * a2 - a1 * a1) / 2)
+        pole_c       = self.pole.conjugate()
+        self.gain    = b[2] / a2
+        numerator    = (b[0] - self.gain) + (b[1] - self.gain * a1) / self.pole + (b[2] - self.gain * a2) / (self.pole * self.pole)
+        self.residue = numerator / (1 - pole_c / self.pole)
+        
+        self.reset()
+    
+    # End def
+    
+    
+    def reset(self):
+        """Clear the filter state"""
+        self.state = 0j
+    
+    # End def
+    
+    
+    def process(self, block):
+        """Return the filtered block"""
+        y, self.state = first_order(self.residue * block, self.pole, self.state)
+        return self.gain * block + 2 * y.real
+    
+    # End def
+
+# End class
+
+
+FILTERS = {"ema"         : EMAFilter,
+           "median"      : MedianFilter,
+           "butterworth" : ButterworthFilter}
+
+
+def ema_alpha(alpha, rate, new_rate):
+    """Return the alpha at new_rate with the same time constant as alpha at rate"""
+    if rate == new_rate:
+        return alpha
+    
+    # Decay per second (1 - alpha) ** rate is kept
+    return -math.expm1(math.log1p(-alpha) * rate / new_rate)
+
+# End def
+
+
+def make_filters(config):
+    """Return the list of filter stages for a list of (name, parameters)"""
+    stages = []
+    
+    for name, parameters in config:
+        if name not in FILTERS:
+            raise ValueError("Unknown filter {0}".format(name))
+        stages.append(FILTERS[name](**parameters))
+    
+    return stages
+
+# End def
+
+
+class SampleRing():
+    """ Fixed-size ring of filtered samples """
+    capacity = None
+    stages   = None
+    ring     = None
+    head     = None
+    count    = None
+
+    def __init__(self, capacity, stages=None):
+        """ Allocate the ring """
+        self.capacity = capacity
+        self.stages   = stages if stages is not None else []
+        self.ring     = np.zeros(capacity)
+        self.reset()
+    
+    # End def
+    
+    
+    def reset(self):
+        """Clear the ring and the filter state"""
+        self.head  = 0
+        self.count = 0
+        
+        for stage in self.stages:
+            stage.reset()
+    
+    # End def
+    
+    
+    def extend(self, block):
+        """Filter a block of new samples and append it; return the filtered block"""
+        block = np.asarray(block, dtype=float)
+        
+        for stage in self.stages:
+            block = stage.process(block)
+        
+        # Only the last "capacity" samples fit
+        data  = block[-self.capacity:]
+        first = min(len(data), self.capacity - self.head)
+        
+        self.ring[self.head:self.head + first] = data[:first]
+        self.ring[:len(data) - first]          = data[first:]
+        
+        self.head   = (self.head + len(data)) % self.capacity
+        self.count += len(block)
+        
+        return block
+    
+    # End def
+    
+    
+    def latest(self, n):
+        """Return the latest n filtered samples, oldest first"""
+        n = min(n, self.count, self.capacity)
+        return np.roll(self.ring, -self.head)[self.capacity - n:]
+    
+    # End def
+    
+    
+    def last(self):
+        """Return the latest filtered sample"""
+        return float(self.ring[self.head - 1])
+    
+    # End def
+    
+    
+    def __len__(self):
+        """Number of samples in the ring"""
+        return min(self.count, self.capacity)
+    
+    # End def
+
+# End class
+
+
+# ------------------------------------------------------------------------
+# Main script
+# ------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    import time
+    
+    print("Sample Filter Test")
+    
+    rate  = 1000
+    t     = np.arange(10 * rate) / rate
+    noisy = np.sin(2 * np.pi * t) + 0.3 * np.random.randn(len(t))
+    
+    for config in [[("ema", {"alpha" : 0.2})],
+                   [("median", {"window" : 5})],
+                   [("butterworth", {"cutoff" : 5, "rate" : rate})]]:
+        ring  = SampleRing(len(t), make_filters(config))
+        start = time.perf_counter()
+        
+        for block in np.split(noisy, 100):
+            ring.extend(block)
+        
+        elapsed = time.perf_counter() - start
+        error   = np.std(ring.latest(len(t))[rate:] - np.sin(2 * np.pi * t[rate:]))
+        print("{0:<12} {1:8.3f} us/sample  error = {2:.3f}".format(config[0][0], 1e6 * elapsed / len(t), error))
+
+    print("Test Complete")
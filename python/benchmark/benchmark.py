@@ -0,0 +1,495 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Driver Benchmark Suite
+--------------------------------------------------------------------------
+License:
+Copyright 2025 Tarik Price
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+this list of conditions and the following disclaimer in the documentation
+and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its contributors
+may be used to endorse or promote products derived from this software without
+specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+--------------------------------------------------------------------------
+
+Benchmark the hot paths of the drivers against the simulated backends in
+python/sim, so the suite runs on any Linux machine (no PocketBeagle).
+
+For each benchmark the suite reports:
+  - ops/sec       : Calls per second (driver CPU time + modeled I2C time)
+  - p50 / p99     : Latency percentiles of one call in microseconds
+  - per-call ops  : Simulated sysfs operations (e.g. gpio.input) and I2C
+                    transactions / bytes per call
+
+Benchmarks:
+  - ht16k33.text            : HT16K33.text() cycling the pros_finger strings
+  - ht16k33.update          : HT16K33.update() counting up
+  - button.wait_for_press   : Press to on_press callback latency (polling)
+  - button.wait_for_press_edge : Same with edge_detect=True
+  - button_bank.1 / .8      : Press to queued record latency of a ButtonBank
+                              with 1 / 8 buttons (only the first is pressed)
+  - servo.turn              : Servo.turn() sweeping 0 to 100
+  - pwm.open_write_close    : One duty cycle update that opens, writes and
+                              closes the sysfs duty_cycle file
+  - pwm.pwrite              : SysfsPWMChannel.write() of a changed value
+                              (one os.pwrite() on the open file)
+  - pwm.pwrite_unchanged    : SysfsPWMChannel.write() of the last value
+                              (skipped)
+                              The pwm benchmarks use a pwmchip directory
+                              tree in a temporary directory, so they measure
+                              the Python and system call cost, not the
+                              kernel PWM driver
+  - potentiometer.get_value : Potentiometer.get_value()
+  - potentiometer.get_reading_16 : Potentiometer.get_reading() with 16x
+                              oversampling from ADC.read_raw()
+  - sample_filter.block     : Median + EMA + Butterworth over a block of
+                              FILTER_BLOCK samples (one call per block)
+  - pros_finger.tick        : pros_finger.update_grip() (sync display)
+  - pros_finger.tick_async  : pros_finger.update_grip() (DisplayWriter)
+
+Usage:
+  ./run [--output results.json] [--compare baseline.json] [--quick]
+
+  --output  : Save the results as JSON
+  --compare : Compare with saved results; exits with status 1 if the p50
+              latency of a benchmark is more than --threshold percent
+              higher (p50 is used since it is less noisy than the mean)
+  --quick   : Fewer iterations (for a fast smoke test)
+
+"""
+import os
+import sys
+import json
+import tempfile
+import time
+import platform
+import argparse
+import threading
+import contextlib
+
+import numpy as np
+
+import sim_bbio
+sim_bbio.install()
+
+import sim_i2c
+
+import ht16k33                 as HT16K33
+import button                  as BUTTON
+import button_bank             as BUTTON_BANK
+import servo                   as SERVO
+import pwm_sysfs               as PWM_SYSFS
+import potentiometer           as POT
+import sample_filter           as FILTER
+import prosthetic_force_sensor as PROS
+
+# ------------------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------------------
+
+RESULTS_VERSION       = 1
+
+DEFAULT_ITERATIONS    = 2000
+QUICK_ITERATIONS      = 200
+BUTTON_PRESSES        = 20
+QUICK_BUTTON_PRESSES  = 5
+
+DEFAULT_THRESHOLD     = 10.0          # Percent higher p50 counted as regression
+
+BUTTON_PIN            = "P2_2"
+BANK_PINS             = ["P2_2", "P2_4", "P2_6", "P2_8", "P2_10", "P2_18", "P2_20", "P2_22"]
+SERVO_PIN             = "P1_36"
+POT_PIN               = "P1_19"
+FSR_PIN               = "P1_27"
+
+FILTER_BLOCK          = 1000          # Samples per block (1 s at 1 kS/s)
+
+PROS_FINGER_TEXT      = ["ON{0}".format(i) for i in range(9)] + ["OFF"]
+
+# ------------------------------------------------------------------------
+# Functions
+# ------------------------------------------------------------------------
+
+def percentile(values, percent):
+    """Return the nearest-rank percentile of values"""
+    ordered = sorted(values)
+    index   = int(round((percent / 100.0) * (len(ordered) - 1)))
+    return ordered[index]
+
+# End def
+
+
+def summarize(name, latencies, bus=None):
+    """Return the result dictionary for a list of latencies (seconds)"""
+    iterations = len(latencies)
+    ops        = {key : count / iterations for key, count in sorted(sim_bbio.stats.items())}
+
+    if bus is not None:
+        ops["i2c.transactions"] = len(bus.transactions) / iterations
+        ops["i2c.bytes"]        = bus.byte_count / iterations
+
+    return {"name"        : name,
+            "iterations"  : iterations,
+            "ops_per_sec" : iterations / sum(latencies),
+            "p50_us"      : 1e6 * percentile(latencies, 50),
+            "p99_us"      : 1e6 * percentile(latencies, 99),
+            "ops_per_call": ops}
+
+# End def
+
+
+def measure(name, function, iterations, bus=None):
+    """Time function(i) for i in range(iterations).
+
+    If a simulated bus is given, the modeled bus time of each call is added
+    to its latency and the bus transactions are counted.
+    """
+    latencies = []
+
+    sim_bbio.reset_stats()
+    if bus is not None:
+        bus.reset_stats()
+
+    for i in range(iterations):
+        bus_start = bus.elapsed if bus is not None else 0.0
+        start     = time.perf_counter()
+
+        function(i)
+
+        latency = time.perf_counter() - start
+        if bus is not None:
+            latency += bus.elapsed - bus_start
+
+        latencies.append(latency)
+
+    return summarize(name, latencies, bus)
+
+# End def
+
+
+def bench_ht16k33(iterations):
+    """HT16K33 text() / update() on a simulated 100 kHz bus"""
+    bus     = sim_i2c.SimulatedI2CBus()
+    display = HT16K33.HT16K33(bus, 0x70)
+
+    results = [measure("ht16k33.text",
+                       lambda i: display.text(PROS_FINGER_TEXT[i % len(PROS_FINGER_TEXT)]),
+                       iterations, bus),
+               measure("ht16k33.update",
+                       lambda i: display.update(i % (HT16K33.HT16K33_MAX_VALUE + 1)),
+                       iterations, bus)]
+
+    display.cleanup()
+    return results
+
+# End def
+
+
+def bench_button(presses, edge_detect=False):
+    """Latency from the pin changing to the on press callback running"""
+    button    = BUTTON.Button(BUTTON_PIN, edge_detect=edge_detect)
+    pressed   = []
+    latencies = []
+
+    button.set_on_press_callback(lambda: pressed.append(time.perf_counter()))
+
+    sim_bbio.reset_stats()
+
+    for i in range(presses):
+        del pressed[:]
+
+        # Press part way through a poll period, then release
+        waiter = threading.Thread(target=button.wait_for_press, daemon=True)
+        waiter.start()
+        time.sleep(0.013 * (i % 7) + 0.005)
+
+        start = time.perf_counter()
+        sim_bbio.GPIO.set_input(BUTTON_PIN, button.pressed_value)
+
+        while not pressed:
+            time.sleep(0.0005)
+
+        latencies.append(pressed[0] - start)
+        sim_bbio.GPIO.set_input(BUTTON_PIN, button.unpressed_value)
+        waiter.join()
+
+    button.cleanup()
+    
+    if edge_detect:
+        return [summarize("button.wait_for_press_edge", latencies)]
+    return [summarize("button.wait_for_press", latencies)]
+
+# End def
+
+
+def bench_button_bank(presses, count):
+    """Latency from the pin changing to the record being queued"""
+    bank      = BUTTON_BANK.ButtonBank(BANK_PINS[:count])
+    latencies = []
+
+    bank.start()
+    sim_bbio.reset_stats()
+
+    for i in range(presses):
+        start = time.perf_counter()
+        sim_bbio.GPIO.set_input(BANK_PINS[0], BUTTON_BANK.LOW)
+        bank.get()
+        latencies.append(time.perf_counter() - start)
+
+        sim_bbio.GPIO.set_input(BANK_PINS[0], BUTTON_BANK.HIGH)
+        bank.get()
+
+        # Stay outside the debounce time
+        time.sleep(2 * BUTTON_BANK.BOUNCE_TIME / 1000.0)
+
+    bank.cleanup()
+
+    return [summarize("button_bank.{0}".format(count), latencies)]
+
+# End def
+
+
+def bench_servo(iterations):
+    """Servo.turn() sweeping across the range"""
+    servo  = SERVO.Servo(SERVO_PIN)
+    result = measure("servo.turn", lambda i: servo.turn(i % 101), iterations)
+    servo.cleanup()
+    return [result]
+
+# End def
+
+
+def make_pwm_tree(root, pin):
+    """Create the sysfs files of an exported PWM channel under root"""
+    device, channel = PWM_SYSFS.pin_to_pwm(pin)
+    chip            = os.path.join(root, "devices", device, "pwm", "pwmchip0")
+    path            = os.path.join(chip, "pwm-0:{0}".format(channel))
+
+    os.makedirs(path)
+    os.makedirs(os.path.join(root, "class"))
+    os.symlink(chip, os.path.join(root, "class", "pwmchip0"))
+
+    with open(os.path.join(path, "period"), "w") as f:
+        f.write(str(1000000000 // SERVO.SG90_FREQ))
+    with open(os.path.join(path, "duty_cycle"), "w") as f:
+        f.write("0")
+
+    return os.path.join(path, "duty_cycle")
+
+# End def
+
+
+def open_write_close(path, value):
+    """Duty cycle update that opens the sysfs file on every call"""
+    with open(path, "wb", buffering=0) as f:
+        f.write(value)
+
+# End def
+
+
+def bench_pwm(iterations):
+    """Servo duty cycle updates: per call open / write / close vs persistent file"""
+    with tempfile.TemporaryDirectory() as root:
+        duty_path = make_pwm_tree(root, SERVO_PIN)
+        channel   = PWM_SYSFS.SysfsPWMChannel(SERVO_PIN, os.path.join(root, "class"))
+        values    = [channel.encode(SERVO.SG90_MIN_DUTY + (i % 101) / 20.0) for i in range(101)]
+
+        results = [measure("pwm.open_write_close",
+                           lambda i: open_write_close(duty_path, values[i % 101]), iterations),
+                   measure("pwm.pwrite",
+                           lambda i: channel.write(values[i % 101]), iterations),
+                   measure("pwm.pwrite_unchanged",
+                           lambda i: channel.write(values[0]), iterations)]
+        channel.close()
+
+    return results
+
+# End def
+
+
+def bench_potentiometer(iterations):
+    """Potentiometer.get_value()"""
+    sim_bbio.ADC.set_source(POT_PIN, lambda n: (n % 4096) / 4095.0)
+    pot    = POT.Potentiometer(POT_PIN)
+    result = measure("potentiometer.get_value", lambda i: pot.get_value(), iterations)
+    pot.cleanup()
+    
+    pot        = POT.Potentiometer(POT_PIN, oversample=16)
+    oversample = measure("potentiometer.get_reading_16", lambda i: pot.get_reading(), iterations)
+    pot.cleanup()
+    
+    return [result, oversample]
+
+# End def
+
+
+def bench_sample_filter(iterations):
+    """One block of samples through a three stage filter ring"""
+    stages = FILTER.make_filters([("median", {"window" : 5}),
+                                  ("ema", {"alpha" : 0.2}),
+                                  ("butterworth", {"cutoff" : 20, "rate" : 1000})])
+    ring   = FILTER.SampleRing(4 * FILTER_BLOCK, stages)
+    block  = (np.arange(FILTER_BLOCK) % 4096) / 4095.0
+
+    return [measure("sample_filter.block", lambda i: ring.extend(block), iterations // 10)]
+
+# End def
+
+
+def fsr_ramp(n):
+    """FSR voltage ramp that moves through every grip level"""
+    return 0.1 + 0.05 * ((n // 20) % 8)
+
+# End def
+
+
+def bench_pros_finger(iterations):
+    """pros_finger.update_grip() with the synchronous and async display"""
+    results = []
+
+    for name, async_display in [("pros_finger.tick", False), ("pros_finger.tick_async", True)]:
+        sim_bbio.ADC.set_source(FSR_PIN, fsr_ramp)
+        bus    = sim_i2c.SimulatedI2CBus()
+        finger = PROS.pros_finger(async_display=async_display, i2c_bus=bus)
+
+        if async_display:
+            # The display is written by another thread; the modeled bus
+            # time does not delay the caller, so it is only counted
+            result = measure(name, lambda i: finger.update_grip(), iterations)
+            finger.display.cleanup()
+            result["ops_per_call"]["i2c.transactions"] = len(bus.transactions) / iterations
+            result["ops_per_call"]["i2c.bytes"]        = bus.byte_count / iterations
+        else:
+            result = measure(name, lambda i: finger.update_grip(), iterations, bus)
+            finger.display.cleanup()
+
+        results.append(result)
+
+    return results
+
+# End def
+
+
+def run_all(quick=False):
+    """Run every benchmark and return the list of results"""
+    iterations = QUICK_ITERATIONS if quick else DEFAULT_ITERATIONS
+    presses    = QUICK_BUTTON_PRESSES if quick else BUTTON_PRESSES
+    results    = []
+
+    # Drivers print on every call; keep the report readable
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            results += bench_ht16k33(iterations)
+            results += bench_button(presses)
+            results += bench_button(presses, edge_detect=True)
+            results += bench_button_bank(presses, 1)
+            results += bench_button_bank(presses, len(BANK_PINS))
+            results += bench_servo(iterations)
+            results += bench_pwm(iterations)
+            results += bench_potentiometer(iterations)
+            results += bench_sample_filter(iterations)
+            results += bench_pros_finger(iterations)
+
+    return results
+
+# End def
+
+
+def print_results(results):
+    """Print the results as a table"""
+    print("{0:<26} {1:>12} {2:>10} {3:>10}  {4}".format("benchmark", "ops/sec", "p50 us", "p99 us", "ops per call"))
+
+    for result in results:
+        ops = ", ".join(["{0}={1:g}".format(key, round(value, 2))
+                             for key, value in result["ops_per_call"].items()])
+
+        print("{0:<26} {1:12.1f} {2:10.1f} {3:10.1f}  {4}".format(
+              result["name"], result["ops_per_sec"], result["p50_us"], result["p99_us"], ops))
+
+# End def
+
+
+def compare_results(results, baseline, threshold):
+    """Print the change against baseline results; return the regressions"""
+    previous    = {result["name"] : result for result in baseline["results"]}
+    regressions = []
+
+    print("{0:<26} {1:>12} {2:>12} {3:>9}".format("benchmark", "base p50 us", "p50 us", "change"))
+
+    for result in results:
+        if result["name"] not in previous:
+            continue
+
+        old    = previous[result["name"]]["p50_us"]
+        change = 100.0 * (result["p50_us"] - old) / old
+        flag   = ""
+
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(result["name"])
+
+        print("{0:<26} {1:12.1f} {2:12.1f} {3:8.1f}%{4}".format(
+              result["name"], old, result["p50_us"], change, flag))
+
+    return regressions
+
+# End def
+
+
+# ------------------------------------------------------------------------
+# Main script
+# ------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Driver benchmark suite (simulated hardware)")
+    parser.add_argument("--output",    help="save results as JSON")
+    parser.add_argument("--compare",   help="compare against saved JSON results")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="percent p50 increase reported as a regression")
+    parser.add_argument("--quick",     action="store_true", help="fewer iterations")
+    args = parser.parse_args()
+
+    print("Benchmark Start")
+
+    results = run_all(args.quick)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"version"   : RESULTS_VERSION,
+                       "timestamp" : time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       "python"    : platform.python_version(),
+                       "machine"   : platform.machine(),
+                       "results"   : results}, f, indent=2)
+        print("Results saved to {0}".format(args.output))
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare_results(results, json.load(f), args.threshold)
+
+    print("Benchmark Complete")
+
+    if regressions:
+        sys.exit(1)
+
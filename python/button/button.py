@@ -44,11 +44,36 @@ button is not pressed) and will be connected to power when the button is pressed
   To select the pull up configuration, press_low=True.  To select the pull down
 configuration, press_low=False.
 
+  By default the button is polled every "sleep_time" seconds.  With 
+edge_detect=True the button instead waits for GPIO edge events from the 
+kernel (see gpio_event.py), so a press is seen within about a millisecond 
+and the CPU is idle while waiting.  In this mode the pressed / unpressed 
+callbacks still run every "sleep_time" if they are set; with no callbacks
+set, wait_for_press() sleeps until an edge occurs (the input is also 
+re-read once a second in case the debounce dropped an edge).
+
+  Press durations are measured with a monotonic clock, so they are not 
+affected by changes to the system time.  With edge_detect=True the 
+duration is the time between the press and release edges as timestamped 
+when they were captured (by the kernel when the GPIO character device is 
+available), so it is not quantized by "sleep_time" or delayed by callbacks.
+A press and release that both happen while a callback is running are 
+still detected.
+
+  The async methods (pressed(), released(), press() and events()) wait for
+the button from an asyncio event loop, so one loop can watch buttons while
+it drives other peripherals.  With edge_detect=True they sleep until the 
+edge source is readable (loop.add_reader()); otherwise the input is polled
+every "sleep_time" with asyncio.sleep().  Only one task at a time should 
+wait on each button.
+
 
 Software API:
 
-  Button(pin, press_low)
+  Button(pin, press_low=True, sleep_time=0.1, edge_detect=False, bouncetime=5, gpio=None)
     - Provide pin that the button monitors
+    - bouncetime is the debounce time (ms) used with edge_detect=True
+    - gpio is the GPIO number of the pin (default: looked up from the pin)
     
     wait_for_press()
       - Wait for the button to be pressed 
@@ -61,6 +86,20 @@ Software API:
     get_last_press_duration()
       - Return the duration the button was last pressed
 
+    async pressed()
+      - Wait for the button to be pressed; return the time of the press
+    
+    async released()
+      - Wait for the button to be released; return the time of the release
+    
+    async press()
+      - Async wait_for_press(): wait for the button to be pressed and 
+        released (on press / on release callbacks are executed)
+    
+    async for timestamp, pressed in events()
+      - Iterate over the button changes; pressed is True for a press and
+        False for a release
+
     cleanup()
       - Clean up HW
       
@@ -68,6 +107,13 @@ Software API:
       These functions will be called at the various times during a button 
       press cycle.  There is also a corresponding function to get the value
       from each of these callback functions in case they return something.
+      
+      The pressed / unpressed callbacks run on a separate callback thread so 
+      a slow callback does not stretch the time between button reads.  If 
+      the previous call has not finished when the next one is due, that 
+      call is skipped (not queued).  wait_for_press() waits for running 
+      calls to finish before it returns, so the callback values are those
+      of the last calls.
     
       - set_pressed_callback(function)
         - Excuted every "sleep_time" while the button is pressed
@@ -86,8 +132,14 @@ Software API:
 
 """
 import time
+import select
+import asyncio
+import collections
+import concurrent.futures
 import Adafruit_BBIO.GPIO as GPIO
 
+import gpio_event as GPIO_EVENT
+
 # ------------------------------------------------------------------------
 # Constants
 # ------------------------------------------------------------------------
@@ -95,6 +147,9 @@ import Adafruit_BBIO.GPIO as GPIO
 HIGH = GPIO.HIGH
 LOW = GPIO.LOW
 
+BOUNCE_TIME = 5         # Debounce time (ms) for edge detection
+EDGE_RECHECK_TIME = 1.0 # Re-read the input (s) in case debounce dropped an edge
+
 # ------------------------------------------------------------------------
 # Functions / Classes
 # ------------------------------------------------------------------------
@@ -106,6 +161,16 @@ class Button():
     pressed_value = None
     sleep_time = None
     press_duration = None
+    edge_detect = None
+    bouncetime = None
+    gpio = None
+    edge_source = None
+    edge_times = None
+    last_value = None
+    pending_edges = None
+    executor = None
+    callback_futures = None
+    skipped_callbacks = None
 
     pressed_callback = None
     pressed_callback_value = None
@@ -116,7 +181,7 @@ class Button():
     on_release_callback = None
     on_release_callback_value = None
 
-    def __init__(self, pin=None, press_low=True, sleep_time=0.1):
+    def __init__(self, pin=None, press_low=True, sleep_time=0.1, edge_detect=False, bouncetime=BOUNCE_TIME, gpio=None):
         """ Initialize variables and set up the button """
         if (pin is None):
             raise ValueError("Pin not provided for Button()")
@@ -135,6 +200,17 @@ class Button():
         # By default sleep time is "0.1" seconds
         self.sleep_time = sleep_time
         self.press_duration = 0.0        
+        
+        # Wait for kernel edge events instead of polling
+        self.edge_detect = edge_detect
+        self.bouncetime = bouncetime
+        self.gpio = gpio
+        self.edge_times = {}
+        self.pending_edges = collections.deque()
+        
+        # Pressed / unpressed callbacks run on a callback thread
+        self.callback_futures = {}
+        self.skipped_callbacks = 0
 
         # Initialize the hardware components        
         self._setup()
@@ -142,27 +218,112 @@ class Button():
     def _setup(self):
         """ Setup the hardware components. """
         if self.pressed_value == LOW:
-            GPIO.setup(self.pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)  # Internal pull-up
+            pull_up_down = GPIO.PUD_UP      # Internal pull-up
         else:
-            GPIO.setup(self.pin, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)  # Internal pull-down
+            pull_up_down = GPIO.PUD_DOWN    # Internal pull-down
+        
+        GPIO.setup(self.pin, GPIO.IN, pull_up_down=pull_up_down)
+        
+        if self.edge_detect:
+            self.edge_source = GPIO_EVENT.open_edge_source(self.pin, self.bouncetime, self.gpio, pull_up_down)
+        
+        self.last_value = self._input()
+
+    def _input(self):
+        """ Return the current value of the button input """
+        if self.edge_source is not None:
+            return self.edge_source.get_value()
+        return GPIO.input(self.pin)
+
+    def _dispatch(self, callback_name):
+        """ Start the named callback on the callback thread unless the 
+            previous call is still running (then the call is skipped).
+        """
+        callback = getattr(self, callback_name)
+        if callback is None:
+            return
+        
+        future = self.callback_futures.get(callback_name)
+        if future is not None:
+            if not future.done():
+                self.skipped_callbacks += 1
+                return
+            
+            # Raise an exception from the previous call in this thread
+            future.result()
+        
+        if self.executor is None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="button-callback")
+        
+        future = self.executor.submit(callback)
+        future.add_done_callback(lambda done: self._store_value(callback_name, done))
+        self.callback_futures[callback_name] = future
+
+    def _store_value(self, callback_name, future):
+        """ Store the return value of a finished callback """
+        if (not future.cancelled()) and (future.exception() is None):
+            setattr(self, callback_name + "_value", future.result())
+
+    def _finish_callback(self, callback_name):
+        """ Wait for a running call of the named callback to finish """
+        future = self.callback_futures.pop(callback_name, None)
+        if future is not None:
+            setattr(self, callback_name + "_value", future.result())
+
+    def _wait_while(self, value, callback_name):
+        """ Wait while the button input is value.
+        
+            The callback named callback_name (e.g. "pressed_callback") is 
+            started every "sleep_time" while waiting (see _dispatch()) and 
+            its return value is stored in "<callback_name>_value".
+            
+            With edge detection, the capture time of the last edge to each 
+            value is recorded in edge_times, and the wait also ends if an 
+            edge away from value was seen (even if the input has already 
+            changed back).
+        """
+        while self._input() == value:
+            self._dispatch(callback_name)
+            
+            if self.edge_source is None:
+                time.sleep(self.sleep_time)
+                continue
+            
+            # Sleep until an edge (or the next callback tick)
+            if getattr(self, callback_name) is not None:
+                timeout = self.sleep_time
+            else:
+                timeout = EDGE_RECHECK_TIME
+            
+            readable, _, _ = select.select([self.edge_source], [], [], timeout)
+            if not readable:
+                continue
+            
+            changed = False
+            for timestamp, edge_value in self.edge_source.read_events():
+                self.edge_times[edge_value] = timestamp
+                self.last_value = edge_value
+                if edge_value != value:
+                    changed = True
+            
+            if changed:
+                return
 
     def is_pressed(self):
         """ Is the Button pressed? """
-        return GPIO.input(self.pin) == self.pressed_value
+        return self._input() == self.pressed_value
 
     def wait_for_press(self):
         """ Wait for the button to be pressed. """
         button_press_time = None
+        self.edge_times = {}
         
         # Wait for button press (execute while the button is NOT pressed)
         print("Waiting for button press...")
-        while GPIO.input(self.pin) == self.unpressed_value:
-            if self.unpressed_callback is not None:
-                self.unpressed_callback_value = self.unpressed_callback()
-            time.sleep(self.sleep_time)
+        self._wait_while(self.unpressed_value, "unpressed_callback")
             
         # Record time when button is pressed
-        button_press_time = time.time()
+        button_press_time = time.monotonic()
         
         # Execute the on press callback function
         if self.on_press_callback is not None:
@@ -170,13 +331,102 @@ class Button():
         
         # Wait for button release (execute while the button IS pressed)
         print("Button pressed, waiting for release...")
-        while GPIO.input(self.pin) == self.pressed_value:
-            if self.pressed_callback is not None:
-                self.pressed_callback_value = self.pressed_callback()
-            time.sleep(self.sleep_time)
+        self._wait_while(self.pressed_value, "pressed_callback")
         
-        # Record the press duration
-        self.press_duration = time.time() - button_press_time
+        # Record the press duration; use the edge capture times if both
+        # edges were seen (they use the same clock)
+        press_edge = self.edge_times.get(self.pressed_value)
+        release_edge = self.edge_times.get(self.unpressed_value)
+        
+        if (press_edge is not None) and (release_edge is not None) and (release_edge >= press_edge):
+            self.press_duration = release_edge - press_edge
+        else:
+            self.press_duration = time.monotonic() - button_press_time
+        
+        # Wait for running callbacks so their values are current
+        self._finish_callback("unpressed_callback")
+        self._finish_callback("pressed_callback")
+
+        # Execute the on release callback function
+        if self.on_release_callback is not None:
+            self.on_release_callback_value = self.on_release_callback()
+
+    # -----------------------------------------------------
+    # Async Functions
+    # -----------------------------------------------------
+
+    def _read_edges(self, future):
+        """ Called by the event loop when the edge source is readable """
+        self.pending_edges.extend(self.edge_source.read_events())
+        if not future.done():
+            future.set_result(None)
+
+    async def _next_edge(self):
+        """ Return the next change of the input as (timestamp, value) """
+        if self.edge_source is None:
+            # Poll; a change since the last call is returned immediately
+            while True:
+                value = self._input()
+                if value != self.last_value:
+                    self.last_value = value
+                    return (time.monotonic(), value)
+                await asyncio.sleep(self.sleep_time)
+        
+        loop = asyncio.get_running_loop()
+        fd = self.edge_source.fileno()
+        
+        while True:
+            while self.pending_edges:
+                timestamp, value = self.pending_edges.popleft()
+                if value != self.last_value:
+                    self.last_value = value
+                    return (timestamp, value)
+            
+            # Sleep until the edge source is readable
+            future = loop.create_future()
+            loop.add_reader(fd, self._read_edges, future)
+            try:
+                await future
+            finally:
+                loop.remove_reader(fd)
+
+    async def events(self):
+        """ Async iterator of (timestamp, pressed) for every button change """
+        while True:
+            timestamp, value = await self._next_edge()
+            yield (timestamp, value == self.pressed_value)
+
+    async def pressed(self):
+        """ Wait for the button to be pressed; return the time of the press """
+        while True:
+            timestamp, value = await self._next_edge()
+            if value == self.pressed_value:
+                return timestamp
+
+    async def released(self):
+        """ Wait for the button to be released; return the time of the release """
+        while True:
+            timestamp, value = await self._next_edge()
+            if value == self.unpressed_value:
+                return timestamp
+
+    async def press(self):
+        """ Wait for the button to be pressed and released (async wait_for_press()). """
+        # Wait for button press
+        press_time = await self.pressed()
+        button_press_time = time.monotonic()
+        
+        # Execute the on press callback function
+        if self.on_press_callback is not None:
+            self.on_press_callback_value = self.on_press_callback()
+        
+        # Wait for button release and record the press duration
+        release_time = await self.released()
+        
+        if release_time >= press_time:
+            self.press_duration = release_time - press_time
+        else:
+            self.press_duration = time.monotonic() - button_press_time
 
         # Execute the on release callback function
         if self.on_release_callback is not None:
@@ -188,8 +438,13 @@ class Button():
     
     def cleanup(self):
         """ Clean up the button hardware. """
-        # Nothing to do for GPIO
-        pass
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        
+        if self.edge_source is not None:
+            self.edge_source.close()
+            self.edge_source = None
 
     # -----------------------------------------------------
     # Callback Functions
@@ -0,0 +1,304 @@
+"""
+--------------------------------------------------------------------------
+Button Bank
+--------------------------------------------------------------------------
+License:
+Copyright 2025 - Tarik Price
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+this list of conditions and the following disclaimer in the documentation
+and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its contributors
+may be used to endorse or promote products derived from this software without
+specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+--------------------------------------------------------------------------
+
+
+Button Bank
+
+  Watch many buttons from one thread.  Every button has a GPIO edge source
+(see gpio_event.py) registered in a single selector, so the thread sleeps
+until any button changes and the CPU cost does not grow with the number of
+buttons while they are idle.  All buttons are debounced in the bank and 
+every press / release is delivered as a (pin, event, timestamp) record 
+through one thread-safe queue.
+
+  Debounce: the first edge after a quiet period is reported immediately.
+Edges within "bouncetime" of it are ignored, and once the bouncing has 
+stopped for "bouncetime" the input is read again so that a change hidden
+by the bouncing (e.g. a very short tap) is still reported.
+
+  Timestamps are the edge capture times from the edge sources (kernel 
+timestamps when the GPIO character device is available), so the records
+of different buttons can be compared and ordered.
+
+Software API:
+
+  ButtonBank(pins=None, press_low=True, bouncetime=5)
+    - pins is a list of pins to add (see add())
+    - bouncetime is the debounce time (ms) used for every button
+
+    add(pin, press_low=None, gpio=None)
+      - Add a button; press_low defaults to the bank setting
+      - gpio is the GPIO number of the pin (default: looked up from the pin)
+      - Buttons must be added before start(); raises RuntimeError while
+        the scanner thread is running
+
+    start()
+      - Start the scanner thread
+
+    get(timeout=None)
+      - Return the next (pin, event, timestamp) record; event is PRESS or
+        RELEASE.  Raises queue.Empty after timeout seconds.
+
+    events
+      - The queue.Queue of records (for get_nowait(), qsize(), ...)
+
+    is_pressed(pin)
+      - Return the debounced state of the button
+
+    cleanup()
+      - Stop the scanner thread and release the buttons
+
+"""
+import os
+import time
+import queue
+import selectors
+import threading
+
+import Adafruit_BBIO.GPIO as GPIO
+
+import gpio_event as GPIO_EVENT
+
+# ------------------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------------------
+
+HIGH = GPIO.HIGH
+LOW = GPIO.LOW
+
+PRESS = "press"
+RELEASE = "release"
+
+BOUNCE_TIME = 5         # Debounce time (ms)
+
+# ------------------------------------------------------------------------
+# Functions / Classes
+# ------------------------------------------------------------------------
+
+class _BankButton():
+    """ State of one button in the bank """
+    pin = None
+    pressed_value = None
+    source = None
+    value = None
+    last_time = None
+    settle_time = None
+    bounce_edge = None
+
+    def __init__(self, pin, pressed_value, source):
+        """ Initialize the button state from the current input """
+        self.pin = pin
+        self.pressed_value = pressed_value
+        self.source = source
+        self.value = source.get_value()
+
+
+class ButtonBank():
+    """ ButtonBank Class """
+    buttons = None
+    press_low = None
+    bouncetime = None
+    events = None
+    selector = None
+    thread = None
+    running = None
+    wakeup_read = None
+    wakeup_write = None
+
+    def __init__(self, pins=None, press_low=True, bouncetime=BOUNCE_TIME):
+        """ Initialize variables and add the buttons """
+        self.buttons = {}
+        self.press_low = press_low
+        self.bouncetime = bouncetime / 1000.0
+        self.events = queue.Queue()
+        self.selector = selectors.DefaultSelector()
+        self.running = False
+        
+        # cleanup() writes to the pipe to wake up the scanner thread
+        self.wakeup_read, self.wakeup_write = os.pipe()
+        self.selector.register(self.wakeup_read, selectors.EVENT_READ, None)
+        
+        if pins is not None:
+            for pin in pins:
+                self.add(pin)
+
+    def add(self, pin, press_low=None, gpio=None):
+        """ Add a button to the bank (before start()) """
+        # The scanner thread uses the buttons and the selector without a lock
+        if self.thread is not None:
+            raise RuntimeError("Buttons must be added before ButtonBank.start()")
+        
+        if pin in self.buttons:
+            raise ValueError("Button on pin {0} already added".format(pin))
+        
+        if press_low is None:
+            press_low = self.press_low
+        
+        if press_low:
+            pressed_value = LOW
+            pull_up_down = GPIO.PUD_UP      # Internal pull-up
+        else:
+            pressed_value = HIGH
+            pull_up_down = GPIO.PUD_DOWN    # Internal pull-down
+        
+        GPIO.setup(pin, GPIO.IN, pull_up_down=pull_up_down)
+        
+        # The bank debounces, so the edge sources report every edge
+        source = GPIO_EVENT.open_edge_source(pin, 0, gpio, pull_up_down)
+        button = _BankButton(pin, pressed_value, source)
+        
+        self.buttons[pin] = button
+        self.selector.register(source, selectors.EVENT_READ, button)
+
+    def start(self):
+        """ Start the scanner thread """
+        if self.thread is not None:
+            return
+        
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _report(self, button, timestamp, value):
+        """ Queue a record if the debounced value of the button changed """
+        if value == button.value:
+            return
+        
+        button.value = value
+        
+        if value == button.pressed_value:
+            self.events.put((button.pin, PRESS, timestamp))
+        else:
+            self.events.put((button.pin, RELEASE, timestamp))
+
+    def _edges(self, button):
+        """ Debounce the waiting edges of a button """
+        for timestamp, value in button.source.read_events():
+            if (button.last_time is not None) and (timestamp - button.last_time < self.bouncetime):
+                # Bouncing; check the input once it has been quiet
+                button.bounce_edge = (timestamp, value)
+                button.settle_time = time.monotonic() + self.bouncetime
+                continue
+            
+            button.last_time = timestamp
+            button.bounce_edge = None
+            button.settle_time = None
+            self._report(button, timestamp, value)
+
+    def _settle(self, button):
+        """ Read the input of a button that has stopped bouncing """
+        value = button.source.get_value()
+        timestamp, edge_value = button.bounce_edge
+        
+        # Use the time of the last edge to this value (same clock as the
+        # other records); otherwise the change was not seen as an edge
+        if edge_value != value:
+            timestamp = button.last_time
+        
+        button.bounce_edge = None
+        button.settle_time = None
+        self._report(button, timestamp, value)
+
+    def _timeout(self):
+        """ Return the time until the next button has to be settled """
+        settle_times = [button.settle_time for button in self.buttons.values()
+                        if button.settle_time is not None]
+        
+        if not settle_times:
+            return None
+        
+        return max(min(settle_times) - time.monotonic(), 0)
+
+    def _run(self):
+        """ Scanner thread: wait for edges on every button at once """
+        while self.running:
+            for key, mask in self.selector.select(self._timeout()):
+                if key.data is not None:
+                    self._edges(key.data)
+            
+            now = time.monotonic()
+            for button in self.buttons.values():
+                if (button.settle_time is not None) and (now >= button.settle_time):
+                    self._settle(button)
+
+    def get(self, timeout=None):
+        """ Return the next (pin, event, timestamp) record """
+        return self.events.get(timeout=timeout)
+
+    def is_pressed(self, pin):
+        """ Return the debounced state of the button on pin """
+        button = self.buttons[pin]
+        return button.value == button.pressed_value
+
+    def cleanup(self):
+        """ Stop the scanner thread and release the buttons """
+        if self.thread is not None:
+            self.running = False
+            os.write(self.wakeup_write, b"\0")
+            self.thread.join()
+            self.thread = None
+        
+        for button in self.buttons.values():
+            self.selector.unregister(button.source)
+            button.source.close()
+        self.buttons = {}
+        
+        self.selector.close()
+        os.close(self.wakeup_read)
+        os.close(self.wakeup_write)
+
+# ------------------------------------------------------------------------
+# Main script
+# ------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    print("Button Bank Test")
+
+    # Create a bank of buttons
+    bank = ButtonBank(["P2_2", "P2_4", "P2_6"])
+    bank.start()
+    
+    # Use a Keyboard Interrupt (i.e. "Ctrl-C") to exit the test
+    print("Press the buttons; use Ctrl-C to Exit")
+    
+    try:
+        while True:
+            pin, event, timestamp = bank.get()
+            print("    {0:.6f} {1} {2}".format(timestamp, pin, event))
+        
+    except KeyboardInterrupt:
+        pass
+
+    bank.cleanup()
+
+    print("Test Complete")
@@ -0,0 +1,307 @@
+"""
+--------------------------------------------------------------------------
+Button Gestures
+--------------------------------------------------------------------------
+License:
+Copyright 2025 - Tarik Price
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+this list of conditions and the following disclaimer in the documentation
+and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its contributors
+may be used to endorse or promote products derived from this software without
+specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+--------------------------------------------------------------------------
+
+
+Button Gestures
+
+  Streaming classifier that turns button press / release records (e.g. 
+from a ButtonBank) into gestures:
+
+  - SHORT  : Press released before long_time (and no second tap follows
+             within double_time)
+  - LONG   : Press held for long_time; reported while the button is still
+             held (the release is ignored)
+  - DOUBLE : Second press within double_time of the release of a short 
+             press; reported on the second press
+  - CHORD  : Two or more buttons pressed within chord_time of the first;
+             reported when the chord_time window closes
+
+  Every gesture is reported as soon as it can be decided: either when an
+edge arrives (feed()) or when a deadline passes (expire()).  timeout() 
+returns the time until the next deadline, so an application can block on
+its event queue with that timeout instead of sleeping.  gestures() does
+this for a ButtonBank.
+
+  Timestamps must be on the time.monotonic() clock (as from gpio_event.py
+and ButtonBank).  Setting double_time or chord_time to None disables 
+double taps / chords; SHORT is then reported on the release.
+
+Software API:
+
+  GestureClassifier(long_time=1.0, double_time=0.3, chord_time=0.05)
+
+    feed(pin, event, timestamp)
+      - Process a PRESS / RELEASE record; return the list of gestures 
+        decided (including any deadlines that passed before timestamp)
+
+    expire(now=None)
+      - Return the list of gestures whose deadlines have passed
+
+    timeout(now=None)
+      - Return the seconds until the next deadline (None if there is none)
+
+    gestures(bank)
+      - Generator of the gestures from a (started) ButtonBank
+
+  Gestures are (gesture, pins, timestamp) where pins is a tuple of pins and 
+timestamp is the time the gesture was decided.
+
+"""
+import time
+import queue
+
+from button_bank import PRESS, RELEASE
+
+# ------------------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------------------
+
+SHORT = "short"
+LONG = "long"
+DOUBLE = "double"
+CHORD = "chord"
+
+# ------------------------------------------------------------------------
+# Functions / Classes
+# ------------------------------------------------------------------------
+
+class _PinState():
+    """ Classification state of one button """
+    pin = None
+    down = None
+    press_time = None
+    release_time = None
+    tap_time = None
+    consumed = None
+
+    def __init__(self, pin):
+        """ Initialize the button as released """
+        self.pin = pin
+        self.down = False
+        self.consumed = False
+
+
+class GestureClassifier():
+    """ GestureClassifier Class """
+    long_time = None
+    double_time = None
+    chord_time = None
+    pins = None
+    chord_start = None
+    chord_pins = None
+
+    def __init__(self, long_time=1.0, double_time=0.3, chord_time=0.05):
+        """ Initialize variables """
+        self.long_time = long_time
+        self.double_time = double_time
+        self.chord_time = chord_time
+        self.pins = {}
+        self.chord_pins = []
+
+    def _state(self, pin):
+        """ Return the state of a button (created on first use) """
+        if pin not in self.pins:
+            self.pins[pin] = _PinState(pin)
+        return self.pins[pin]
+
+    def _tap(self, state, timestamp, gestures):
+        """ A press was released before long_time """
+        if self.double_time is None:
+            gestures.append((SHORT, (state.pin,), timestamp))
+        else:
+            # SHORT unless a second press follows within double_time
+            state.tap_time = timestamp
+
+    def _press(self, state, timestamp, gestures):
+        """ Process a press """
+        state.down = True
+        state.press_time = timestamp
+        state.consumed = False
+        
+        # Second press of a double tap
+        if state.tap_time is not None:
+            state.tap_time = None
+            state.consumed = True
+            gestures.append((DOUBLE, (state.pin,), timestamp))
+            return
+        
+        if self.chord_time is None:
+            return
+        
+        # Start a chord window or join the open one (a repeated press of
+        # a pin already in the window is not a chord with itself)
+        if not self.chord_pins:
+            self.chord_start = timestamp
+        if state.pin not in self.chord_pins:
+            self.chord_pins.append(state.pin)
+
+    def _release(self, state, timestamp, gestures):
+        """ Process a release """
+        state.down = False
+        
+        # Already reported as LONG / DOUBLE / CHORD
+        if state.consumed:
+            state.consumed = False
+            return
+        
+        # Decided when the chord window closes
+        if state.pin in self.chord_pins:
+            state.release_time = timestamp
+            return
+        
+        self._tap(state, timestamp, gestures)
+
+    def _close_chord(self, deadline, gestures):
+        """ The chord window has closed """
+        pins = self.chord_pins
+        self.chord_pins = []
+        
+        if len(pins) > 1:
+            for pin in pins:
+                state = self.pins[pin]
+                state.consumed = state.down
+                state.release_time = None
+            gestures.append((CHORD, tuple(pins), deadline))
+            return
+        
+        # A single press; classify a release that happened in the window
+        state = self.pins[pins[0]]
+        if state.release_time is not None:
+            self._tap(state, state.release_time, gestures)
+            state.release_time = None
+
+    def _next_deadline(self):
+        """ Return (deadline, action, state) of the next deadline or None """
+        deadlines = []
+        
+        if self.chord_pins:
+            deadlines.append((self.chord_start + self.chord_time, CHORD, None))
+        
+        for state in self.pins.values():
+            if state.down and not state.consumed and (state.pin not in self.chord_pins):
+                deadlines.append((state.press_time + self.long_time, LONG, state))
+            if state.tap_time is not None:
+                deadlines.append((state.tap_time + self.double_time, SHORT, state))
+        
+        if not deadlines:
+            return None
+        
+        return min(deadlines, key=lambda deadline: deadline[0])
+
+    def expire(self, now=None):
+        """ Return the list of gestures whose deadlines have passed """
+        if now is None:
+            now = time.monotonic()
+        
+        gestures = []
+        
+        while True:
+            deadline = self._next_deadline()
+            if (deadline is None) or (deadline[0] > now):
+                return gestures
+            
+            timestamp, action, state = deadline
+            
+            if action == CHORD:
+                self._close_chord(timestamp, gestures)
+            elif action == LONG:
+                state.consumed = True
+                gestures.append((LONG, (state.pin,), timestamp))
+            else:
+                state.tap_time = None
+                gestures.append((SHORT, (state.pin,), timestamp))
+
+    def feed(self, pin, event, timestamp):
+        """ Process a PRESS / RELEASE record; return the gestures decided """
+        # Deadlines before the edge are decided first
+        gestures = self.expire(timestamp)
+        state = self._state(pin)
+        
+        if event == PRESS:
+            self._press(state, timestamp, gestures)
+        elif event == RELEASE:
+            self._release(state, timestamp, gestures)
+        else:
+            raise ValueError("Unknown button event {0}".format(event))
+        
+        return gestures
+
+    def timeout(self, now=None):
+        """ Return the seconds until the next deadline (None if there is none) """
+        deadline = self._next_deadline()
+        if deadline is None:
+            return None
+        
+        if now is None:
+            now = time.monotonic()
+        
+        return max(deadline[0] - now, 0.0)
+
+    def gestures(self, bank):
+        """ Generator of the gestures from a ButtonBank """
+        while True:
+            try:
+                gestures = self.feed(*bank.get(timeout=self.timeout()))
+            except queue.Empty:
+                gestures = self.expire()
+            
+            for gesture in gestures:
+                yield gesture
+
+# ------------------------------------------------------------------------
+# Main script
+# ------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    from button_bank import ButtonBank
+    
+    print("Button Gestures Test")
+
+    # Create a bank of buttons and a classifier
+    bank = ButtonBank(["P2_2", "P2_4"])
+    classifier = GestureClassifier()
+    bank.start()
+    
+    # Use a Keyboard Interrupt (i.e. "Ctrl-C") to exit the test
+    print("Tap, double tap, hold or press both buttons; use Ctrl-C to Exit")
+    
+    try:
+        for gesture, pins, timestamp in classifier.gestures(bank):
+            print("    {0:.3f} {1} {2}".format(timestamp, gesture, pins))
+        
+    except KeyboardInterrupt:
+        pass
+
+    bank.cleanup()
+
+    print("Test Complete")
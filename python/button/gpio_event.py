@@ -0,0 +1,327 @@
+"""
+--------------------------------------------------------------------------
+GPIO Edge Events
+--------------------------------------------------------------------------
+License:
+Copyright 2025 - Tarik Price
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+this list of conditions and the following disclaimer in the documentation
+and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its contributors
+may be used to endorse or promote products derived from this software without
+specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+--------------------------------------------------------------------------
+
+GPIO Edge Events
+
+  Edge event sources for GPIO inputs.  Each source has a file descriptor
+(fileno()) that becomes readable when edges are waiting, so one or more
+sources can be waited on with select / selectors / asyncio.  Every edge is
+returned with the time it was captured on the time.monotonic() clock, so
+timestamps from different sources can be compared with each other and with
+time.monotonic().
+
+  GPIOEventLine uses the Linux GPIO character device (/dev/gpiochipN).  The
+kernel timestamps each edge when the interrupt occurs, so timestamps do 
+not depend on how quickly the program reads the events.  The kernel uses
+CLOCK_MONOTONIC on Linux 5.7+; on older kernels the CLOCK_REALTIME 
+timestamps are converted to the monotonic clock when they are read.  The pin must already be
+configured as a GPIO input (e.g. GPIO.setup() or config-pin); its sysfs
+export is released so the line can be requested.
+
+  GPIOEventCallback uses GPIO.add_event_detect() and timestamps each edge
+with time.monotonic() as the first thing the callback does.  It is used
+when the character device is not available.
+
+Software API:
+
+  open_edge_source(pin, bouncetime=0, gpio=None, pull_up_down=GPIO.PUD_OFF)
+    - Return a GPIOEventLine if possible, otherwise a GPIOEventCallback
+    - bouncetime   : Edges within bouncetime (ms) of the last edge are dropped
+    - gpio         : GPIO number (default: looked up from the pin name)
+    - pull_up_down : Pull used when the pin has to be set up again for the
+                     GPIOEventCallback fallback (same as GPIO.setup())
+
+  pin_to_gpio(pin)
+    - Return the GPIO number of a PocketBeagle header pin (e.g. "P2_2")
+
+  Edge sources:
+    fileno()
+      - File descriptor that is readable when edges are waiting
+
+    get_value()
+      - Return the current value of the input (HIGH / LOW)
+
+    read_events()
+      - Return the waiting edges as a list of (timestamp, value) where
+        value is the value of the input after the edge.  Does not block.
+
+    close()
+      - Release the line
+
+"""
+import os
+import time
+import platform
+import fcntl
+import struct
+import collections
+
+import Adafruit_BBIO.GPIO as GPIO
+
+# ------------------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------------------
+
+HIGH = GPIO.HIGH
+LOW = GPIO.LOW
+
+GPIO_CHIP_PATH = "/dev/gpiochip{0}"
+GPIO_UNEXPORT_PATH = "/sys/class/gpio/unexport"
+GPIOS_PER_CHIP = 32
+
+# Linux GPIO character device ABI v1 (see <linux/gpio.h>)
+GPIO_GET_LINEEVENT_IOCTL = 0xC030B404
+GPIOHANDLE_GET_LINE_VALUES_IOCTL = 0xC040B408
+GPIOHANDLE_REQUEST_INPUT = 0x01
+GPIOEVENT_REQUEST_BOTH_EDGES = 0x03
+GPIOEVENT_EVENT_RISING_EDGE = 0x01
+
+GPIOEVENT_REQUEST_FORMAT = "=III32si"    # struct gpioevent_request
+GPIOEVENT_DATA_FORMAT = "=QI4x"          # struct gpioevent_data
+GPIOEVENT_DATA_SIZE = struct.calcsize(GPIOEVENT_DATA_FORMAT)
+GPIOHANDLE_DATA_SIZE = 64                # struct gpiohandle_data
+
+CONSUMER_LABEL = b"edes301"
+
+# Event timestamps are CLOCK_MONOTONIC from Linux 5.7 (CLOCK_REALTIME before)
+KERNEL_MONOTONIC_VERSION = (5, 7)
+
+# GPIO number of the PocketBeagle header pins that can be used as GPIO
+POCKETBEAGLE_GPIO = {
+    "P1_02" :  87, "P1_04" :  89, "P1_06" :   5, "P1_08" :   2,
+    "P1_10" :   3, "P1_12" :   4, "P1_20" :  20, "P1_26" :  12,
+    "P1_28" :  13, "P1_29" : 117, "P1_30" :  43, "P1_31" : 114,
+    "P1_32" :  42, "P1_33" : 111, "P1_34" :  26, "P1_35" :  88,
+    "P1_36" : 110,
+    "P2_01" :  50, "P2_02" :  59, "P2_03" :  23, "P2_04" :  58,
+    "P2_05" :  30, "P2_06" :  57, "P2_07" :  31, "P2_08" :  60,
+    "P2_09" :  15, "P2_10" :  52, "P2_11" :  14, "P2_17" :  65,
+    "P2_18" :  47, "P2_19" :  27, "P2_20" :  64, "P2_22" :  46,
+    "P2_24" :  44, "P2_25" :  41, "P2_27" :  40, "P2_28" : 116,
+    "P2_29" :   7, "P2_30" : 113, "P2_31" :  19, "P2_32" : 112,
+    "P2_33" :  45, "P2_34" : 115, "P2_35" :  86,
+}
+
+# ------------------------------------------------------------------------
+# Functions / Classes
+# ------------------------------------------------------------------------
+
+def pin_to_gpio(pin):
+    """ Return the GPIO number of a PocketBeagle pin ("P2_2" or "P2_02") """
+    try:
+        header, number = pin.upper().split("_")
+        return POCKETBEAGLE_GPIO["{0}_{1:02d}".format(header, int(number))]
+    except (ValueError, KeyError):
+        raise ValueError("Unknown GPIO pin {0}".format(pin))
+
+
+def _kernel_version():
+    """ Return the (major, minor) version of the running kernel """
+    try:
+        major, minor = platform.release().split(".")[:2]
+        return (int(major), int(minor))
+    except ValueError:
+        return (0, 0)
+
+
+KERNEL_MONOTONIC_EVENTS = _kernel_version() >= KERNEL_MONOTONIC_VERSION
+
+
+def _set_nonblocking(fd):
+    """ Set O_NONBLOCK on a file descriptor """
+    flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+    fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+
+class GPIOEventLine():
+    """ Edge events with kernel timestamps from the GPIO character device """
+    pin = None
+    gpio = None
+    fd = None
+    bouncetime = None
+    last_time = None
+
+    def __init__(self, pin, bouncetime=0, gpio=None):
+        """ Request edge events for the pin (raises OSError / ValueError) """
+        self.pin = pin
+        self.gpio = gpio if gpio is not None else pin_to_gpio(pin)
+        self.bouncetime = bouncetime / 1000.0
+
+        chip_fd = os.open(GPIO_CHIP_PATH.format(self.gpio // GPIOS_PER_CHIP), os.O_RDONLY)
+
+        try:
+            # The line cannot be requested while it is exported in sysfs
+            try:
+                with open(GPIO_UNEXPORT_PATH, "w") as f:
+                    f.write(str(self.gpio))
+            except OSError:
+                pass
+
+            request = bytearray(struct.pack(GPIOEVENT_REQUEST_FORMAT,
+                                            self.gpio % GPIOS_PER_CHIP,
+                                            GPIOHANDLE_REQUEST_INPUT,
+                                            GPIOEVENT_REQUEST_BOTH_EDGES,
+                                            CONSUMER_LABEL, 0))
+            fcntl.ioctl(chip_fd, GPIO_GET_LINEEVENT_IOCTL, request, True)
+            self.fd = struct.unpack(GPIOEVENT_REQUEST_FORMAT, request)[4]
+        finally:
+            os.close(chip_fd)
+
+        _set_nonblocking(self.fd)
+
+    def fileno(self):
+        """ File descriptor that is readable when edges are waiting """
+        return self.fd
+
+    def get_value(self):
+        """ Return the current value of the input """
+        data = bytearray(GPIOHANDLE_DATA_SIZE)
+        fcntl.ioctl(self.fd, GPIOHANDLE_GET_LINE_VALUES_IOCTL, data, True)
+        return HIGH if data[0] else LOW
+
+    def read_events(self):
+        """ Return the waiting edges as a list of (timestamp, value) """
+        events = []
+        
+        # Offset from the kernel timestamps to the monotonic clock
+        if KERNEL_MONOTONIC_EVENTS:
+            offset = 0.0
+        else:
+            offset = time.monotonic() - time.time()
+
+        while True:
+            try:
+                data = os.read(self.fd, GPIOEVENT_DATA_SIZE * 16)
+            except BlockingIOError:
+                break
+
+            if not data:
+                break
+
+            for timestamp_ns, event_id in struct.iter_unpack(GPIOEVENT_DATA_FORMAT, data):
+                timestamp = timestamp_ns / 1e9 + offset
+
+                # Drop edges within the debounce time of the last edge
+                if (self.last_time is not None) and (timestamp - self.last_time < self.bouncetime):
+                    continue
+                self.last_time = timestamp
+
+                if event_id == GPIOEVENT_EVENT_RISING_EDGE:
+                    events.append((timestamp, HIGH))
+                else:
+                    events.append((timestamp, LOW))
+
+        return events
+
+    def close(self):
+        """ Release the line """
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class GPIOEventCallback():
+    """ Edge events from GPIO.add_event_detect() timestamped in the callback """
+    pin = None
+    events = None
+    read_fd = None
+    write_fd = None
+
+    def __init__(self, pin, bouncetime=0):
+        """ Start edge detection on the pin (must already be set up) """
+        self.pin = pin
+        self.events = collections.deque()
+
+        # The callback writes a byte to the pipe to wake up any waiter
+        self.read_fd, self.write_fd = os.pipe()
+        _set_nonblocking(self.read_fd)
+        _set_nonblocking(self.write_fd)
+
+        GPIO.add_event_detect(pin, GPIO.BOTH, callback=self._callback, bouncetime=bouncetime)
+
+    def _callback(self, channel):
+        """ Called from the GPIO event thread on every edge """
+        timestamp = time.monotonic()
+        self.events.append((timestamp, GPIO.input(channel)))
+
+        try:
+            os.write(self.write_fd, b"\0")
+        except BlockingIOError:
+            pass   # Pipe full; the waiter is already awake
+
+    def fileno(self):
+        """ File descriptor that is readable when edges are waiting """
+        return self.read_fd
+
+    def get_value(self):
+        """ Return the current value of the input """
+        return GPIO.input(self.pin)
+
+    def read_events(self):
+        """ Return the waiting edges as a list of (timestamp, value) """
+        try:
+            while os.read(self.read_fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+        events = []
+        while self.events:
+            events.append(self.events.popleft())
+
+        return events
+
+    def close(self):
+        """ Stop edge detection """
+        if self.read_fd is not None:
+            GPIO.remove_event_detect(self.pin)
+            os.close(self.read_fd)
+            os.close(self.write_fd)
+            self.read_fd = None
+            self.write_fd = None
+
+
+def open_edge_source(pin, bouncetime=0, gpio=None, pull_up_down=GPIO.PUD_OFF):
+    """ Return a GPIOEventLine if possible, otherwise a GPIOEventCallback.
+
+        The pin must already be set up as an input with GPIO.setup().
+    """
+    try:
+        return GPIOEventLine(pin, bouncetime, gpio)
+    except (OSError, ValueError):
+        pass
+
+    # The sysfs export may have been released; set the pin up again
+    GPIO.setup(pin, GPIO.IN, pull_up_down=pull_up_down)
+    return GPIOEventCallback(pin, bouncetime)
+
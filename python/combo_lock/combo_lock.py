@@ -59,12 +59,17 @@ Requirements:
 Uses:
   - HT16K33 display library developed in class
     - Library updated to add "set_digit_raw()", "set_colon()"
+  - Button bank / gesture classifier
+    - A press released before reset_time is a short press; holding the 
+      button for reset_time is a long press (decided while it is held)
 
 """
 import time
+import queue
 
 import ht16k33       as HT16K33
-import button        as BUTTON
+import button_bank   as BUTTON_BANK
+import gestures      as GESTURES
 import potentiometer as POT
 import servo         as SERVO
 import led           as LED
@@ -77,6 +82,10 @@ SERVO_LOCK         = 100     # Fully anti-clockwise
 SERVO_UNLOCK       = 0       # Fully clockwise
 
 POT_DIVIDER        = 8       # Divider used to help reduce potentiometer granularity
+POT_DEADBAND       = 0       # Divided value changes ignored by the display
+POT_HYSTERESIS     = 4       # Raw counts past a divider boundary before the display changes
+
+POLL_TIME          = 0.1     # Time (s) between calls of the function passed to wait_for_gesture()
 
 # ------------------------------------------------------------------------
 # Global variables
@@ -92,6 +101,8 @@ class CombinationLock():
     """ CombinationLock """ # state variables
     reset_time     = None
     button         = None
+    bank           = None
+    classifier     = None
     red_led        = None
     green_led      = None
     potentiometer  = None
@@ -99,6 +110,7 @@ class CombinationLock():
     display        = None
     music          = None
     debug          = None # false by default, set to true to see print statements
+    analog_value   = None # Value last shown by show_analog_value()
     
     def __init__(self, reset_time=2.0, button="P2_2", 
                        red_led="P2_6", green_led="P2_4",
@@ -108,10 +120,13 @@ class CombinationLock():
         """ Initialize variables and set up display """ 
 
         self.reset_time     = reset_time
-        self.button         = BUTTON.Button(button)
+        self.button         = button
+        self.bank           = BUTTON_BANK.ButtonBank([button])
+        self.classifier     = GESTURES.GestureClassifier(long_time=reset_time, double_time=None, chord_time=None)
         self.red_led        = LED.LED(red_led)
         self.green_led      = LED.LED(green_led)
         self.potentiometer  = POT.Potentiometer(potentiometer)
+        self.potentiometer.set_change_filter(POT_DIVIDER, POT_DEADBAND, POT_HYSTERESIS)
         self.servo          = SERVO.Servo(servo, default_position=SERVO_LOCK)
         self.display        = HT16K33.HT16K33(i2c_bus, i2c_address)
         self.music          = MUSIC.BuzzerMusic(buzzer)
@@ -128,12 +143,42 @@ class CombinationLock():
         # Initialize Display
         self.set_display_dash()
 
-        # Button / LEDs / Potentiometer / Servo 
+        # Start watching the button
+        self.bank.start()
+
+        # LEDs / Potentiometer / Servo 
         #   - All initialized by libraries when instanitated
 
     # End def
 
 
+    def wait_for_gesture(self, function=None):
+        """Wait for a button gesture:
+               - Call function every POLL_TIME while the button is not pressed
+               - Return the gesture (GESTURES.SHORT or GESTURES.LONG)
+        """
+        while True:
+            timeout = self.classifier.timeout()
+            
+            if function is not None:
+                if not self.bank.is_pressed(self.button):
+                    function()
+                
+                if (timeout is None) or (timeout > POLL_TIME):
+                    timeout = POLL_TIME
+            
+            # Wait for the next button edge or gesture deadline
+            try:
+                gestures = self.classifier.feed(*self.bank.get(timeout=timeout))
+            except queue.Empty:
+                gestures = self.classifier.expire()
+            
+            if gestures:
+                return gestures[0][0]
+
+    # End def
+
+
     def lock(self):
         """Lock the lock:
                - Turn on red LED; Turn off green LED
@@ -177,22 +222,23 @@ class CombinationLock():
 
     def show_analog_value(self):
         """Show the analog value on the screen:
-               - Read raw analog value
-               - Divide by 4 (remove two LSBs)
-               - Display value
+               - Read raw analog value divided by POT_DIVIDER
+               - Display value (only when it changed)
                - Return value
         """
-        if self.debug:
-            print("show_analog_value()")
-            
-        # Read value from Potentiometer
-        value = self.potentiometer.get_value()
-        # Divide value by POT_DIVIDER
-        value = value // POT_DIVIDER
-        # Update display (must be an integer)
-        self.display.update(value)
+        # Read value from Potentiometer (None if unchanged)
+        value = self.potentiometer.get_change()
+        
+        if value is not None:
+            if self.debug:
+                print("show_analog_value() = {0}".format(value))
+                
+            # Update display (must be an integer)
+            self.display.update(value)
+            self.analog_value = value
+        
         # Return value
-        return 0
+        return self.analog_value
 
     # End def
 
@@ -213,19 +259,15 @@ class CombinationLock():
             self.set_display_input(i+1)
             
             # Wait for button press (do nothing)
-            self.button.wait_for_press()
-            # Set button unpressed callback function
-            self.button.set_unpressed_callback(self.show_analog_value)
+            self.wait_for_gesture()
+            # Show the value on the first call even if it did not change
+            self.potentiometer.reset_change()
             
             # Wait for button press (show analog value)
-            self.button.wait_for_press()
-            # Get callback function value from button
-            value = self.button.get_unpressed_callback_value()
+            self.wait_for_gesture(self.show_analog_value)
             
-            # Remove button unpressed callback function
-            self.button.set_unpressed_callback(None)
             # Record Analog value
-            combination[i] = value
+            combination[i] = self.analog_value
 
         if self.debug:
             print(combination)
@@ -256,7 +298,7 @@ class CombinationLock():
                 self.set_display_prog()
                 
                 # Wait for button press (do nothing)
-                self.button.wait_for_press()
+                self.wait_for_gesture()
                 
                 # Get combination
                 combination = self.input_combination()
@@ -269,7 +311,7 @@ class CombinationLock():
             self.set_display_try()
 
             # Wait for button press (do nothing)
-            self.button.wait_for_press()
+            self.wait_for_gesture()
             # Get combination
             combo_attempt = self.input_combination()
             # Compare attempt against combination
@@ -287,12 +329,10 @@ class CombinationLock():
                 # Unlock the lock
                 self.unlock()
                 # Wait for button press
-                self.button.wait_for_press()
-                # Get press duration
-                duration = self.button.get_last_press_duration()
-                # If greater than reset_time, program lock, else lock the lock
-                if (duration > self.reset_time):
-                    progam = True
+                gesture = self.wait_for_gesture()
+                # If held for reset_time, program lock, else lock the lock
+                if (gesture == GESTURES.LONG):
+                    program = True
                 else:
                     self.lock()
             time.sleep(1)
@@ -335,7 +375,7 @@ class CombinationLock():
         self.display.text("done")
 
         # Clean up hardware
-        self.button.cleanup()
+        self.bank.cleanup()
         self.red_led.cleanup()
         self.green_led.cleanup()
         self.potentiometer.cleanup()
@@ -45,6 +45,9 @@ Software API:
     
     set_colon(enable)
       - Turns on / off the colon on the display.  Enable must be True/False.
+
+    set_digits_raw(codes)
+      - Set all 4 digits of the display using raw data values
     
     update(value)
       - Update the value on the display.  Value must be between 0 and 9999.
@@ -53,6 +56,76 @@ Software API:
       - Update the value on the display with text.
         The following characters are supported:
             "abcdefghijlnopqrstuyABCDEFGHIJLNOPQRSTUY? -"
+
+    flush()
+      - Write any digits / colon that changed since the last flush
+
+    write_frame(frame=None)
+      - Write all 16 bytes of display RAM in one I2C transaction.  Frame 
+        defaults to the buffer.
+
+    cleanup()
+      - Release the I2C bus
+
+  Display RAM shadow:
+    The display keeps a copy of its 16 byte display RAM in "buffer".  All of 
+    the functions above modify the buffer and then flush() it, which only 
+    writes the addresses whose value differs from what the display already
+    shows.  Writing the same value twice causes no bus traffic.  When more 
+    than one address changed, the HT16K33 RAM pointer auto-increment is used
+    to write the changed addresses as a single block.
+
+  compile_value(value) / compile_text(value)
+    - Compile a value (0 to 9999) or text (1 to 4 characters) into the 4
+      digit codes (bytes) used by update() / text().  Results are kept in
+      an LRU cache so repeated values are only a lookup.  Raise ValueError
+      for values / characters that cannot be displayed.
+
+  DisplayWriter(display)
+    - Non-blocking front-end for a HT16K33 display.  Provides the same
+      clear(), blank(), set_colon(), update() and text() functions, but
+      only validates the value and queues the new frame.  A background
+      thread flushes the newest frame to the display; frames that were
+      not flushed yet are dropped in favor of the newest one.
+
+    cleanup()
+      - Flush the last frame, stop the thread and clean up the display
+
+  DisplayArray(bus, addresses=(0x70, 0x71))
+    - Several 4 digit displays on one bus used as one wide display.  The
+      first address is the left most display.  All displays share one bus
+      object.  Provides clear(), blank(), set_colon(), update(), text(),
+      set_digits_raw(), flush() and cleanup().  update() / text() accept 
+      up to 4 digits / characters per display and only the displays that 
+      changed are written.
+
+  Marquee(display, rate=4.0, substitute=True)
+    - Scroll text that is too long for a HT16K33 / DisplayArray.  Every 
+      scroll step is compiled once into a frame table that a background 
+      thread plays at "rate" steps per second.  Each step is written with 
+      the diffed flush of the display.  The display should not be written
+      by other code while a scroll is running.
+    - Text may use the characters supported by text().  With substitute=True
+      the letters that cannot be shown on 7 segments are replaced by their
+      nearest glyph ("kmvwxz" -> "hnuuh2", "KMVWXZ" -> "HNUUH2") and any 
+      other character is shown as a blank digit.  With substitute=False, 
+      these characters raise a ValueError.
+
+    start(value, rate=None, repeat=True)
+      - Start scrolling value; replaces a scroll that is already running
+    
+    cancel(wait=False)
+      - Stop scrolling (wait=True waits for the scroll thread to exit)
+    
+    is_running()
+      - Return True while a scroll is running
+
+  I2C transport:
+    By default the display opens /dev/i2c-<bus> once and writes raw bytes to
+    the open file descriptor (I2CBus).  If the device file cannot be opened, 
+    the display falls back to forking /usr/sbin/i2cset for every write 
+    (I2CSetBus).  Any object with a write(address, data) method can also be
+    passed as the bus, e.g. HT16K33(I2CSetBus(1), 0x70).
   
 --------------------------------------------------------------------------
 Background Information: 
@@ -74,6 +147,9 @@ Background Information:
         
 """
 import os
+import fcntl
+import threading
+import functools
 
 
 # ------------------------------------------------------------------------
@@ -128,11 +204,25 @@ LETTERS                     = { "a" : 0x77, "A" : 0x77,    # "A"
                                 "?" : 0x53                 # "?"
                               }                               
 
+# Nearest supported letter for the letters that cannot be implemented
+SUBSTITUTE_LETTERS          = { "k" : "h", "K" : "H",
+                                "m" : "n", "M" : "n",
+                                "v" : "u", "V" : "U",
+                                "w" : "u", "W" : "U",
+                                "x" : "h", "X" : "H",
+                                "z" : "2", "Z" : "2"
+                              }
+
 CLEAR_DIGIT                 = 0x7F
 POINT_VALUE                 = 0x80
 
 DIGIT_ADDR                  = [0x00, 0x02, 0x06, 0x08]
 COLON_ADDR                  = 0x04
+COLON_VALUE                 = 0x02
+
+# Addresses in display RAM used by the 4 digit display (in address order)
+DISPLAY_ADDR                = [0x00, 0x02, 0x04, 0x06, 0x08]
+DISPLAY_RAM_SIZE            = 16
 
 HT16K33_BLINK_CMD           = 0x80
 HT16K33_BLINK_DISPLAYON     = 0x01
@@ -150,17 +240,161 @@ HT16K33_BRIGHTNESS_DARKEST  = 0x00
 
 # Maximum decimal value that can be displayed on 4 digit Hex Display
 HT16K33_MAX_VALUE           = 9999
+HT16K33_DIGITS              = 4
+
+# Addresses that can be selected with the backpack address jumpers
+HT16K33_ADDRESSES           = range(0x70, 0x78)
+
+# Number of compiled values / text kept by the glyph cache (every value
+# that can be displayed fits in the value cache)
+VALUE_CACHE_SIZE            = HT16K33_MAX_VALUE + 1
+TEXT_CACHE_SIZE             = 256
+
+# I2C transport (see <linux/i2c-dev.h>)
+I2C_DEV_PATH                = "/dev/i2c-{0}"
+I2C_SLAVE                   = 0x0703
+I2CSET_CMD                  = "/usr/sbin/i2cset"
 
 
 # ------------------------------------------------------------------------
 # Functions / Classes
 # ------------------------------------------------------------------------
+class I2CBus():
+    """ I2C bus accessed through a persistent /dev/i2c-<bus> file descriptor """
+    bus     = None
+    fd      = None
+    address = None
+    
+    def __init__(self, bus):
+        """ Open the bus device file (raises OSError if it is not available) """
+        self.bus = bus
+        self.fd  = os.open(I2C_DEV_PATH.format(bus), os.O_RDWR)
+    
+    # End def
+    
+    
+    def write(self, address, data):
+        """Write the bytes in data to the device at address in one transaction.
+        
+        The slave address is only re-bound (I2C_SLAVE ioctl) when it changes, 
+        so several devices can share one bus object.
+        """
+        if address != self.address:
+            fcntl.ioctl(self.fd, I2C_SLAVE, address)
+            self.address = address
+        
+        os.write(self.fd, bytes(data))
+    
+    # End def
+    
+    
+    def close(self):
+        """Close the bus device file"""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd      = None
+            self.address = None
+    
+    # End def
+
+# End class
+
+
+class I2CSetBus():
+    """ Fallback I2C bus that forks /usr/sbin/i2cset for every write """
+    bus     = None
+    
+    def __init__(self, bus):
+        """ Initialize class variables """
+        self.bus = bus
+    
+    # End def
+    
+    
+    def write(self, address, data):
+        """Write the bytes in data to the device at address using i2cset"""
+        args = " ".join([str(byte) for byte in data])
+        
+        # More than one value after the data address is an I2C block write
+        if len(data) > 2:
+            args = args + " i"
+        
+        # i2cset -y 1 0x70 0x00 0x3f
+        os.system("{0} -y {1} {2} {3}".format(I2CSET_CMD, self.bus, address, args))
+    
+    # End def
+    
+    
+    def close(self):
+        """Nothing to release for i2cset"""
+        pass
+    
+    # End def
+
+# End class
+
+
+def open_bus(bus):
+    """Return a bus object for the given bus.
+    
+    :param bus: Bus number (e.g. 1) or an object with a write(address, data) 
+                method, which is returned unchanged.
+    
+    A bus number is opened as an I2CBus; if /dev/i2c-<bus> cannot be opened 
+    the i2cset fallback is used instead.
+    """
+    if hasattr(bus, "write"):
+        return bus
+    
+    try:
+        return I2CBus(bus)
+    except OSError:
+        return I2CSetBus(bus)
+
+# End def
+
+
+@functools.lru_cache(maxsize=VALUE_CACHE_SIZE)
+def compile_value(value):
+    """Return the 4 digit codes (bytes) used to display value (0 to 9999)"""
+    if (value < 0) or (value > HT16K33_MAX_VALUE):
+        raise ValueError("Value must be between 0 and 9999.")
+    
+    return bytes([HEX_DIGITS[int(digit)] for digit in "{0:04d}".format(value)])
+
+# End def
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def compile_text(value):
+    """Return the 4 digit codes (bytes) used to display value (1 to 4 characters)
+    
+    All characters are checked before anything is returned, so an 
+    unsupported character never causes a partial update of the display.
+    """
+    if ((len(value) < 1) or (len(value) > 4)):
+        raise ValueError("Must have between 1 and 4 characters")        
+    
+    for char in value:
+        if char not in LETTERS:
+            raise ValueError("Character {0} not supported".format(char))
+    
+    # Translate the characters into the values needed for hex display;
+    # unused digits are blank
+    return bytes([LETTERS[char] for char in value.ljust(4)])
+
+# End def
+
+
 class HT16K33():
     """ Class to manage a HT16K33 I2C display """
     # Class variables
-    bus     = None
-    address = None
-    command = None
+    bus        = None
+    address    = None
+    i2c        = None
+    buffer     = None
+    device_ram = None
+    width      = HT16K33_DIGITS
     
     def __init__(self, bus, address=0x70, blink=HT16K33_BLINK_OFF, brightness=HT16K33_BRIGHTNESS_HIGHEST):
         """ Initialize class variables; Set up display; Set display to blank """
@@ -168,7 +402,12 @@ class HT16K33():
         # Initialize class variables
         self.bus = bus
         self.address = address
-        self.command = "/usr/sbin/i2cset -y {0} {1}".format(bus, address)
+        self.i2c = open_bus(bus)
+        
+        # Shadow of the display RAM; contents of the device are unknown
+        # until the first flush
+        self.buffer = bytearray(DISPLAY_RAM_SIZE)
+        self.device_ram = None
 
         # Set up display        
         self._setup(blink, brightness)
@@ -178,19 +417,23 @@ class HT16K33():
     
     def _setup(self, blink, brightness):
         """Initialize the display itself"""
-        if self.command:
-            # i2cset -y 1 0x70 0x21
-            os.system("{0} {1}".format(self.command, (HT16K33_SYSTEM_SETUP | HT16K33_OSCILLATOR)))
-            # i2cset -y 1 0x70 0x81
-            os.system("{0} {1}".format(self.command, (HT16K33_BLINK_CMD | blink | HT16K33_BLINK_DISPLAYON)))
-            # i2cset -y 1 0x70 0xEF
-            os.system("{0} {1}".format(self.command, (HT16K33_BRIGHTNESS_CMD | brightness)))
-        else:
-            print("HT16K33 setup()")
+        # i2cset -y 1 0x70 0x21
+        self._write(HT16K33_SYSTEM_SETUP | HT16K33_OSCILLATOR)
+        # i2cset -y 1 0x70 0x81
+        self._write(HT16K33_BLINK_CMD | blink | HT16K33_BLINK_DISPLAYON)
+        # i2cset -y 1 0x70 0xEF
+        self._write(HT16K33_BRIGHTNESS_CMD | brightness)
 
     # End def    
 
 
+    def _write(self, *data):
+        """Write the given bytes to the display in one bus transaction"""
+        self.i2c.write(self.address, data)
+
+    # End def
+
+
     def encode(self, data, double_point=False):
         """Encode data to TM1637 format.
         
@@ -216,61 +459,109 @@ class HT16K33():
     # End def
 
 
+    def flush(self):
+        """Write the digits / colon that changed since the last flush.
+        
+        Only addresses whose value in the buffer differs from the value 
+        last written to the display are sent.  If the display contents are 
+        unknown (i.e. first flush), all addresses are written.
+        """
+        if self.device_ram is None:
+            self.write_frame()
+            return
+        
+        changed = [addr for addr in DISPLAY_ADDR 
+                        if self.buffer[addr] != self.device_ram[addr]]
+        
+        if changed:
+            # One block write from the first to the last changed address 
+            # is cheaper than several single writes
+            first = changed[0]
+            last  = changed[-1] + 1
+            self._write(first, *self.buffer[first:last])
+            self.device_ram[first:last] = self.buffer[first:last]
+
+    # End def
+
+
+    def write_frame(self, frame=None):
+        """Write a full 16 byte frame of display RAM in one transaction.
+        
+        :param frame: 16 bytes of display RAM (default is the buffer).  
+                      A frame that is provided is also copied to the buffer.
+        
+        The HT16K33 auto-increments its RAM pointer, so the frame is sent as
+        a single block starting at address 0x00.
+        """
+        if frame is not None:
+            if len(frame) != DISPLAY_RAM_SIZE:
+                raise ValueError("Frame must have {0} bytes".format(DISPLAY_RAM_SIZE))
+            self.buffer[:] = frame
+        
+        self._write(0x00, *self.buffer)
+        self.device_ram = bytearray(self.buffer)
+
+    # End def
+
+
+    def _set_digits(self, codes):
+        """Set the 4 digits of the buffer to the raw values in codes"""
+        for digit_number, code in enumerate(codes):
+            self.buffer[DIGIT_ADDR[digit_number]] = code
+
+    # End def
+
+
+    def set_digits_raw(self, codes):
+        """Update all 4 digits of the display using raw data values"""
+        self._set_digits(codes)
+        self.flush()
+
+    # End def
+
+
     def set_digit(self, digit_number, data, double_point=False):
         """Update the given digit of the display."""
-        if self.command:
-            os.system("{0} {1} {2}".format(self.command, DIGIT_ADDR[digit_number], self.encode(data, double_point)))    
-        else:
-            print("HT16K33 set_digit() = {0}".format(self.encode(data, double_point)))
+        self.buffer[DIGIT_ADDR[digit_number]] = self.encode(data, double_point)
+        self.flush()
 
     # End def
 
 
     def set_digit_raw(self, digit_number, data, double_point=False):
         """Update the given digit of the display using raw data value"""
-        if self.command:
-            os.system("{0} {1} {2}".format(self.command, DIGIT_ADDR[digit_number], data))
-        else:
-            print("HT16K33 set_digit_raw() = 0x{0:x}".format(data))
+        self.buffer[DIGIT_ADDR[digit_number]] = data
+        self.flush()
 
     # End def
 
 
     def set_colon(self, enable):
         """Set the colon on the display."""
-        if self.command:
-            if enable:
-                os.system("{0} {1} {2}".format(self.command, COLON_ADDR, 0x02))
-            else:
-                os.system("{0} {1} {2}".format(self.command, COLON_ADDR, 0x00))
+        if enable:
+            self.buffer[COLON_ADDR] = COLON_VALUE
         else:
-            print("HT16K33 set_colon() = {0}".format(enable))
+            self.buffer[COLON_ADDR] = 0x00
+        
+        self.flush()
 
     # End def        
 
 
     def blank(self):
         """Clear the display to read nothing"""
-        if self.command:
-            self.set_colon(False)
-            # each digit gets set to 0
-            self.set_digit_raw(3, 0x00)
-            self.set_digit_raw(2, 0x00)
-            self.set_digit_raw(1, 0x00)
-            self.set_digit_raw(0, 0x00)
-        else:
-            print("HT16K33 blank()")
+        self.buffer[COLON_ADDR] = 0x00
+        # each digit gets set to 0
+        self._set_digits([0x00, 0x00, 0x00, 0x00])
+        self.flush()
 
     # End def
 
 
     def clear(self):
         """Clear the display to read '0000'"""
-        if self.command:
-            self.set_colon(False)
-            self.update(0)
-        else:
-            print("HT16K33 clear()")        
+        self.buffer[COLON_ADDR] = 0x00
+        self.update(0)
 
     # End def
 
@@ -278,20 +569,15 @@ class HT16K33():
     def update(self, value):
         """Update the value on the display.  
         
-        This function will clear the display and then set the appropriate digits
+        This function will set the appropriate digits and flush the changes
         
         :param value: Value must be between 0 and 9999.
         
         Will throw a ValueError if number is not between 0 and 9999.
         """
         
-        if (value < 0) or (value > HT16K33_MAX_VALUE):
-            raise ValueError("Value must be between 0 and 9999.")
-        
-        self.set_digit(3, (value % 10))
-        self.set_digit(2, ((value//10) % 10))
-        self.set_digit(1, ((value//100) % 10))
-        self.set_digit(0, ((value//1000) % 10))
+        self._set_digits(compile_value(value))
+        self.flush()
         
         # Modify code to implement this function
         print("Set value = {0}".format(value)) # Remove when updating code
@@ -306,22 +592,424 @@ class HT16K33():
         Will throw a ValueError if there are not the appropriate number of 
         characters or if characters are used that are not supported.
         """
-        if ((len(value) < 1) or (len(value) > 4)):
-            raise ValueError("Must have between 1 and 4 characters")        
-        
-        # Clear the display
-        self.blank()
+        codes = compile_text(value)
+
+        # Set the display to the correct characters (raw bc not just numbers)
+        self.buffer[COLON_ADDR] = 0x00
+        self._set_digits(codes)
+        self.flush()
+
+    # End def
+
 
-        # Set the display to the correct characters        
-        for i, char in enumerate(value):
+    def cleanup(self):
+        """Release the I2C bus (only if the display opened it)"""
+        if not hasattr(self.bus, "write"):
+            self.i2c.close()
+
+    # End def
+
+# End class
+
+
+class DisplayWriter():
+    """ Non-blocking front-end that flushes a HT16K33 from a background thread """
+    display   = None
+    frame     = None
+    pending   = None
+    running   = None
+    condition = None
+    thread    = None
+    
+    def __init__(self, display):
+        """ Initialize class variables; Start the writer thread """
+        self.display   = display
+        self.frame     = bytearray(display.buffer)   # Latest frame requested
+        self.pending   = None                        # Single slot queue
+        self.running   = True
+        self.condition = threading.Condition()
+        
+        self.thread    = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    # End def
+    
+    
+    def _run(self):
+        """Flush the newest pending frame to the display until stopped"""
+        while True:
+            with self.condition:
+                while (self.pending is None) and self.running:
+                    self.condition.wait()
+                
+                # Stopped and nothing left to write
+                if self.pending is None:
+                    return
+                
+                frame        = self.pending
+                self.pending = None
+            
             try:
-                # Translate the character into the value needed for hex display
-                code = LETTERS[char]
+                self.display.buffer[:] = frame
+                self.display.flush()
+            except Exception as e:
+                print("DisplayWriter: flush failed ({0})".format(e))
+    
+    # End def
+    
+    
+    def _submit(self):
+        """Put the current frame in the slot, replacing any stale frame"""
+        with self.condition:
+            self.pending = bytes(self.frame)
+            self.condition.notify()
+    
+    # End def
+    
+    
+    def _set_digits(self, codes):
+        """Set the 4 digits of the frame to the raw values in codes"""
+        for digit_number, code in enumerate(codes):
+            self.frame[DIGIT_ADDR[digit_number]] = code
+    
+    # End def
+    
+    
+    def set_digit_raw(self, digit_number, data):
+        """Update the given digit of the display using raw data value"""
+        self.frame[DIGIT_ADDR[digit_number]] = data
+        self._submit()
+    
+    # End def
+    
+    
+    def set_colon(self, enable):
+        """Set the colon on the display."""
+        if enable:
+            self.frame[COLON_ADDR] = COLON_VALUE
+        else:
+            self.frame[COLON_ADDR] = 0x00
+        
+        self._submit()
+    
+    # End def
+    
+    
+    def blank(self):
+        """Clear the display to read nothing"""
+        self.frame[COLON_ADDR] = 0x00
+        self._set_digits([0x00, 0x00, 0x00, 0x00])
+        self._submit()
+    
+    # End def
+    
+    
+    def clear(self):
+        """Clear the display to read '0000'"""
+        self.frame[COLON_ADDR] = 0x00
+        self.update(0)
+    
+    # End def
+    
+    
+    def update(self, value):
+        """Update the value on the display (0 to 9999) without blocking"""
+        self._set_digits(compile_value(value))
+        self._submit()
+    
+    # End def
+    
+    
+    def text(self, value):
+        """Update the value on the display with text without blocking"""
+        codes = compile_text(value)
+        
+        self.frame[COLON_ADDR] = 0x00
+        self._set_digits(codes)
+        self._submit()
+    
+    # End def
+    
+    
+    def cleanup(self):
+        """Flush the last frame, stop the writer thread, clean up the display"""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        
+        self.thread.join()
+        self.display.cleanup()
+    
+    # End def
+
+# End class
+
+
+class DisplayArray():
+    """ Several HT16K33 displays on one bus used as one wide display """
+    bus       = None
+    i2c       = None
+    displays  = None
+    width     = None
+    
+    def __init__(self, bus, addresses=(0x70, 0x71), blink=HT16K33_BLINK_OFF, brightness=HT16K33_BRIGHTNESS_HIGHEST):
+        """ Initialize class variables; Set up displays on a shared bus """
+        for address in addresses:
+            if address not in HT16K33_ADDRESSES:
+                raise ValueError("Address 0x{0:x} is not a HT16K33 address".format(address))
+        
+        self.bus      = bus
+        self.i2c      = open_bus(bus)
+        self.displays = [HT16K33(self.i2c, address, blink, brightness) for address in addresses]
+        self.width    = HT16K33_DIGITS * len(self.displays)
+    
+    # End def
+    
+    
+    def _chunks(self, value):
+        """Split value (exactly width characters) into one part per display"""
+        return [value[i:i + HT16K33_DIGITS] for i in range(0, self.width, HT16K33_DIGITS)]
+    
+    # End def
+    
+    
+    def flush(self):
+        """Write the changes of every display in one pass over the bus"""
+        for display in self.displays:
+            display.flush()
+    
+    # End def
+    
+    
+    def set_digits_raw(self, codes):
+        """Update all digits (4 per display) using raw data values"""
+        for display, i in zip(self.displays, range(0, self.width, HT16K33_DIGITS)):
+            display._set_digits(codes[i:i + HT16K33_DIGITS])
+        
+        self.flush()
+    
+    # End def
+    
+    
+    def set_colon(self, enable):
+        """Set the colon on every display."""
+        for display in self.displays:
+            if enable:
+                display.buffer[COLON_ADDR] = COLON_VALUE
+            else:
+                display.buffer[COLON_ADDR] = 0x00
+        
+        self.flush()
+    
+    # End def
+    
+    
+    def blank(self):
+        """Clear the displays to read nothing"""
+        for display in self.displays:
+            display.buffer[COLON_ADDR] = 0x00
+            display._set_digits(bytes(HT16K33_DIGITS))
+        
+        self.flush()
+    
+    # End def
+    
+    
+    def clear(self):
+        """Clear the displays to read all '0'"""
+        for display in self.displays:
+            display.buffer[COLON_ADDR] = 0x00
+        
+        self.update(0)
+    
+    # End def
+    
+    
+    def update(self, value):
+        """Update the value on the displays.
+        
+        :param value: Value must be between 0 and 10^width - 1
+        
+        Will throw a ValueError if the value cannot be displayed.
+        """
+        if (value < 0) or (value >= 10 ** self.width):
+            raise ValueError("Value must be between 0 and {0}.".format(10 ** self.width - 1))
+        
+        digits = "{0:0{1}d}".format(value, self.width)
+        codes  = [compile_value(int(chunk)) for chunk in self._chunks(digits)]
+        
+        for display, display_codes in zip(self.displays, codes):
+            display._set_digits(display_codes)
+        
+        self.flush()
+    
+    # End def
+    
+    
+    def text(self, value):
+        """Update the value on the displays with text.
+        
+        :param value:  Value must have between 1 and width characters
+        
+        Will throw a ValueError if there are not the appropriate number of 
+        characters or if characters are used that are not supported.  
+        Nothing is written unless every character is supported.
+        """
+        if ((len(value) < 1) or (len(value) > self.width)):
+            raise ValueError("Must have between 1 and {0} characters".format(self.width))
+        
+        codes = [compile_text(chunk) for chunk in self._chunks(value.ljust(self.width))]
+        
+        for display, display_codes in zip(self.displays, codes):
+            display.buffer[COLON_ADDR] = 0x00
+            display._set_digits(display_codes)
+        
+        self.flush()
+    
+    # End def
+    
+    
+    def cleanup(self):
+        """Release the I2C bus (only if the display array opened it)"""
+        if not hasattr(self.bus, "write"):
+            self.i2c.close()
+    
+    # End def
+
+# End class
+
+
+class Marquee():
+    """ Scroll text across a HT16K33 / DisplayArray from a background thread """
+    display   = None
+    rate      = None
+    repeat    = None
+    frames     = None
+    index      = None
+    lock       = None
+    stop       = None
+    thread     = None
+    substitute = None
+    
+    def __init__(self, display, rate=4.0, substitute=True):
+        """ Initialize class variables """
+        if rate <= 0:
+            raise ValueError("Scroll rate must be positive")
+        
+        self.display    = display
+        self.rate       = rate
+        self.substitute = substitute
+        self.repeat     = True
+        self.frames  = []
+        self.index   = 0
+        self.lock    = threading.Lock()
+    
+    # End def
+    
+    
+    def _compile_frames(self, value):
+        """Return the table of frames (bytes) to scroll value across the display.
+        
+        The text enters from the right of a blank display and scrolls until
+        the display is blank again.  Characters that cannot be displayed are
+        substituted first if substitute is set.
+        """
+        width  = self.display.width
+        
+        if self.substitute:
+            value = "".join([char if char in LETTERS else SUBSTITUTE_LETTERS.get(char, " ") 
+                                 for char in value])
+        
+        # Compile the text 4 characters at a time (validates every character)
+        glyphs = b"".join([compile_text(value[i:i + HT16K33_DIGITS]) 
+                               for i in range(0, len(value), HT16K33_DIGITS)])
+        glyphs = bytes(width) + glyphs[:len(value)] + bytes(width)
+        
+        return [glyphs[i:i + width] for i in range(len(value) + width + 1)]
+    
+    # End def
+    
+    
+    def _run(self, stop):
+        """Play the frame table until stopped (or done, if not repeating)"""
+        while True:
+            with self.lock:
+                if stop.is_set():
+                    return
                 
-                # Set the display digit with the character value
-                self.set_digit_raw(i, code) # raw bc not just numbers
-            except:
-                raise ValueError("Character {0} not supported".format(char))
+                if self.index >= len(self.frames):
+                    if not self.repeat:
+                        self.thread = None
+                        return
+                    self.index = 0
+                
+                frame       = self.frames[self.index]
+                self.index += 1
+                period      = 1.0 / self.rate
+            
+            self.display.set_digits_raw(frame)
+            
+            if stop.wait(period):
+                return
+    
+    # End def
+    
+    
+    def start(self, value, rate=None, repeat=True):
+        """Start scrolling value (replaces the current scroll).
+        
+        :param value:  Text to scroll (must not be empty)
+        :param rate:   Scroll steps per second (default: keep current rate)
+        :param repeat: Repeat the scroll until cancelled
+        
+        Will throw a ValueError if rate is not positive, or if characters are
+        used that are not supported and substitute is not set.
+        """
+        if len(value) < 1:
+            raise ValueError("Must have at least 1 character")
+        
+        if (rate is not None) and (rate <= 0):
+            raise ValueError("Scroll rate must be positive")
+        
+        frames = self._compile_frames(value)
+        
+        with self.lock:
+            self.frames = frames
+            self.index  = 0
+            self.repeat = repeat
+            
+            if rate is not None:
+                self.rate = rate
+            
+            if self.thread is None:
+                self.stop   = threading.Event()
+                self.thread = threading.Thread(target=self._run, args=(self.stop,), daemon=True)
+                self.thread.start()
+    
+    # End def
+    
+    
+    def cancel(self, wait=False):
+        """Stop scrolling; optionally wait for the scroll thread to exit"""
+        with self.lock:
+            thread = self.thread
+            
+            if thread is not None:
+                self.stop.set()
+                self.thread = None
+        
+        if wait and (thread is not None):
+            thread.join()
+    
+    # End def
+    
+    
+    def is_running(self):
+        """Return True while a scroll is running"""
+        with self.lock:
+            return self.thread is not None
+    
+    # End def
 
 # End class
 
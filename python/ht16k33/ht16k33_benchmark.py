@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+HT16K33 I2C Library - Benchmark
+--------------------------------------------------------------------------
+License:
+Copyright 2025 Tarik Price
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+this list of conditions and the following disclaimer in the documentation
+and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its contributors
+may be used to endorse or promote products derived from this software without
+specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+--------------------------------------------------------------------------
+
+Benchmark the HT16K33 display driver on a PocketBeagle with the display
+attached to I2C1 (run configure_pins.sh for the project first).
+
+Measures display updates per second for:
+  - i2cset transport (one process fork per bus write)
+  - /dev/i2c-1 file descriptor transport
+
+Measures the latency of a full redraw (4 digits + colon) for:
+  - per-digit path (one bus write per digit / colon address)
+  - write_frame() (one block write of the 16 byte display RAM)
+
+Measures the cost of compiling values / text into digit codes with the
+glyph cache cold (every value compiled) and warm (every value a cache hit):
+  - update() values 0 to 9999
+  - pros_finger strings "ON0" to "ON8" and "OFF"
+This part does not need the display and runs on any machine.
+
+Usage:
+  python3 ht16k33_benchmark.py [--sim] [iterations]
+
+  --sim : Use the simulated I2C bus (python/sim must be on PYTHONPATH) 
+          instead of the display.  Times are the driver CPU time plus the
+          modeled bus time.
+
+"""
+import sys
+import time
+
+import ht16k33 as HT16K33
+
+# ------------------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------------------
+
+I2C_BUS            = 1
+I2C_ADDRESS        = 0x70
+
+DEFAULT_ITERATIONS = 100
+
+# Strings shown by pros_finger
+PROS_FINGER_TEXT   = ["ON{0}".format(i) for i in range(9)] + ["OFF"]
+
+# Two frames that differ at every digit / colon address ("8888:" / "----")
+FRAMES             = [bytes([0x7f, 0, 0x7f, 0, 0x02, 0, 0x7f, 0, 0x7f, 0, 0, 0, 0, 0, 0, 0]),
+                      bytes([0x40, 0, 0x40, 0, 0x00, 0, 0x40, 0, 0x40, 0, 0, 0, 0, 0, 0, 0])]
+
+# ------------------------------------------------------------------------
+# Functions
+# ------------------------------------------------------------------------
+
+def now(display):
+    """Return the time (seconds) including the modeled time of a simulated bus"""
+    return time.perf_counter() + getattr(display.i2c, "elapsed", 0.0)
+
+# End def
+
+
+def time_updates(display, iterations):
+    """Return the number of text() updates per second for the display"""
+    start = now(display)
+
+    for i in range(iterations):
+        display.text("ON{0}".format(i % 9))
+
+    return iterations / (now(display) - start)
+
+# End def
+
+
+def time_compile(function, values, repeat):
+    """Return the average time (in us) to compile each value"""
+    start = time.perf_counter()
+
+    for i in range(repeat):
+        for value in values:
+            function(value)
+
+    return 1e6 * (time.perf_counter() - start) / (repeat * len(values))
+
+# End def
+
+
+def run_compile(name, function, values, repeat):
+    """Compare the compile cost without / with the glyph cache"""
+    # The undecorated function compiles the value on every call
+    cold = time_compile(function.__wrapped__, values, repeat)
+    
+    # Fill the cache, then measure cache hits
+    function.cache_clear()
+    time_compile(function, values, 1)
+    warm = time_compile(function, values, repeat)
+
+    print("{0:<12} {1:10.3f} us uncached {2:10.3f} us cached".format(name, cold, warm))
+
+# End def
+
+
+def write_per_digit(display, frame):
+    """Redraw the display with one bus write per digit / colon address"""
+    for addr in HT16K33.DISPLAY_ADDR:
+        display.i2c.write(display.address, [addr, frame[addr]])
+
+# End def
+
+
+def time_frames(display, iterations, burst):
+    """Return the average latency (in ms) of a full redraw of the display"""
+    start = now(display)
+
+    for i in range(iterations):
+        frame = FRAMES[i % 2]
+        
+        if burst:
+            display.write_frame(frame)
+        else:
+            write_per_digit(display, frame)
+
+    return 1000.0 * (now(display) - start) / iterations
+
+# End def
+
+
+def run_frames(bus, iterations):
+    """Compare per-digit and block redraw latency on one transport"""
+    display    = HT16K33.HT16K33(bus, I2C_ADDRESS)
+    per_digit  = time_frames(display, iterations, False)
+    burst      = time_frames(display, iterations, True)
+
+    print("per-digit    {0:10.3f} ms/frame".format(per_digit))
+    print("write_frame  {0:10.3f} ms/frame".format(burst))
+
+# End def
+
+
+def run_transport(name, bus, iterations):
+    """Benchmark one transport and print the result"""
+    display = HT16K33.HT16K33(bus, I2C_ADDRESS)
+    rate    = time_updates(display, iterations)
+
+    print("{0:<12} {1:10.1f} updates/sec".format(name, rate))
+
+    bus.close()
+    return rate
+
+# End def
+
+
+# ------------------------------------------------------------------------
+# Main script
+# ------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    iterations = DEFAULT_ITERATIONS
+    args       = sys.argv[1:]
+    simulate   = "--sim" in args
+
+    if simulate:
+        args.remove("--sim")
+
+    if len(args) > 0:
+        iterations = int(args[0])
+
+    print("HT16K33 Glyph Compile")
+    run_compile("0-9999", HT16K33.compile_value, range(HT16K33.HT16K33_MAX_VALUE + 1), 10)
+    run_compile("ON0-ON8/OFF", HT16K33.compile_text, PROS_FINGER_TEXT, 1000)
+
+    print("HT16K33 Benchmark ({0} updates)".format(iterations))
+
+    if simulate:
+        import sim_i2c
+        
+        fork_bus = sim_i2c.SimulatedI2CBus(write_overhead=sim_i2c.I2CSET_FORK_TIME)
+        fd_bus   = sim_i2c.SimulatedI2CBus()
+        bus      = sim_i2c.SimulatedI2CBus()
+    else:
+        fork_bus = HT16K33.I2CSetBus(I2C_BUS)
+        fd_bus   = HT16K33.I2CBus(I2C_BUS)
+        bus      = None
+    
+    before = run_transport("i2cset", fork_bus, iterations)
+    after  = run_transport("/dev/i2c", fd_bus, iterations)
+
+    print("Speedup:     {0:10.1f}x".format(after / before))
+
+    print("Full redraw latency (/dev/i2c)")
+    if bus is None:
+        bus = HT16K33.I2CBus(I2C_BUS)
+    run_frames(bus, iterations)
+    bus.close()
+
+    print("Benchmark Complete")
+
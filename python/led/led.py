@@ -53,7 +53,16 @@ Software API:
     off()
       - Turn the LED off    
 
+    async blink(on_time=0.5, off_time=None, count=None)
+      - Blink the LED from an asyncio event loop; off_time defaults to 
+        on_time and count=None blinks until the task is cancelled
+      - The LED is off when the blink ends or is cancelled
+
+    async on_for(duration)
+      - Turn the LED on for duration seconds, then off
+
 """
+import asyncio
 import Adafruit_BBIO.GPIO as GPIO
 
 # ------------------------------------------------------------------------
@@ -142,6 +151,39 @@ class LED():
     # End def
 
 
+    async def blink(self, on_time=0.5, off_time=None, count=None):
+        """ Blink the LED count times (forever if None) without blocking the event loop """
+        if off_time is None:
+            off_time = on_time
+        
+        blinks = 0
+        
+        try:
+            while (count is None) or (blinks < count):
+                self.on()
+                await asyncio.sleep(on_time)
+                self.off()
+                await asyncio.sleep(off_time)
+                blinks += 1
+        finally:
+            # Leave the LED off if the task is cancelled
+            self.off()
+    
+    # End def
+
+
+    async def on_for(self, duration):
+        """ Turn the LED on for duration seconds without blocking the event loop """
+        self.on()
+        
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            self.off()
+    
+    # End def
+
+
     def cleanup(self):
         """ Cleanup the hardware components. """
         # Turn LED off 
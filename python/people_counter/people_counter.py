@@ -37,16 +37,17 @@ Requirements:
   - Increment the counter by one each time the button is pressed
   - If button is held for more than 2s, reset the counter
 
+  The reset is done as soon as the button has been held for 2s (the 
+button does not need to be released first).
+
 Uses:
   - HT16K33 display library developed in class
+  - Button bank / gesture classifier
 
 """
-import time
-
-import Adafruit_BBIO.GPIO as GPIO
-
 import ht16k33 as HT16K33
-import button as BUTTON
+import button_bank as BUTTON_BANK
+import gestures as GESTURES
 
 
 # ------------------------------------------------------------------------
@@ -69,14 +70,20 @@ class PeopleCounter():
     """ People Counter """
     reset_time = None
     button     = None
+    bank       = None
+    classifier = None
     display    = None
     
     def __init__(self, reset_time=2.0, button="P2_2", i2c_bus=1, i2c_address=0x70):
         """ Initialize variables and set up display """
         self.reset_time = reset_time
-        self.button     = BUTTON.Button(button)
+        self.button     = button
+        self.bank       = BUTTON_BANK.ButtonBank([button])
         self.display    = HT16K33.HT16K33(i2c_bus, i2c_address)
         
+        # Short press (on release) increments; holding for reset_time resets
+        self.classifier = GESTURES.GestureClassifier(long_time=reset_time, double_time=None, chord_time=None)
+        
         self._setup()
     
     # End def
@@ -86,6 +93,9 @@ class PeopleCounter():
         """Setup the hardware components."""
         # Initialize Display
         self.display.clear()
+        
+        # Start watching the button
+        self.bank.start()
        
     # End def
 
@@ -93,18 +103,12 @@ class PeopleCounter():
     def run(self):
         """Execute the main program."""
         people_count                 = 0      # Number of people to be displayed
-        button_press_time            = 0.0      # Time button was pressed (in seconds)
         
-        while(1):
-
-    
-            # Wait for button press / release
-            self.button.wait_for_press()
-            # Get the press time
-            button_press_time = self.button.get_last_press_duration()
+        # Wait for button gestures
+        for gesture, pins, timestamp in self.classifier.gestures(self.bank):
             
-            # Compare time to increment or reset people_count
-            if (button_press_time < self.reset_time):
+            # Increment on a short press, reset on a long press
+            if (gesture == GESTURES.SHORT):
                 if (people_count < HT16K33.HT16K33_MAX_VALUE):
                     people_count = people_count + 1
                 else:
@@ -123,7 +127,8 @@ class PeopleCounter():
         # Set Display to something unique to show program is complete
         self.display.text("----")
         
-        # Button does not need any cleanup code
+        # Stop button edge detection
+        self.bank.cleanup()
         
     # End def
 
@@ -35,16 +35,53 @@ Potentiometer Driver for PocketBeagle
 
 Software API:
 
-  Potentiometer(pin)
+  Potentiometer(pin, voltage=1.8, oversample=1, adc=None)
     - Provide PocketBeagle pin that the potentiometer is connected
+    - oversample is the number of samples averaged for each value 
+      (see oversample.py); 1 reads a single sample.  oversample.py (in 
+      python/adc) is only imported for oversampled readings, so it must be
+      on the PYTHONPATH only when oversample > 1 or get_reading() is used
+    - adc is Adafruit_BBIO.ADC (default) or a started iio_adc.IIOCapture
+      (oversampled values then use the captured samples; no extra I/O)
 
   get_value()
     - Returns the raw ADC value.  Integer in [0, 4095] 
 
+  get_reading()
+    - Returns an oversample.Reading with the mean value, the decimated 
+      higher resolution value, its bits, the samples used and the latency
+
   get_voltage()
     - Returns the approximate voltage of the pin in volts
 
+  set_change_filter(divider=1, deadband=0, hysteresis=0)
+    - Configure change notification (see ChangeFilter) and forget the 
+      last notified value
+
+  get_change()
+    - Returns the divided value if it changed since the last notification,
+      otherwise None.  The first call after set_change_filter() or
+      reset_change() always returns the value.
+
+  reset_change()
+    - Forget the last notified value, so the next get_change() returns
+      the value even if it did not change
+
+  changes(poll_time=0.1)
+    - Generator that reads the potentiometer every poll_time seconds and
+      yields the divided value only when it changes
+
+  ChangeFilter(divider=1, deadband=0, hysteresis=0)
+    - divider    : The value is raw // divider
+    - hysteresis : Raw counts past a divider boundary before the value 
+                   changes, so noise at a boundary does not toggle it
+    - deadband   : Changes of the value by up to deadband are ignored
+    - update(raw) : Returns the new value on a change, otherwise None
+    - reset()     : The next update() returns the value
+
 """
+import time
+
 import Adafruit_BBIO.ADC as ADC
 
 # ------------------------------------------------------------------------
@@ -65,12 +102,68 @@ PINS_1V8 = ["P1_19", "P1_21", "P1_23", "P1_25", "P1_27", "P2_36"]
 # Functions / Classes
 # ------------------------------------------------------------------------
 
+class ChangeFilter():
+    """ Divided value of a raw ADC value that only reports changes """
+    divider    = None
+    deadband   = None
+    hysteresis = None
+    value      = None
+
+    def __init__(self, divider=1, deadband=0, hysteresis=0):
+        """ Initialize variables """
+        if (divider < 1) or (deadband < 0) or (hysteresis < 0):
+            raise ValueError("Invalid change filter ({0}, {1}, {2})".format(divider, deadband, hysteresis))
+
+        self.divider    = divider
+        self.deadband   = deadband
+        self.hysteresis = hysteresis
+        self.value      = None
+
+    # End def
+
+
+    def update(self, raw):
+        """ Return the divided value of raw if it changed, otherwise None """
+        value = raw // self.divider
+
+        if self.value is None:
+            self.value = value
+            return value
+
+        if value > self.value:
+            # Rising: raw must be past the boundary by the hysteresis
+            value = max((raw - self.hysteresis) // self.divider, self.value)
+        elif value < self.value:
+            # Falling: raw must be below the boundary by the hysteresis
+            value = min((raw + self.hysteresis) // self.divider, self.value)
+
+        if abs(value - self.value) <= self.deadband:
+            return None
+
+        self.value = value
+        return value
+
+    # End def
+
+
+    def reset(self):
+        """ Report the next value even if it did not change """
+        self.value = None
+
+    # End def
+
+# End class
+
+
 class Potentiometer():
     """ Button Class """
     pin             = None
     voltage         = None
+    oversample      = None
+    adc             = None
+    change_filter   = None
     
-    def __init__(self, pin=None, voltage=1.8):
+    def __init__(self, pin=None, voltage=1.8, oversample=1, adc=None):
         """ Initialize variables and set up the potentiometer """
         if (pin == None):
             raise ValueError("Pin not provided for Potentiometer()")
@@ -85,6 +178,10 @@ class Potentiometer():
             if pin not in PINS_1V8:
                 print("WARNING:  Unknown pin {0}.  Setting voltage to 1.8V.".format(pin))
         
+        self.oversample    = oversample
+        self.adc           = adc if adc is not None else ADC
+        self.change_filter = ChangeFilter()
+        
         # Initialize the hardware components        
         self._setup()
     
@@ -108,9 +205,22 @@ class Potentiometer():
            Returns:  Integer in [0, 4095]
         """
         # Read raw value from ADC
-        # !!! NEED TO IMPLEMENT !!! #
-        return int(ADC.read_raw(self.pin))
-        # !!! NEED TO IMPLEMENT !!! #
+        if self.oversample > 1:
+            return int(round(self.get_reading().value))
+        
+        return int(self.adc.read_raw(self.pin))
+
+    # End def
+
+
+    def get_reading(self):
+        """ Get an oversampled reading of the Potentiometer
+        
+           Returns:  oversample.Reading
+        """
+        import oversample as OVERSAMPLE
+        
+        return OVERSAMPLE.read_oversampled(self.adc, self.pin, self.oversample)
 
     # End def
 
@@ -123,6 +233,41 @@ class Potentiometer():
         return ((self.get_value() / MAX_VALUE) * self.voltage)
     
     # End def    
+
+
+    def set_change_filter(self, divider=1, deadband=0, hysteresis=0):
+        """ Configure change notification of the divided value """
+        self.change_filter = ChangeFilter(divider, deadband, hysteresis)
+
+    # End def
+
+
+    def get_change(self):
+        """ Get the divided value if it changed since the last notification
+        
+           Returns:  Integer or None
+        """
+        return self.change_filter.update(self.get_value())
+
+    # End def
+
+
+    def reset_change(self):
+        """ Report the next value from get_change() even if it did not change """
+        self.change_filter.reset()
+
+    # End def
+
+
+    def changes(self, poll_time=0.1):
+        """ Generator of the divided value, yielded only on change """
+        while True:
+            value = self.get_change()
+            if value is not None:
+                yield value
+            time.sleep(poll_time)
+
+    # End def
     
     
     def cleanup(self):
@@ -141,8 +286,6 @@ class Potentiometer():
 # ------------------------------------------------------------------------
 
 if __name__ == '__main__':
-    import time
-
     print("Potentiometer Test")
 
     # Create instantiation of the potentiometer
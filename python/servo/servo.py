@@ -39,10 +39,20 @@ API:
     turn(percentage)
       -   0 = Fully clockwise
       - 100 = Fully anti-clockwise
+      - The duty cycle is written through a persistent PWM channel (see
+        pwm_sysfs.py); turning to the current position writes nothing
+
+    async move_to(percentage, speed=None)
+      - Turn the servo and wait (without blocking the event loop) until it
+        has reached the position
+      - speed is in percent per second; None turns at the full servo speed
 
 """
+import asyncio
 import Adafruit_BBIO.PWM as PWM
 
+import pwm_sysfs as PWM_SYSFS
+
 # ------------------------------------------------------------------------
 # Constants
 # ------------------------------------------------------------------------
@@ -51,6 +61,8 @@ SG90_FREQ               = 50                  # 20ms period (50Hz)
 SG90_POL                = 0                   # Rising Edge polarity
 SG90_MIN_DUTY           = 5                   # 1ms pulse (5% duty cycle)  -- Fully clockwise (right)
 SG90_MAX_DUTY           = 10                  # 2ms pulse (10% duty cycle) -- Fully anti-clockwise (left)
+SG90_TRAVEL_TIME        = 0.3                 # Seconds to turn 0% to 100% (0.1s / 60 degrees)
+SG90_STEP_TIME          = 0.02                # One PWM period; duty cycle updates per step
 
 # ------------------------------------------------------------------------
 # Global variables
@@ -66,6 +78,7 @@ class Servo():
     """ CombinationLock """
     pin       = None
     position  = None
+    channel   = None
     
     def __init__(self, pin=None, default_position=0):
         """ Initialize variables and set up the Servo """
@@ -87,6 +100,9 @@ class Servo():
         
         PWM.start(self.pin, self._duty_cycle_from_position(default_position), frequency = SG90_FREQ, polarity = SG90_POL)
         
+        # Keep the duty cycle file open for turn()
+        self.channel = PWM_SYSFS.open_pwm_channel(self.pin)
+        
     # End def
 
     
@@ -116,14 +132,49 @@ class Servo():
         # Set PWM duty cycle based on position
         duty_cycle = self._duty_cycle_from_position(position)
         
-        PWM.set_duty_cycle(self.pin, duty_cycle)
+        self.channel.set_duty_cycle(duty_cycle)
 
     # End def
 
 
+    async def move_to(self, position, speed=None):
+        """ Turn Servo to position and wait until it gets there
+        
+            speed (percent / second) sweeps the servo in steps of one PWM 
+            period; None turns at the full servo speed.
+        """
+        start = self.position
+        
+        if speed is None:
+            self.turn(position)
+            await asyncio.sleep(SG90_TRAVEL_TIME * abs(position - start) / 100)
+            return
+        
+        if speed <= 0:
+            raise ValueError("Servo speed must be positive")
+        
+        loop     = asyncio.get_running_loop()
+        begin    = loop.time()
+        duration = abs(position - start) / speed
+        
+        # Step based on elapsed time so a slow event loop does not slow the sweep
+        while True:
+            elapsed = loop.time() - begin
+            if elapsed >= duration:
+                break
+            
+            self.turn(start + (position - start) * (elapsed / duration))
+            await asyncio.sleep(SG90_STEP_TIME)
+        
+        self.turn(position)
+        
+    # End def
+
+
     def cleanup(self):
         """Cleanup the hardware components."""
         # Stop servo
+        self.channel.close()
         PWM.stop(self.pin)
         PWM.cleanup()
         
@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Simulated Adafruit_BBIO
+--------------------------------------------------------------------------
+License:
+Copyright 2025 Tarik Price
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+this list of conditions and the following disclaimer in the documentation
+and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its contributors
+may be used to endorse or promote products derived from this software without
+specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+--------------------------------------------------------------------------
+
+Simulated GPIO / ADC / PWM backends with the same interface as the parts of
+Adafruit_BBIO used by the drivers in this repository.  Every call that
+would touch sysfs on the PocketBeagle is counted in "stats".
+
+The drivers import Adafruit_BBIO directly, so install() must be called
+before any driver is imported:
+
+    import sim_bbio
+    sim_bbio.install()
+
+    import button                       # Uses the simulated GPIO
+
+Software API:
+
+  install(gpio=GPIO, adc=ADC, pwm=PWM)
+    - Register the simulated modules as Adafruit_BBIO, Adafruit_BBIO.GPIO,
+      Adafruit_BBIO.ADC and Adafruit_BBIO.PWM (sim_trace.py installs its
+      replay subclasses this way)
+
+  reset_stats()
+    - Clear the operation counters
+
+  stats
+    - collections.Counter of operations, e.g. stats["gpio.input"]
+
+  GPIO
+    - setup(), input(), output(), add_event_detect(), remove_event_detect(),
+      event_detected(), wait_for_edge(), cleanup()
+    - set_input(pin, value) : Drive an input pin (runs edge callbacks)
+    - get_output(pin)       : Return the value last written to a pin
+
+  ADC
+    - setup(), read(), read_raw()
+    - set_source(pin, function) : function(n) returns the n-th sample of
+                                  the pin as a float in [0, 1]
+
+  PWM
+    - start(), set_duty_cycle(), set_frequency(), stop(), cleanup()
+    - get_duty_cycle(pin)   : Return the duty cycle last set on a pin
+
+"""
+import sys
+import time
+import types
+import threading
+import collections
+
+# ------------------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------------------
+
+ADC_MAX_RAW = 4095
+
+# ------------------------------------------------------------------------
+# Global variables
+# ------------------------------------------------------------------------
+
+stats = collections.Counter()
+
+# ------------------------------------------------------------------------
+# Functions / Classes
+# ------------------------------------------------------------------------
+
+def reset_stats():
+    """Clear the operation counters"""
+    stats.clear()
+
+# End def
+
+
+class SimGPIO():
+    """ Simulated Adafruit_BBIO.GPIO """
+    HIGH     = 1
+    LOW      = 0
+    IN       = 0
+    OUT      = 1
+    PUD_OFF  = 0
+    PUD_DOWN = 1
+    PUD_UP   = 2
+    RISING   = 1
+    FALLING  = 2
+    BOTH     = 3
+
+    def __init__(self):
+        """ Initialize the pin state """
+        self.values    = {}
+        self.callbacks = {}
+        self.edges     = {}
+        self.detected  = {}
+        self.condition = threading.Condition()
+
+    # End def
+
+
+    def setup(self, pin, direction, pull_up_down=0, initial=0, delay=0):
+        """Set up the pin; pull ups / downs set the idle input level"""
+        stats["gpio.setup"] += 1
+
+        with self.condition:
+            if direction == self.OUT:
+                self.values[pin] = initial
+            elif pin not in self.values:
+                self.values[pin] = self.HIGH if (pull_up_down == self.PUD_UP) else self.LOW
+
+    # End def
+
+
+    def input(self, pin):
+        """Return the value of the pin"""
+        stats["gpio.input"] += 1
+        return self.values.get(pin, self.LOW)
+
+    # End def
+
+
+    def output(self, pin, value):
+        """Set the value of an output pin"""
+        stats["gpio.output"] += 1
+        self.values[pin] = value
+
+    # End def
+
+
+    def get_output(self, pin):
+        """Return the value last written to the pin"""
+        return self.values.get(pin, self.LOW)
+
+    # End def
+
+
+    def _matches(self, edge, value):
+        """Return True if a change to value is an edge of the given type"""
+        if edge == self.BOTH:
+            return True
+        if edge == self.RISING:
+            return value == self.HIGH
+        return value == self.LOW
+
+    # End def
+
+
+    def set_input(self, pin, value):
+        """Drive an input pin; edge callbacks run in the caller's thread"""
+        with self.condition:
+            old = self.values.get(pin, self.LOW)
+            self.values[pin] = value
+
+            if (old == value) or (pin not in self.edges):
+                return
+
+            if not self._matches(self.edges[pin], value):
+                return
+
+            self.detected[pin] = True
+            callbacks = list(self.callbacks.get(pin, []))
+            self.condition.notify_all()
+
+        for callback in callbacks:
+            callback(pin)
+
+    # End def
+
+
+    def add_event_detect(self, pin, edge, callback=None, bouncetime=0):
+        """Detect edges on the pin; callback(pin) is called for each edge"""
+        stats["gpio.add_event_detect"] += 1
+
+        with self.condition:
+            self.edges[pin]     = edge
+            self.callbacks[pin] = [callback] if callback is not None else []
+            self.detected[pin]  = False
+
+    # End def
+
+
+    def add_event_callback(self, pin, callback, bouncetime=0):
+        """Add another callback for a pin with event detection"""
+        with self.condition:
+            self.callbacks.setdefault(pin, []).append(callback)
+
+    # End def
+
+
+    def remove_event_detect(self, pin):
+        """Stop detecting edges on the pin"""
+        with self.condition:
+            self.edges.pop(pin, None)
+            self.callbacks.pop(pin, None)
+            self.detected.pop(pin, None)
+
+    # End def
+
+
+    def event_detected(self, pin):
+        """Return True (once) if an edge was detected since the last call"""
+        with self.condition:
+            detected = self.detected.get(pin, False)
+            self.detected[pin] = False
+            return detected
+
+    # End def
+
+
+    def wait_for_edge(self, pin, edge, timeout=-1):
+        """Block until an edge of the given type (timeout in ms; -1 = forever)"""
+        stats["gpio.wait_for_edge"] += 1
+
+        deadline = None
+        if timeout >= 0:
+            deadline = time.monotonic() + timeout / 1000.0
+
+        with self.condition:
+            start = self.values.get(pin, self.LOW)
+
+            while True:
+                value = self.values.get(pin, self.LOW)
+                if (value != start) and self._matches(edge, value):
+                    return pin
+
+                if deadline is None:
+                    self.condition.wait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    self.condition.wait(remaining)
+
+    # End def
+
+
+    def cleanup(self):
+        """Reset all pins"""
+        with self.condition:
+            self.values.clear()
+            self.edges.clear()
+            self.callbacks.clear()
+            self.detected.clear()
+
+    # End def
+
+# End class
+
+
+class SimADC():
+    """ Simulated Adafruit_BBIO.ADC """
+
+    def __init__(self):
+        """ Initialize the sample sources """
+        self.sources = {}
+        self.counts  = collections.Counter()
+
+    # End def
+
+
+    def setup(self):
+        """Nothing to set up"""
+        stats["adc.setup"] += 1
+
+    # End def
+
+
+    def set_source(self, pin, function):
+        """function(n) returns the n-th sample of the pin in [0, 1]"""
+        self.sources[pin]  = function
+        self.counts[pin]   = 0
+
+    # End def
+
+
+    def _sample(self, pin):
+        """Return the next normalized sample of the pin"""
+        n = self.counts[pin]
+        self.counts[pin] = n + 1
+
+        source = self.sources.get(pin)
+        if source is None:
+            return 0.0
+
+        return min(max(source(n), 0.0), 1.0)
+
+    # End def
+
+
+    def read(self, pin):
+        """Return the pin value as a float in [0, 1]"""
+        stats["adc.read"] += 1
+        return round(self._sample(pin) * ADC_MAX_RAW) / ADC_MAX_RAW
+
+    # End def
+
+
+    def read_raw(self, pin):
+        """Return the raw pin value (0 to 4095) as a float"""
+        stats["adc.read_raw"] += 1
+        return float(round(self._sample(pin) * ADC_MAX_RAW))
+
+    # End def
+
+# End class
+
+
+class SimPWM():
+    """ Simulated Adafruit_BBIO.PWM """
+
+    def __init__(self):
+        """ Initialize the channel state """
+        self.duty_cycles = {}
+        self.frequencies = {}
+
+    # End def
+
+
+    def start(self, pin, duty_cycle, frequency=2000, polarity=0):
+        """Start PWM on the pin"""
+        stats["pwm.start"] += 1
+        self.duty_cycles[pin] = duty_cycle
+        self.frequencies[pin] = frequency
+
+    # End def
+
+
+    def set_duty_cycle(self, pin, duty_cycle):
+        """Set the duty cycle (percent) of a started pin"""
+        stats["pwm.set_duty_cycle"] += 1
+
+        if pin not in self.duty_cycles:
+            raise RuntimeError("You must start() the PWM channel first")
+
+        self.duty_cycles[pin] = duty_cycle
+
+    # End def
+
+
+    def get_duty_cycle(self, pin):
+        """Return the duty cycle last set on the pin"""
+        return self.duty_cycles.get(pin)
+
+    # End def
+
+
+    def set_frequency(self, pin, frequency):
+        """Set the frequency (Hz) of a started pin"""
+        stats["pwm.set_frequency"] += 1
+        self.frequencies[pin] = frequency
+
+    # End def
+
+
+    def stop(self, pin):
+        """Stop PWM on the pin"""
+        stats["pwm.stop"] += 1
+        self.duty_cycles.pop(pin, None)
+        self.frequencies.pop(pin, None)
+
+    # End def
+
+
+    def cleanup(self):
+        """Stop every pin"""
+        self.duty_cycles.clear()
+        self.frequencies.clear()
+
+    # End def
+
+# End class
+
+
+GPIO = SimGPIO()
+ADC  = SimADC()
+PWM  = SimPWM()
+
+
+def install(gpio=GPIO, adc=ADC, pwm=PWM):
+    """Register the simulated modules in place of Adafruit_BBIO"""
+    package      = types.ModuleType("Adafruit_BBIO")
+    package.GPIO = gpio
+    package.ADC  = adc
+    package.PWM  = pwm
+
+    sys.modules["Adafruit_BBIO"]      = package
+    sys.modules["Adafruit_BBIO.GPIO"] = gpio
+    sys.modules["Adafruit_BBIO.ADC"]  = adc
+    sys.modules["Adafruit_BBIO.PWM"]  = pwm
+
+# End def
+
+
+# ------------------------------------------------------------------------
+# Main script
+# ------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    print("Simulated Adafruit_BBIO Test")
+
+    install()
+
+    import Adafruit_BBIO.GPIO as SIM_GPIO
+    import Adafruit_BBIO.ADC as SIM_ADC
+
+    SIM_GPIO.setup("P2_2", SIM_GPIO.IN, pull_up_down=SIM_GPIO.PUD_UP)
+    print("P2_2      = {0}".format(SIM_GPIO.input("P2_2")))
+
+    SIM_ADC.set_source("P1_19", lambda n: n / 10.0)
+    print("P1_19     = {0}".format([SIM_ADC.read_raw("P1_19") for i in range(3)]))
+
+    print("Stats     = {0}".format(dict(stats)))
+    print("Test Complete")
+
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Simulated I2C Bus
+--------------------------------------------------------------------------
+License:
+Copyright 2025 Tarik Price
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+this list of conditions and the following disclaimer in the documentation
+and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its contributors
+may be used to endorse or promote products derived from this software without
+specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+--------------------------------------------------------------------------
+
+Simulated I2C bus with HT16K33 devices for running and benchmarking the
+display drivers without a PocketBeagle.
+
+The simulated bus can be passed anywhere a bus number is accepted, e.g.
+
+    bus     = SimulatedI2CBus(speed=I2C_FAST_MODE)
+    display = HT16K33(bus, 0x70)
+
+Software API:
+
+  SimulatedI2CBus(speed=I2C_STANDARD_MODE, write_overhead=FD_WRITE_TIME,
+                  devices=None, realtime=False)
+    - speed          : Bus clock in Hz (100 kHz standard / 400 kHz fast mode)
+    - write_overhead : Software cost of each transaction in seconds.  Use
+                       I2CSET_FORK_TIME to model the i2cset (fork) path.
+    - devices        : Addresses that acknowledge (default: every address)
+    - realtime       : Sleep for the modeled time of each transaction
+
+    write(address, data)
+      - Record one write transaction and apply it to the device at address.
+        Raises OSError (like the real bus) if no device acknowledges.
+
+    ram(address)
+      - Return the 16 byte display RAM of the device at address (bytes)
+
+    state(address)
+      - Return a dictionary with the oscillator / display / blink /
+        brightness settings of the device at address
+
+    reset_stats()
+      - Clear the recorded transactions and the modeled time
+
+    close()
+      - Nothing to release
+
+    Attributes:
+      - transactions : List of (address, data, duration) for every write
+      - elapsed      : Total modeled bus time in seconds
+      - byte_count   : Total data bytes written
+
+Timing model:
+  Each transaction costs the bus time for a start condition, the address
+byte, the data bytes (9 clocks each including ACK) and a stop condition,
+plus a fixed software overhead per transaction.  The overheads are rough
+PocketBeagle estimates and should be adjusted from hardware measurements.
+
+"""
+import errno
+import time
+
+# ------------------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------------------
+
+I2C_STANDARD_MODE           = 100000      # Hz
+I2C_FAST_MODE               = 400000      # Hz
+
+# Clocks per transaction: start + stop; 9 clocks per byte (8 bits + ACK)
+I2C_START_STOP_CLOCKS       = 2
+I2C_BYTE_CLOCKS             = 9
+
+# Software overhead per transaction (seconds)
+FD_WRITE_TIME               = 0.00005     # write() on an open /dev/i2c fd
+I2CSET_FORK_TIME            = 0.004       # fork / exec of /usr/sbin/i2cset
+
+# HT16K33 model
+HT16K33_RAM_SIZE            = 16
+HT16K33_SYSTEM_SETUP        = 0x20
+HT16K33_BLINK_CMD           = 0x80
+HT16K33_BRIGHTNESS_CMD      = 0xE0
+
+# ------------------------------------------------------------------------
+# Functions / Classes
+# ------------------------------------------------------------------------
+
+class SimulatedHT16K33():
+    """ Model of the HT16K33 registers written by the display driver """
+    ram        = None
+    oscillator = None
+    display_on = None
+    blink      = None
+    brightness = None
+    pointer    = None
+
+    def __init__(self):
+        """ Initialize the device to its power on state """
+        self.ram        = bytearray(HT16K33_RAM_SIZE)
+        self.oscillator = False
+        self.display_on = False
+        self.blink      = 0
+        self.brightness = 0x0F
+        self.pointer    = 0
+
+    # End def
+
+
+    def write(self, data):
+        """Apply one write transaction to the device"""
+        if len(data) == 0:
+            return
+
+        command = data[0]
+
+        if command < HT16K33_RAM_SIZE:
+            # Display RAM write; the RAM pointer auto-increments (and wraps)
+            self.pointer = command
+            for byte in data[1:]:
+                self.ram[self.pointer] = byte
+                self.pointer = (self.pointer + 1) % HT16K33_RAM_SIZE
+        elif (command & 0xF0) == HT16K33_SYSTEM_SETUP:
+            self.oscillator = bool(command & 0x01)
+        elif (command & 0xF0) == HT16K33_BLINK_CMD:
+            self.display_on = bool(command & 0x01)
+            self.blink      = (command >> 1) & 0x03
+        elif (command & 0xF0) == HT16K33_BRIGHTNESS_CMD:
+            self.brightness = command & 0x0F
+
+    # End def
+
+# End class
+
+
+class SimulatedI2CBus():
+    """ Simulated I2C bus that records transactions and models bus timing """
+    speed          = None
+    write_overhead = None
+    addresses      = None
+    realtime       = None
+    devices        = None
+    transactions   = None
+    elapsed        = None
+    byte_count     = None
+
+    def __init__(self, speed=I2C_STANDARD_MODE, write_overhead=FD_WRITE_TIME, devices=None, realtime=False):
+        """ Initialize class variables """
+        self.speed          = speed
+        self.write_overhead = write_overhead
+        self.addresses      = devices
+        self.realtime       = realtime
+        self.devices        = {}
+
+        self.reset_stats()
+
+    # End def
+
+
+    def _device(self, address):
+        """Return the device model at address (created on first use)"""
+        if (self.addresses is not None) and (address not in self.addresses):
+            raise OSError(errno.EREMOTEIO, "No device at address 0x{0:x}".format(address))
+
+        if address not in self.devices:
+            self.devices[address] = SimulatedHT16K33()
+
+        return self.devices[address]
+
+    # End def
+
+
+    def transaction_time(self, length):
+        """Return the modeled time (seconds) to write length data bytes"""
+        clocks = I2C_START_STOP_CLOCKS + I2C_BYTE_CLOCKS * (length + 1)
+        return (clocks / self.speed) + self.write_overhead
+
+    # End def
+
+
+    def write(self, address, data):
+        """Write the bytes in data to the device at address in one transaction"""
+        data     = bytes(data)
+        device   = self._device(address)
+        duration = self.transaction_time(len(data))
+
+        device.write(data)
+
+        self.transactions.append((address, data, duration))
+        self.elapsed    += duration
+        self.byte_count += len(data)
+
+        if self.realtime:
+            time.sleep(duration)
+
+    # End def
+
+
+    def ram(self, address):
+        """Return the display RAM of the device at address"""
+        return bytes(self._device(address).ram)
+
+    # End def
+
+
+    def state(self, address):
+        """Return the settings of the device at address"""
+        device = self._device(address)
+
+        return {"oscillator" : device.oscillator,
+                "display_on" : device.display_on,
+                "blink"      : device.blink,
+                "brightness" : device.brightness}
+
+    # End def
+
+
+    def reset_stats(self):
+        """Clear the recorded transactions and the modeled time"""
+        self.transactions = []
+        self.elapsed      = 0.0
+        self.byte_count   = 0
+
+    # End def
+
+
+    def close(self):
+        """Nothing to release for the simulated bus"""
+        pass
+
+    # End def
+
+# End class
+
+
+# ------------------------------------------------------------------------
+# Main script
+# ------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    print("Simulated I2C Bus Test")
+
+    bus = SimulatedI2CBus()
+
+    # Turn on the oscillator, display on, RAM "8" at digit 0 and colon
+    bus.write(0x70, [0x21])
+    bus.write(0x70, [0x81])
+    bus.write(0x70, [0x00, 0x7f, 0x00, 0x00, 0x00, 0x02])
+
+    print("RAM          = {0}".format(bus.ram(0x70).hex()))
+    print("State        = {0}".format(bus.state(0x70)))
+    print("Transactions = {0}".format(len(bus.transactions)))
+    print("Bus time     = {0:.3f} ms".format(1000.0 * bus.elapsed))
+
+    print("Test Complete")
+
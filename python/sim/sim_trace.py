@@ -0,0 +1,771 @@
+# -*- coding: utf-8 -*-
+"""
+--------------------------------------------------------------------------
+Sensor Trace Record / Replay
+--------------------------------------------------------------------------
+License:
+Copyright 2025 Tarik Price
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+list of conditions and the following disclaimer.
+
+2. Redistributions in binary form must reproduce the above copyright notice,
+this list of conditions and the following disclaimer in the documentation
+and/or other materials provided with the distribution.
+
+3. Neither the name of the copyright holder nor the names of its contributors
+may be used to endorse or promote products derived from this software without
+specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+--------------------------------------------------------------------------
+
+Record the sensor inputs and actuator outputs of a control loop to a
+compact binary trace, and replay a trace through the drivers on any Linux
+machine for repeatable performance and regression runs.
+
+Recording wraps the Adafruit_BBIO modules, so record() must be called
+before any driver is imported (like sim_bbio.install()):
+
+    import sim_trace
+    writer = sim_trace.record("grip.trace")
+
+    import prosthetic_force_sensor      # Uses the recording GPIO / ADC / PWM
+
+    finger         = prosthetic_force_sensor.pros_finger()
+    finger.display = sim_trace.RecordingDisplay(finger.display, writer)
+    finger.run()
+
+Replay installs simulated Adafruit_BBIO modules (sim_bbio.py) that return
+the recorded inputs in order, so the control loop sees exactly the same
+sequence of samples and its outputs can be compared with the recording:
+
+    player = sim_trace.replay("grip.trace")
+
+    import prosthetic_force_sensor
+
+    finger         = prosthetic_force_sensor.pros_finger(i2c_bus=sim_i2c.SimulatedI2CBus())
+    finger.display = sim_trace.RecordingDisplay(finger.display, player)
+    finger.run()                        # Returns at the end of the trace
+    print(player.compare())
+
+Trace file:
+    Header : 16 bytes; magic "BBTRACE1", version, record size (uint16)
+    Record : 24 bytes; time (float64, s since the start of the recording),
+             kind (uint8), channel (uint8), 2 pad bytes, value (float32),
+             text (8 bytes)
+
+    Kinds:
+      CHANNEL  : Defines a channel number; text is the pin / device name
+      ADC_IN   : ADC sample; value in [0, 1] (read_raw() values / 4095)
+      GPIO_IN  : GPIO.input() value
+      GPIO_OUT : GPIO.output() value
+      PWM_OUT  : PWM.start() / set_duty_cycle() duty cycle (%)
+      DISPLAY  : Display text() / update(); text shown (value for update())
+
+    Records are only appended, so a recording stopped at any time can be
+    replayed (a partial last record is ignored).
+
+Software API:
+
+  record(path)
+    - Wrap the Adafruit_BBIO GPIO / ADC / PWM modules so every input and
+      output is written to a new trace; returns the TraceWriter
+
+  replay(path, realtime=False, output=None)
+    - Install simulated Adafruit_BBIO modules that replay the inputs of
+      the trace; returns the TracePlayer
+    - realtime : Return each input no earlier than its recorded time.
+                 Otherwise inputs are returned as fast as they are read
+                 and time.sleep() only advances the replay clock.
+    - output   : Also write the replayed outputs to a new trace
+
+  TraceWriter(path, clock=time.monotonic)
+    - write(kind, name, value=0.0, text="") : Append one record
+    - close()
+
+  Trace(path)
+    - Memory maps a trace; records is a NumPy structured array view of the
+      file, channels maps channel numbers to names
+    - events(kinds) : (kind name, channel name, value, text) tuples
+
+  TracePlayer
+    - write(kind, name, value=0.0, text="") : Record a replayed output
+    - outputs  : Replayed outputs as Trace.events() tuples
+    - compare() : List of (index, recorded, replayed) output differences
+    - close()  : Restore time.sleep() and close the output trace
+
+  RecordingDisplay(display, writer)
+    - Display front-end that records text() / update() to a TraceWriter or
+      TracePlayer and passes every call on to the display
+
+  TraceEnd
+    - Raised by a replayed input read past the end of the trace.  It is a
+      KeyboardInterrupt, so control loops that clean up and return on
+      Ctrl-C (e.g. pros_finger.run()) end the same way at the end of the
+      trace.
+
+Usage:
+  python3 sim_trace.py dump TRACE [records]
+  python3 sim_trace.py record TRACE
+  python3 sim_trace.py replay TRACE [--realtime] [--output TRACE]
+
+  record / replay run pros_finger (project_01 must be on PYTHONPATH);
+  replay exits with status 1 if the outputs differ from the recording.
+
+"""
+import sys
+import time
+import mmap
+import struct
+import threading
+
+import numpy as np
+
+import sim_bbio
+
+# ------------------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------------------
+
+TRACE_MAGIC   = b"BBTRACE1"
+TRACE_VERSION = 1
+
+HEADER        = struct.Struct("<8sHH4x")
+RECORD        = struct.Struct("<dBBxxf8s")
+RECORD_DTYPE  = np.dtype({"names"    : ["time", "kind", "channel", "value", "text"],
+                          "formats"  : ["<f8", "u1", "u1", "<f4", "S8"],
+                          "offsets"  : [0, 8, 9, 12, 16],
+                          "itemsize" : RECORD.size})
+
+MAX_CHANNELS  = 256
+TEXT_SIZE     = 8
+
+# Record kinds
+CHANNEL       = 0
+ADC_IN        = 1
+GPIO_IN       = 2
+GPIO_OUT      = 3
+PWM_OUT       = 4
+DISPLAY       = 5
+
+KIND_NAMES    = ["channel", "adc_in", "gpio_in", "gpio_out", "pwm_out", "display"]
+INPUTS        = (ADC_IN, GPIO_IN)
+OUTPUTS       = (GPIO_OUT, PWM_OUT, DISPLAY)
+
+ADC_MAX_RAW   = sim_bbio.ADC_MAX_RAW
+
+# ------------------------------------------------------------------------
+# Functions / Classes
+# ------------------------------------------------------------------------
+
+class TraceEnd(KeyboardInterrupt):
+    """ Raised when a replayed input is read past the end of the trace """
+    pass
+
+# End class
+
+
+def _event(kind, name, value, text):
+    """Return an output as stored in a trace (float32 value, 8 byte text)"""
+    return (KIND_NAMES[kind], name, float(np.float32(value)), text[:TEXT_SIZE])
+
+# End def
+
+
+class TraceWriter():
+    """ Appends fixed size records to a trace file """
+    file     = None
+    clock    = None
+    start    = None
+    channels = None
+    lock     = None
+    count    = None
+
+    def __init__(self, path, clock=time.monotonic):
+        """ Create the trace file and write the header """
+        self.file     = open(path, "wb")
+        self.clock    = clock
+        self.start    = clock()
+        self.channels = {}
+        self.lock     = threading.Lock()
+        self.count    = 0
+
+        self.file.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION, RECORD.size))
+
+    # End def
+
+
+    def _channel(self, timestamp, name):
+        """Return the channel number of name (defined on first use)"""
+        channel = self.channels.get(name)
+
+        if channel is None:
+            channel = len(self.channels)
+            if channel >= MAX_CHANNELS:
+                raise ValueError("Trace has more than {0} channels".format(MAX_CHANNELS))
+
+            self.channels[name] = channel
+            self.file.write(RECORD.pack(timestamp, CHANNEL, channel, 0.0, name.encode()))
+
+        return channel
+
+    # End def
+
+
+    def write(self, kind, name, value=0.0, text=""):
+        """Append one record for the channel name"""
+        with self.lock:
+            timestamp = self.clock() - self.start
+            channel   = self._channel(timestamp, name)
+            self.file.write(RECORD.pack(timestamp, kind, channel, value, text.encode()))
+            self.count += 1
+
+    # End def
+
+
+    def close(self):
+        """Flush and close the trace file"""
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+    # End def
+
+# End class
+
+
+class Trace():
+    """ Memory mapped trace file """
+    map      = None
+    records  = None
+    channels = None
+
+    def __init__(self, path):
+        """ Map the file and read the channel definitions """
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.map) < HEADER.size:
+            raise ValueError("{0} is not a trace".format(path))
+
+        magic, version, size = HEADER.unpack_from(self.map)
+        if (magic != TRACE_MAGIC) or (size != RECORD.size):
+            raise ValueError("{0} is not a version {1} trace".format(path, TRACE_VERSION))
+
+        # A recording stopped mid-write can end with a partial record
+        count         = (len(self.map) - HEADER.size) // RECORD.size
+        self.records  = np.frombuffer(self.map, dtype=RECORD_DTYPE, count=count, offset=HEADER.size)
+
+        definitions   = self.records[self.records["kind"] == CHANNEL]
+        self.channels = {int(d["channel"]) : d["text"].decode() for d in definitions}
+
+    # End def
+
+
+    def duration(self):
+        """Return the time (s) of the last record"""
+        if len(self.records) == 0:
+            return 0.0
+        return float(self.records["time"][-1])
+
+    # End def
+
+
+    def inputs(self):
+        """Return {(kind, name) : (times, values)} of every input channel"""
+        result = {}
+
+        for channel, name in self.channels.items():
+            for kind in INPUTS:
+                select = (self.records["kind"] == kind) & (self.records["channel"] == channel)
+                if np.any(select):
+                    result[(kind, name)] = (self.records["time"][select], self.records["value"][select])
+
+        return result
+
+    # End def
+
+
+    def events(self, kinds=OUTPUTS):
+        """Return the records of the given kinds as (kind, name, value, text) tuples"""
+        select = np.isin(self.records["kind"], kinds)
+
+        return [(KIND_NAMES[r["kind"]], self.channels[int(r["channel"])], float(r["value"]),
+                 r["text"].decode()) for r in self.records[select]]
+
+    # End def
+
+# End class
+
+
+class TracePlayer():
+    """ Source of the recorded inputs and sink of the replayed outputs """
+    trace    = None
+    realtime = None
+    inputs   = None
+    cursors  = None
+    outputs  = None
+    writer   = None
+    lock     = None
+    start    = None
+    now      = None
+    sleep    = None
+
+    def __init__(self, path, realtime=False, output=None):
+        """ Load the trace; output is an optional trace of the replayed outputs """
+        self.trace    = Trace(path)
+        self.realtime = realtime
+        self.inputs   = self.trace.inputs()
+        self.cursors  = dict.fromkeys(self.inputs, 0)
+        self.outputs  = []
+        self.lock     = threading.Lock()
+        self.start    = time.monotonic()
+        self.now      = 0.0
+        self.sleep    = time.sleep
+
+        if output is not None:
+            clock       = time.monotonic if realtime else (lambda: self.now)
+            self.writer = TraceWriter(output, clock)
+
+    # End def
+
+
+    def has_input(self, kind, name):
+        """Return True if the trace has inputs for the channel"""
+        return (kind, name) in self.inputs
+
+    # End def
+
+
+    def next_input(self, kind, name):
+        """Return the next recorded input of the channel"""
+        times, values = self.inputs[(kind, name)]
+        index         = self.cursors[(kind, name)]
+
+        if index >= len(values):
+            raise TraceEnd("End of trace")
+        self.cursors[(kind, name)] = index + 1
+
+        if self.realtime:
+            delay = self.start + times[index] - time.monotonic()
+            if delay > 0:
+                self.sleep(delay)
+        else:
+            self.now = max(self.now, float(times[index]))
+
+        return float(values[index])
+
+    # End def
+
+
+    def virtual_sleep(self, seconds):
+        """time.sleep() replacement while replaying as fast as possible"""
+        self.now += seconds
+
+    # End def
+
+
+    def write(self, kind, name, value=0.0, text=""):
+        """Record a replayed output"""
+        with self.lock:
+            self.outputs.append(_event(kind, name, value, text))
+
+        if self.writer is not None:
+            self.writer.write(kind, name, value, text)
+
+    # End def
+
+
+    def compare(self):
+        """Return the (index, recorded, replayed) outputs that differ"""
+        recorded    = self.trace.events(OUTPUTS)
+        replayed    = list(self.outputs)
+        differences = []
+
+        for i in range(max(len(recorded), len(replayed))):
+            expected = recorded[i] if i < len(recorded) else None
+            actual   = replayed[i] if i < len(replayed) else None
+
+            if expected != actual:
+                differences.append((i, expected, actual))
+
+        return differences
+
+    # End def
+
+
+    def close(self):
+        """Restore time.sleep() and close the output trace"""
+        if time.sleep is self.virtual_sleep:
+            time.sleep = self.sleep
+
+        if self.writer is not None:
+            self.writer.close()
+
+    # End def
+
+# End class
+
+
+class RecordingGPIO():
+    """ Adafruit_BBIO.GPIO front-end that records inputs and outputs """
+
+    def __init__(self, gpio, writer):
+        """ Wrap the GPIO module """
+        self.gpio   = gpio
+        self.writer = writer
+
+    # End def
+
+
+    def __getattr__(self, name):
+        """Everything else (constants, setup(), edge detection) is passed on"""
+        return getattr(self.gpio, name)
+
+    # End def
+
+
+    def input(self, pin):
+        value = self.gpio.input(pin)
+        self.writer.write(GPIO_IN, pin, value)
+        return value
+
+    # End def
+
+
+    def output(self, pin, value):
+        self.gpio.output(pin, value)
+        self.writer.write(GPIO_OUT, pin, value)
+
+    # End def
+
+# End class
+
+
+class RecordingADC():
+    """ Adafruit_BBIO.ADC front-end that records every sample """
+
+    def __init__(self, adc, writer):
+        """ Wrap the ADC module """
+        self.adc    = adc
+        self.writer = writer
+
+    # End def
+
+
+    def __getattr__(self, name):
+        return getattr(self.adc, name)
+
+    # End def
+
+
+    def read(self, pin):
+        value = self.adc.read(pin)
+        self.writer.write(ADC_IN, pin, value)
+        return value
+
+    # End def
+
+
+    def read_raw(self, pin):
+        value = self.adc.read_raw(pin)
+        self.writer.write(ADC_IN, pin, value / ADC_MAX_RAW)
+        return value
+
+    # End def
+
+# End class
+
+
+class RecordingPWM():
+    """ Adafruit_BBIO.PWM front-end that records duty cycle changes """
+
+    def __init__(self, pwm, writer):
+        """ Wrap the PWM module """
+        self.pwm    = pwm
+        self.writer = writer
+
+    # End def
+
+
+    def __getattr__(self, name):
+        return getattr(self.pwm, name)
+
+    # End def
+
+
+    def start(self, pin, duty_cycle, frequency=2000, polarity=0):
+        self.pwm.start(pin, duty_cycle, frequency, polarity)
+        self.writer.write(PWM_OUT, pin, duty_cycle)
+
+    # End def
+
+
+    def set_duty_cycle(self, pin, duty_cycle):
+        self.pwm.set_duty_cycle(pin, duty_cycle)
+        self.writer.write(PWM_OUT, pin, duty_cycle)
+
+    # End def
+
+# End class
+
+
+class RecordingDisplay():
+    """ HT16K33 / DisplayWriter front-end that records what is shown """
+
+    def __init__(self, display, writer, name="display"):
+        """ Wrap the display; writer is a TraceWriter or TracePlayer """
+        self.display = display
+        self.writer  = writer
+        self.name    = name
+
+    # End def
+
+
+    def __getattr__(self, name):
+        return getattr(self.display, name)
+
+    # End def
+
+
+    def text(self, value):
+        self.display.text(value)
+        self.writer.write(DISPLAY, self.name, 0.0, value)
+
+    # End def
+
+
+    def update(self, value):
+        self.display.update(value)
+        self.writer.write(DISPLAY, self.name, value, str(value))
+
+    # End def
+
+# End class
+
+
+class ReplayGPIO(sim_bbio.SimGPIO):
+    """ Simulated GPIO whose recorded input pins return the trace values """
+
+    def __init__(self, player):
+        super().__init__()
+        self.player = player
+
+    # End def
+
+
+    def input(self, pin):
+        """Return the next recorded value (edge callbacks run on a change)"""
+        if not self.player.has_input(GPIO_IN, pin):
+            return super().input(pin)
+
+        sim_bbio.stats["gpio.input"] += 1
+        value = int(self.player.next_input(GPIO_IN, pin))
+        self.set_input(pin, value)
+        return value
+
+    # End def
+
+
+    def output(self, pin, value):
+        super().output(pin, value)
+        self.player.write(GPIO_OUT, pin, value)
+
+    # End def
+
+# End class
+
+
+class ReplayADC(sim_bbio.SimADC):
+    """ Simulated ADC whose recorded pins return the trace samples """
+
+    def __init__(self, player):
+        super().__init__()
+        self.player = player
+
+    # End def
+
+
+    def read(self, pin):
+        if not self.player.has_input(ADC_IN, pin):
+            return super().read(pin)
+
+        sim_bbio.stats["adc.read"] += 1
+        return round(self.player.next_input(ADC_IN, pin) * ADC_MAX_RAW) / ADC_MAX_RAW
+
+    # End def
+
+
+    def read_raw(self, pin):
+        if not self.player.has_input(ADC_IN, pin):
+            return super().read_raw(pin)
+
+        sim_bbio.stats["adc.read_raw"] += 1
+        return float(round(self.player.next_input(ADC_IN, pin) * ADC_MAX_RAW))
+
+    # End def
+
+# End class
+
+
+class ReplayPWM(sim_bbio.SimPWM):
+    """ Simulated PWM that passes duty cycle changes to the player """
+
+    def __init__(self, player):
+        super().__init__()
+        self.player = player
+
+    # End def
+
+
+    def start(self, pin, duty_cycle, frequency=2000, polarity=0):
+        super().start(pin, duty_cycle, frequency, polarity)
+        self.player.write(PWM_OUT, pin, duty_cycle)
+
+    # End def
+
+
+    def set_duty_cycle(self, pin, duty_cycle):
+        super().set_duty_cycle(pin, duty_cycle)
+        self.player.write(PWM_OUT, pin, duty_cycle)
+
+    # End def
+
+# End class
+
+
+def record(path):
+    """Wrap the Adafruit_BBIO modules to record to a new trace; returns the TraceWriter"""
+    import Adafruit_BBIO
+    import Adafruit_BBIO.GPIO
+    import Adafruit_BBIO.ADC
+    import Adafruit_BBIO.PWM
+
+    writer  = TraceWriter(path)
+    modules = {"GPIO" : RecordingGPIO(Adafruit_BBIO.GPIO, writer),
+               "ADC"  : RecordingADC(Adafruit_BBIO.ADC, writer),
+               "PWM"  : RecordingPWM(Adafruit_BBIO.PWM, writer)}
+
+    # "import Adafruit_BBIO.GPIO as GPIO" reads the package attribute
+    for name, module in modules.items():
+        setattr(Adafruit_BBIO, name, module)
+        sys.modules["Adafruit_BBIO." + name] = module
+
+    return writer
+
+# End def
+
+
+def replay(path, realtime=False, output=None):
+    """Install simulated Adafruit_BBIO modules that replay a trace; returns the TracePlayer"""
+    player = TracePlayer(path, realtime, output)
+
+    sim_bbio.install(ReplayGPIO(player), ReplayADC(player), ReplayPWM(player))
+
+    if not realtime:
+        time.sleep = player.virtual_sleep
+
+    return player
+
+# End def
+
+
+def dump(path, limit):
+    """Print a summary and the first limit records of a trace"""
+    trace = Trace(path)
+    kinds = trace.records["kind"]
+
+    print("Records  = {0}".format(len(trace.records)))
+    print("Duration = {0:.3f} s".format(trace.duration()))
+
+    for channel, name in sorted(trace.channels.items()):
+        select = (trace.records["channel"] == channel) & (kinds != CHANNEL)
+        counts = np.bincount(kinds[select], minlength=len(KIND_NAMES))
+        print("  {0:<8} {1}".format(name, ", ".join("{0} {1}".format(KIND_NAMES[k], c)
+                                                     for k, c in enumerate(counts) if c)))
+
+    for r in trace.records[kinds != CHANNEL][:limit]:
+        print("{0:10.4f} {1:<8} {2:<8} {3:10.4f} {4}".format(r["time"], KIND_NAMES[r["kind"]],
+              trace.channels[int(r["channel"])], r["value"], r["text"].decode()))
+
+# End def
+
+
+def run_pros_finger(writer, bus=None):
+    """Run pros_finger with the display recorded to writer"""
+    import prosthetic_force_sensor
+
+    if bus is None:
+        finger = prosthetic_force_sensor.pros_finger()
+    else:
+        finger = prosthetic_force_sensor.pros_finger(i2c_bus=bus)
+
+    finger.display = RecordingDisplay(finger.display, writer)
+    finger.run()
+
+# End def
+
+
+# ------------------------------------------------------------------------
+# Main script
+# ------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+
+    if (len(args) < 2) or (args[0] not in ("dump", "record", "replay")):
+        print(__doc__[__doc__.index("Usage:"):].rstrip())
+        sys.exit(2)
+
+    command, path = args[0], args[1]
+
+    if command == "dump":
+        dump(path, int(args[2]) if len(args) > 2 else 20)
+
+    elif command == "record":
+        writer = record(path)
+        try:
+            run_pros_finger(writer)
+        finally:
+            writer.close()
+            print("Recorded {0} records to {1}".format(writer.count, path))
+
+    else:
+        import sim_i2c
+
+        output = None
+        if "--output" in args:
+            output = args[args.index("--output") + 1]
+
+        player = replay(path, realtime="--realtime" in args, output=output)
+        start  = time.perf_counter()
+        try:
+            run_pros_finger(player, sim_i2c.SimulatedI2CBus())
+        finally:
+            player.close()
+        elapsed = time.perf_counter() - start
+
+        reads       = sum(player.cursors.values())
+        differences = player.compare()
+
+        print("Replayed {0:.3f} s of trace in {1:.3f} s ({2} inputs, {3:.0f} inputs/s)".format(
+              player.trace.duration(), elapsed, reads, reads / elapsed))
+        print("Outputs  = {0} ({1} differences)".format(len(player.outputs), len(differences)))
+
+        for index, expected, actual in differences[:10]:
+            print("  #{0}: recorded {1} replayed {2}".format(index, expected, actual))
+
+        sys.exit(1 if differences else 0)
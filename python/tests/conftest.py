@@ -0,0 +1,20 @@
+"""
+Shared setup for the driver tests.
+
+The tests run on any Linux machine: the simulated Adafruit_BBIO modules in
+python/sim are installed before any driver is imported, and every driver
+directory is put on sys.path the same way the run scripts set PYTHONPATH.
+
+    python3 -m pytest python/tests
+"""
+import os
+import sys
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for name in ["sim", "ht16k33", "button", "servo", "led", "potentiometer", "adc"]:
+    sys.path.insert(0, os.path.join(PYTHON_DIR, name))
+
+import sim_bbio
+
+sim_bbio.install()
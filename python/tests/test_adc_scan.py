@@ -0,0 +1,24 @@
+"""Tests for adc_scan.py"""
+import numpy as np
+
+import sim_bbio
+import adc_scan as ADC_SCAN
+
+PINS = ["P1_19", "P1_27"]
+
+
+def test_start_without_iio_falls_back_to_read_raw(tmp_path):
+    sim_bbio.ADC.set_source("P1_19", lambda n: 1000 / 4095.0)
+    sim_bbio.ADC.set_source("P1_27", lambda n: 3000 / 4095.0)
+
+    scanner = ADC_SCAN.ADCScanner(PINS)
+
+    # No IIO device
+    scanner.capture.sysfs_path = str(tmp_path / "iio:device0")
+    scanner.capture.dev_path   = str(tmp_path / "dev" / "iio:device0")
+    scanner.start()
+
+    assert scanner.capture is None
+    assert np.array_equal(scanner.scan(), [1000.0, 3000.0])
+
+    scanner.cleanup()
@@ -0,0 +1,31 @@
+"""Tests for button_bank.py"""
+import pytest
+
+import sim_bbio
+import button_bank as BUTTON_BANK
+
+
+def test_add_after_start_is_rejected():
+    bank = BUTTON_BANK.ButtonBank(["P2_2"])
+    bank.start()
+
+    with pytest.raises(RuntimeError):
+        bank.add("P2_4")
+
+    assert list(bank.buttons) == ["P2_2"]
+    bank.cleanup()
+
+
+def test_press_and_release_records():
+    bank = BUTTON_BANK.ButtonBank(["P2_2"])
+    bank.start()
+
+    sim_bbio.GPIO.set_input("P2_2", sim_bbio.GPIO.LOW)
+    pin, event, timestamp = bank.get(timeout=1.0)
+    assert (pin, event) == ("P2_2", BUTTON_BANK.PRESS)
+
+    sim_bbio.GPIO.set_input("P2_2", sim_bbio.GPIO.HIGH)
+    pin, event, timestamp = bank.get(timeout=1.0)
+    assert (pin, event) == ("P2_2", BUTTON_BANK.RELEASE)
+
+    bank.cleanup()
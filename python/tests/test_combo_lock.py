@@ -0,0 +1,59 @@
+"""Tests for combo_lock.py"""
+import os
+import sys
+import time
+
+import sim_bbio
+import sim_i2c
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PYTHON_DIR, "buzzer"))
+sys.path.insert(0, os.path.join(PYTHON_DIR, "combo_lock"))
+
+import combo_lock as COMBO_LOCK
+
+POT_PIN    = "P1_19"
+BUTTON_PIN = "P2_2"
+
+
+def test_show_analog_value_returns_value_and_redraws_on_change():
+    raw = [800]
+    sim_bbio.ADC.set_source(POT_PIN, lambda n: raw[0] / 4095.0)
+
+    bus  = sim_i2c.SimulatedI2CBus()
+    lock = COMBO_LOCK.CombinationLock(potentiometer=POT_PIN, i2c_bus=bus)
+    bus.reset_stats()
+
+    assert lock.show_analog_value() == 800 // COMBO_LOCK.POT_DIVIDER
+    writes = len(bus.transactions)
+    assert writes > 0
+
+    # Unchanged: same value, no display write
+    assert lock.show_analog_value() == 800 // COMBO_LOCK.POT_DIVIDER
+    assert len(bus.transactions) == writes
+
+    raw[0] = 1700
+    assert lock.show_analog_value() == 1700 // COMBO_LOCK.POT_DIVIDER
+    assert len(bus.transactions) > writes
+
+    lock.bank.cleanup()
+    lock.display.cleanup()
+
+
+def test_wait_for_gesture_short_and_long_press():
+    lock = COMBO_LOCK.CombinationLock(reset_time=0.2, button=BUTTON_PIN,
+                                      i2c_bus=sim_i2c.SimulatedI2CBus())
+
+    sim_bbio.GPIO.set_input(BUTTON_PIN, sim_bbio.GPIO.LOW)
+    time.sleep(0.02)
+    sim_bbio.GPIO.set_input(BUTTON_PIN, sim_bbio.GPIO.HIGH)
+    assert lock.wait_for_gesture() == COMBO_LOCK.GESTURES.SHORT
+
+    # A long press is decided while the button is still held
+    sim_bbio.GPIO.set_input(BUTTON_PIN, sim_bbio.GPIO.LOW)
+    assert lock.wait_for_gesture() == COMBO_LOCK.GESTURES.LONG
+    assert lock.bank.is_pressed(BUTTON_PIN)
+
+    sim_bbio.GPIO.set_input(BUTTON_PIN, sim_bbio.GPIO.HIGH)
+    lock.bank.cleanup()
+    lock.display.cleanup()
@@ -0,0 +1,31 @@
+"""Tests for gestures.py"""
+import gestures as GESTURES
+
+
+def classify(records, end):
+    """Feed (pin, event, timestamp) records; return every gesture up to end"""
+    classifier = GESTURES.GestureClassifier()
+    gestures   = []
+
+    for pin, event, timestamp in records:
+        gestures += classifier.feed(pin, event, timestamp)
+
+    return gestures + classifier.expire(end)
+
+
+def test_repeated_press_in_chord_window_is_not_a_chord():
+    gestures = classify([("P2_2", GESTURES.PRESS, 0.000),
+                         ("P2_2", GESTURES.RELEASE, 0.010),
+                         ("P2_2", GESTURES.PRESS, 0.020),
+                         ("P2_2", GESTURES.RELEASE, 0.030)], 2.0)
+
+    assert all(gesture != GESTURES.CHORD for gesture, pins, timestamp in gestures)
+
+
+def test_two_pins_in_chord_window_are_a_chord():
+    gestures = classify([("P2_2", GESTURES.PRESS, 0.000),
+                         ("P2_4", GESTURES.PRESS, 0.020),
+                         ("P2_2", GESTURES.RELEASE, 0.200),
+                         ("P2_4", GESTURES.RELEASE, 0.210)], 2.0)
+
+    assert gestures == [(GESTURES.CHORD, ("P2_2", "P2_4"), 0.05)]
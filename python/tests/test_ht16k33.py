@@ -0,0 +1,43 @@
+"""Tests for the Marquee in ht16k33.py"""
+import pytest
+
+import sim_i2c
+import ht16k33 as HT16K33
+
+STATUS = "grip level 8 hold"
+
+
+def test_marquee_substitutes_unsupported_letters():
+    display = HT16K33.HT16K33(sim_i2c.SimulatedI2CBus())
+    marquee = HT16K33.Marquee(display)
+
+    frames  = marquee._compile_frames(STATUS)
+
+    # "v" is shown as "u"; every other character is supported as is
+    assert b"".join([frame[-1:] for frame in frames[1:len(STATUS) + 1]]) == \
+           bytes([HT16K33.LETTERS[char] for char in STATUS.replace("v", "u")])
+
+    marquee.start(STATUS, rate=100, repeat=False)
+    marquee.cancel(wait=True)
+    display.cleanup()
+
+
+def test_marquee_unknown_character_is_blank():
+    display = HT16K33.HT16K33(sim_i2c.SimulatedI2CBus())
+    marquee = HT16K33.Marquee(display)
+
+    frames  = marquee._compile_frames("a.b")
+
+    assert frames[3] == bytes([0x00, 0x77, 0x00, 0x7c])
+    display.cleanup()
+
+
+def test_marquee_without_substitute_rejects_unsupported_letters():
+    display = HT16K33.HT16K33(sim_i2c.SimulatedI2CBus())
+    marquee = HT16K33.Marquee(display, substitute=False)
+
+    with pytest.raises(ValueError):
+        marquee.start(STATUS)
+
+    assert not marquee.is_running()
+    display.cleanup()
@@ -0,0 +1,16 @@
+"""Tests for iio_adc.py"""
+import iio_adc as IIO_ADC
+
+PIN = "P1_27"
+
+
+def test_reads_before_start_and_after_stop_return_no_samples():
+    capture = IIO_ADC.IIOCapture([PIN])
+
+    assert capture.update() == 0
+    assert len(capture.new_samples(PIN)) == 0
+    assert capture.read_raw(PIN) == 0.0
+    assert capture.read(PIN) == 0.0
+
+    capture.stop()
+    assert capture.update() == 0
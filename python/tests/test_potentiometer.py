@@ -0,0 +1,40 @@
+"""Tests for potentiometer.py"""
+import os
+import subprocess
+import sys
+
+import sim_bbio
+import potentiometer as POT
+
+POT_PIN = "P1_19"
+
+
+def test_change_filter_hysteresis():
+    change = POT.ChangeFilter(divider=8, deadband=0, hysteresis=4)
+
+    assert [change.update(raw) for raw in [800, 807, 803, 808, 812, 803, 799, 795]] == \
+           [100, None, None, None, 101, 100, None, 99]
+
+
+def test_get_change_only_on_change_and_after_reset():
+    sim_bbio.ADC.set_source(POT_PIN, lambda n: 800 / 4095.0)
+    pot = POT.Potentiometer(POT_PIN)
+    pot.set_change_filter(8, 0, 4)
+
+    assert pot.get_change() == 100
+    assert pot.get_change() is None
+
+    pot.reset_change()
+    assert pot.get_change() == 100
+
+
+def test_imports_without_adc_directory():
+    # Only the potentiometer and simulator directories are on the path
+    code = ("import sys, sim_bbio; sim_bbio.install(); "
+            "import potentiometer; "
+            "sys.exit('oversample' in sys.modules)")
+    path = os.pathsep.join([os.path.dirname(POT.__file__), os.path.dirname(sim_bbio.__file__)])
+
+    result = subprocess.run([sys.executable, "-c", code], env=dict(os.environ, PYTHONPATH=path))
+
+    assert result.returncode == 0
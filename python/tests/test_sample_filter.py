@@ -0,0 +1,42 @@
+"""Tests for sample_filter.py"""
+import numpy as np
+
+import sample_filter as FILTER
+
+
+def test_ema_alpha_one_passes_samples_through():
+    ema = FILTER.EMAFilter(1.0)
+
+    assert np.array_equal(ema.process([1, 2, 3]), [1.0, 2.0, 3.0])
+    assert np.array_equal(ema.process(np.array([4.0])), [4.0])
+
+
+def test_first_order_tiny_pole_is_finite():
+    y, state = FILTER.first_order(np.array([1.0, 2.0, 3.0]), 1e-320, 5.0)
+
+    assert np.all(np.isfinite(y))
+    assert np.allclose(y, [1.0, 2.0, 3.0])
+    assert state == y[-1]
+
+
+def test_ema_blocks_match_recursion():
+    x   = np.random.default_rng(1).standard_normal(1000)
+    ema = FILTER.EMAFilter(0.2)
+    y   = np.concatenate([ema.process(block) for block in np.split(x, 10)])
+
+    expected = np.empty_like(x)
+    state    = 0.0
+    for i, sample in enumerate(x):
+        state       = 0.2 * sample + 0.8 * state
+        expected[i] = state
+
+    assert np.allclose(y, expected)
+
+
+def test_ema_alpha_keeps_time_constant():
+    # One second of a unit step: 10 samples at 10 Hz vs 1000 at 1 kHz
+    slow = FILTER.EMAFilter(0.2).process(np.ones(10))[-1]
+    fast = FILTER.EMAFilter(FILTER.ema_alpha(0.2, 10, 1000)).process(np.ones(1000))[-1]
+
+    assert np.isclose(slow, fast)
+    assert FILTER.ema_alpha(0.2, 10, 10) == 0.2